@@ -1,41 +1,190 @@
-from collections import defaultdict
+import asyncio
+from collections import defaultdict, OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
+import math
+from operator import itemgetter
 import re
 import time
-from typing import Annotated, Any, AsyncGenerator
+from typing import (
+    Annotated,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+)
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
-from pydantic import BaseModel, Field
-import requests
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+)
+from fastapi.responses import StreamingResponse
+import httpx
+from pydantic import BaseModel, Field, model_validator
 
+from github_pm.cache import cache
+from github_pm.codec import dumps, loads, NegotiatedRoute
 from github_pm.context import context
+from github_pm.events import broker
+from github_pm.fields import project, Projection, projection_for
 from github_pm.logger import logger
+from github_pm.metrics import (
+    CACHE_LOOKUPS,
+    endpoint_template,
+    GITHUB_BYTES,
+    GITHUB_PAGES,
+    GITHUB_SECONDS,
+)
+from github_pm.model import interner, Issue, label_names
+from github_pm.resilience import (
+    Breakers,
+    CircuitOpen,
+    endpoint_class,
+    RETRY_STATUSES,
+    RetryPolicy,
+    shared,
+    UNSENT,
+)
+from github_pm.scheduler import DEFAULT_RETRY_AFTER, Scheduler
+from github_pm.sync import high_water_now, issue_sync, milestone_of
+from github_pm.writes import IssueWriteQueue
 
-api_router = APIRouter()
+api_router = APIRouter(route_class=NegotiatedRoute)
 
 
+# The largest page size GitHub allows for REST lists
+PAGE_SIZE = 100
+
+# The media type of streamed JSON lines
+NDJSON = "application/x-ndjson"
+
+# The longest rate limit pause a read waits out and retries, rather than
+# failing at once
+RATE_LIMIT_WAIT = DEFAULT_RETRY_AFTER
+
 # We sort "semver" style milestones first, then others alphabetically
 VERSION_MATCH = re.compile(r"^v\d+\.\d+\.\d+$")
 
 
+@dataclass
+class Validated:
+    """A GitHub response body saved with its conditional request validators."""
+
+    etag: str | None
+    last_modified: str | None
+    links: dict[str, dict[str, str]]
+    content: bytes
+
+
+class ValidatorCache:
+    """An LRU cache of GitHub GET responses and their validators.
+
+    GitHub answers a conditional request (If-None-Match or If-Modified-Since)
+    for unchanged data with "304 Not Modified", which doesn't count against
+    the rate limit; we then replay the saved body. Bodies are kept as raw
+    bytes so every caller decodes its own copy. The cache holds at most
+    `max_bytes` of response bodies.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: OrderedDict[tuple[str, str], Validated] = OrderedDict()
+
+    def get(self, key: tuple[str, str]) -> Validated | None:
+        entry = self.entries.get(key)
+        if entry:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[str, str], entry: Validated):
+        self.discard(key)
+        if len(entry.content) > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.size += len(entry.content)
+        while self.size > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.size -= len(old.content)
+
+    def discard(self, key: tuple[str, str]):
+        old = self.entries.pop(key, None)
+        if old:
+            self.size -= len(old.content)
+
+
 class Connector:
-    def __init__(self, github_token: str):
+    def __init__(
+        self,
+        github_token: str,
+        http2: bool = False,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = 5.0,
+        page_concurrency: int = 4,
+        validator_cache_bytes: int = 0,
+        scheduler: Scheduler | None = None,
+        retry: RetryPolicy | None = None,
+        breakers: Breakers | None = None,
+    ):
         """Initialize a GitHub connection.
 
+        The connection is backed by an asynchronous HTTP client so that slow
+        GitHub calls never block the event loop; connections are kept alive
+        and reused across calls, optionally over HTTP/2. A single Connector is
+        shared by all requests for the lifetime of the application, so it must
+        not keep any per-call state.
+
         Args:
             github_token: The GitHub Personal Access Token to use
+            http2: Negotiate HTTP/2 with GitHub (requires the "h2" package)
+            max_connections: Maximum number of concurrent connections
+            max_keepalive_connections: Maximum number of idle connections
+            keepalive_expiry: Seconds an idle connection is kept open
+            page_concurrency: Maximum concurrent page fetches in get_paged
+            validator_cache_bytes: Memory for conditional request bodies, or 0
+                to disable conditional requests
+            scheduler: Paces calls within GitHub's rate limits (by default,
+                only limiting their concurrency)
+            retry: How to retry transient failures (by default, not at all)
+            breakers: The circuit breakers of each class of endpoint
         """
         self.github_token = github_token
         self.base_url = "https://api.github.com"
         self.owner, self.repo = context.github_repo.split("/", maxsplit=1)
-        self.github = requests.session()
-        self.github.headers.update(
-            {
+        self.page_concurrency = page_concurrency
+        self.validators = ValidatorCache(validator_cache_bytes)
+        self.scheduler = scheduler or Scheduler()
+        self.retry = retry or RetryPolicy()
+        self.breakers = breakers or Breakers()
+        # Calls in progress, shared by concurrent identical requests
+        self.in_flight: dict[tuple[Any, ...], asyncio.Future] = {}
+        self.coalesced = 0
+        # The number of user requests using the connection, so that background
+        # work can give way to them
+        self.interactive = 0
+        self.github = httpx.AsyncClient(
+            headers={
                 "Authorization": f"Bearer {self.github_token}",
                 "Accept": "application/vnd.github+json",
                 "User-Agent": "Project-Manager",
                 "X-GitHub-Api-Version": "2022-11-28",
-            }
+            },
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(30.0, connect=10.0),
         )
         logger.info(
             "Initializing GitHub Connector service to %s/%s",
@@ -43,85 +192,961 @@ class Connector:
             context.github_repo,
         )
 
-    def get(self, path: str, headers: dict[str, str] | None = None) -> dict:
-        response = self.github.get(f"{self.base_url}{path}", headers=headers)
+    async def close(self):
+        """Close the pooled HTTP connections."""
+        await self.github.aclose()
+
+    async def _send(
+        self, method: str, url: httpx.URL | str, **kwargs
+    ) -> httpx.Response:
+        """Make a GitHub call through the scheduler.
+
+        Transient failures are retried if it's safe to repeat the call, as is
+        a call refused for GitHub's rate limits (once, if the scheduler's
+        pause is short enough to wait for). The outcome is recorded by the
+        circuit breaker of the endpoint.
+
+        Raises:
+            CircuitOpen: if the endpoint's circuit breaker is open
+            httpx.TransportError: if the call failed, even after retrying
+        """
+        resource = self.scheduler.resource(url)
+        mutation = method != "GET" and resource == "core"
+        breaker = self.breakers.get(endpoint_class(url))
+        breaker.allow()
+        attempt = 0
+        limited = False
+        try:
+            while True:
+                retry_after = None
+                try:
+                    response = await self.scheduler.send(
+                        resource,
+                        mutation,
+                        lambda: self._call(resource, method, url, **kwargs),
+                    )
+                except httpx.TransportError as e:
+                    # A mutation may have been applied, unless it wasn't sent
+                    if attempt >= self.retry.retries or (
+                        mutation and not isinstance(e, UNSENT)
+                    ):
+                        breaker.failed()
+                        raise
+                    failure = repr(e)
+                else:
+                    status = response.status_code
+                    if (
+                        not (mutation or limited)
+                        and self.scheduler.rate_limited(response)
+                        and 0 < self.scheduler.paused_for(resource) <= RATE_LIMIT_WAIT
+                    ):
+                        # The scheduler holds the call until the pause is over
+                        limited = True
+                        logger.info(
+                            f"{method} {url}: rate limited ({status}), retrying "
+                            f"in {self.scheduler.paused_for(resource):.0f}s"
+                        )
+                        continue
+                    if (
+                        status not in RETRY_STATUSES
+                        or mutation
+                        or attempt >= self.retry.retries
+                    ):
+                        if status >= 500:
+                            breaker.failed()
+                        else:
+                            breaker.succeeded()
+                        return response
+                    failure = status
+                    header = response.headers.get("retry-after", "")
+                    if header.isdigit():
+                        retry_after = float(header)
+                delay = self.retry.delay(attempt, retry_after)
+                attempt += 1
+                breaker.retries += 1
+                logger.info(
+                    f"{method} {url}: {failure}, retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+        except BaseException:
+            breaker.abandoned()
+            raise
+
+    async def _call(
+        self, resource: str, method: str, url: httpx.URL | str, **kwargs
+    ) -> httpx.Response:
+        """Make a GitHub call, recording its metrics."""
+        api = "graphql" if resource == "graphql" else "rest"
+        endpoint = endpoint_template(url)
+        start = time.monotonic()
+        try:
+            response = await self.github.request(method, url, **kwargs)
+        except httpx.TransportError:
+            GITHUB_SECONDS.observe(
+                time.monotonic() - start, api, method, endpoint, "error"
+            )
+            raise
+        GITHUB_SECONDS.observe(
+            time.monotonic() - start, api, method, endpoint, response.status_code
+        )
+        GITHUB_BYTES.observe(len(response.content), api, endpoint)
+        return response
+
+    async def _shared(
+        self,
+        key: tuple[Any, ...],
+        fetch: Callable[[], Awaitable[tuple[bytes, dict[str, dict[str, str]]]]],
+    ) -> tuple[bytes, dict[str, dict[str, str]]]:
+        """Make a call, or join an identical call already in progress.
+
+        Concurrent identical reads (when several people open the same
+        milestone at once) share a single GitHub call. The raw body is
+        shared, so that every caller decodes its own copy.
+
+        Args:
+            key: Identifies the request
+            fetch: Makes the call, returning the body and "link" header
+
+        Returns:
+            The response body and parsed "link" header
+        """
+        flight, joined = shared(self.in_flight, key, fetch)
+        if joined:
+            self.coalesced += 1
+            CACHE_LOOKUPS.inc("in_flight", "hit")
+        else:
+            CACHE_LOOKUPS.inc("in_flight", "miss")
+        return await asyncio.shield(flight)
+
+    async def _get(
+        self, url: httpx.URL | str, headers: dict[str, str] | None = None
+    ) -> tuple[Any, dict[str, dict[str, str]]]:
+        """GET a URL, sharing the call with identical concurrent GETs.
+
+        Args:
+            url: The full URL
+            headers: Additional request headers
+
+        Returns:
+            The decoded JSON body and the parsed "link" header
+        """
+        key = ("GET", str(url), *sorted((headers or {}).items()))
+        content, links = await self._shared(key, lambda: self._fetch(url, headers))
+        return loads(content), links
+
+    async def _fetch(
+        self, url: httpx.URL | str, headers: dict[str, str] | None = None
+    ) -> tuple[bytes, dict[str, dict[str, str]]]:
+        """GET a URL, revalidating any saved copy of the response.
+
+        Args:
+            url: The full URL
+            headers: Additional request headers
+
+        Returns:
+            The response body and the parsed "link" header
+        """
+        key = (str(url), (headers or {}).get("Accept", ""))
+        saved = self.validators.get(key) if self.validators.max_bytes else None
+        if saved:
+            headers = dict(headers or {})
+            if saved.etag:
+                headers["If-None-Match"] = saved.etag
+            if saved.last_modified:
+                headers["If-Modified-Since"] = saved.last_modified
+        response = await self._send("GET", url, headers=headers)
+        if saved and response.status_code == httpx.codes.NOT_MODIFIED:
+            CACHE_LOOKUPS.inc("validator", "hit")
+            return saved.content, saved.links
+        if self.validators.max_bytes:
+            CACHE_LOOKUPS.inc("validator", "miss")
         response.raise_for_status()
-        self.response = response
-        return response.json()
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if self.validators.max_bytes and (etag or last_modified):
+            self.validators.put(
+                key,
+                Validated(
+                    etag=etag,
+                    last_modified=last_modified,
+                    links=response.links,
+                    content=response.content,
+                ),
+            )
+        return response.content, response.links
+
+    async def get(self, path: str, headers: dict[str, str] | None = None) -> dict:
+        data, _ = await self._get(f"{self.base_url}{path}", headers=headers)
+        return data
+
+    async def get_paged(
+        self, path: str, headers: dict[str, str] | None = None
+    ) -> list[dict]:
+        """Get all pages of a GitHub list.
 
-    def get_paged(self, path: str, headers: dict[str, str] | None = None) -> list[dict]:
-        url: str | None = f"{self.base_url}{path}"
+        Args:
+            path: The API path, which may include query parameters
+            headers: Additional request headers
+
+        Returns:
+            The concatenated items of all pages, in order
+        """
         results = []
-        while url:
-            response = self.github.get(url, headers=headers)
-            response.raise_for_status()
-            self.response = response
-            data = response.json()
-            logger.debug(f"{url}: {len(data)}")
-            results.extend(data)
-            url = None
-            if response.headers.get("link"):
-                links = response.headers.get("link")
-                for link in links.split(","):
-                    if 'rel="next"' in link:
-                        url = link.split(";")[0].strip().strip("<>")
-                        logger.debug(f"paging to: {url}")
-                        break
+        async for page in self.iter_paged(path, headers=headers):
+            results.extend(page)
         return results
 
-    def patch(
+    async def iter_paged(
+        self, path: str, headers: dict[str, str] | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Iterate over the pages of a GitHub list, in order.
+
+        We ask for the maximum page size. When GitHub tells us how many pages
+        there are (a rel="last" link), the remaining pages are fetched
+        concurrently, limited by page_concurrency; otherwise we follow the
+        rel="next" links one at a time.
+
+        Args:
+            path: The API path, which may include query parameters
+            headers: Additional request headers
+
+        Yields:
+            The items of each page
+        """
+        url = httpx.URL(f"{self.base_url}{path}")
+        if "per_page" not in url.params:
+            url = url.copy_set_param("per_page", PAGE_SIZE)
+        results, links = await self._get(url, headers=headers)
+        logger.debug(f"{url}: {len(results)}")
+        yield results
+        last = links.get("last", {}).get("url")
+        if last:
+            pages = int(httpx.URL(last).params.get("page", 1))
+            limit = asyncio.Semaphore(self.page_concurrency)
+
+            async def fetch(page: int) -> list[dict]:
+                async with limit:
+                    data, _ = await self._get(
+                        url.copy_set_param("page", page), headers=headers
+                    )
+                return data
+
+            logger.debug(f"fetching pages 2-{pages} of {url}")
+            tasks = [asyncio.ensure_future(fetch(p)) for p in range(2, pages + 1)]
+            try:
+                for task in tasks:
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+            GITHUB_PAGES.observe(pages, endpoint_template(url))
+            return
+        pages = 1
+        next_url = links.get("next", {}).get("url")
+        while next_url:
+            logger.debug(f"paging to: {next_url}")
+            data, links = await self._get(next_url, headers=headers)
+            logger.debug(f"{next_url}: {len(data)}")
+            pages += 1
+            yield data
+            next_url = links.get("next", {}).get("url")
+        GITHUB_PAGES.observe(pages, endpoint_template(url))
+
+    async def patch(
         self, path: str, data: dict[str, Any], headers: dict[str, str] | None = None
     ) -> dict:
-        response = self.github.patch(
-            f"{self.base_url}{path}", json=data, headers=headers
+        response = await self._send(
+            "PATCH", f"{self.base_url}{path}", json=data, headers=headers
         )
         response.raise_for_status()
-        self.response = response
-        return response.json()
+        return loads(response.content)
 
-    def post(
+    async def post(
         self, path: str, data: dict[str, Any], headers: dict[str, str] | None = None
     ) -> dict:
-        response = self.github.post(
-            f"{self.base_url}{path}", json=data, headers=headers
-        )
-        response.raise_for_status()
-        self.response = response
-        return response.json()
+        """POST to GitHub.
+
+        GraphQL queries (but not mutations) are reads, so identical
+        concurrent queries share a single call.
+        """
+
+        async def fetch() -> tuple[bytes, dict[str, dict[str, str]]]:
+            response = await self._send(
+                "POST", f"{self.base_url}{path}", json=data, headers=headers
+            )
+            response.raise_for_status()
+            return response.content, {}
 
-    def delete(
+        query = data.get("query", "") if path == "/graphql" else ""
+        if not query or query.lstrip().startswith("mutation"):
+            content, _ = await fetch()
+        else:
+            key = ("POST", path, dumps(data), *sorted((headers or {}).items()))
+            content, _ = await self._shared(key, fetch)
+        return loads(content)
+
+    async def delete(
         self,
         path: str,
         data: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
     ) -> dict:
-        response = self.github.delete(
-            f"{self.base_url}{path}", json=data, headers=headers
+        # httpx's delete() doesn't take a body, but GitHub's assignee removal
+        # API requires one, so we use request().
+        response = await self._send(
+            "DELETE", f"{self.base_url}{path}", json=data, headers=headers
         )
         response.raise_for_status()
-        self.response = response
-        return response.json() if response.content else {}
+        return loads(response.content) if response.content else {}
 
 
-async def connection() -> AsyncGenerator[Connector]:
-    """FastAPI Dependency to open & close Github connections"""
-    connector = None
-    try:
-        connector = Connector(github_token=context.github_token)
-    except Exception as e:
-        logger.exception(f"Error opening GitHub service: {e}")
-        raise HTTPException(
-            status_code=400, detail=f"Can't open GitHub connection: {str(e)!r}"
-        )
+def open_connector() -> Connector:
+    """Create a Connector configured from the application settings."""
+    return Connector(
+        github_token=context.github_token,
+        http2=context.github_http2,
+        max_connections=context.github_max_connections,
+        max_keepalive_connections=context.github_max_keepalive_connections,
+        keepalive_expiry=context.github_keepalive_expiry,
+        page_concurrency=context.github_page_concurrency,
+        validator_cache_bytes=context.github_validator_cache_bytes,
+        scheduler=Scheduler(
+            max_concurrency=context.github_max_concurrency,
+            mutation_rate=context.github_mutation_rate,
+            mutation_burst=context.github_mutation_burst,
+            reserve=context.github_rate_limit_reserve,
+        ),
+        retry=RetryPolicy(
+            retries=context.github_retries,
+            base=context.github_retry_base,
+            cap=context.github_retry_cap,
+        ),
+        breakers=Breakers(
+            threshold=context.github_breaker_threshold,
+            cooldown=context.github_breaker_cooldown,
+        ),
+    )
+
+
+async def connection(request: Request) -> AsyncGenerator[Connector]:
+    """FastAPI Dependency to provide the shared Github connection
+
+    The Connector is normally opened by the application lifespan handler;
+    if that failed (or there was no lifespan, as in some tests) we try again
+    here so that the error is reported to the caller.
+    """
+    connector = getattr(request.app.state, "connector", None)
+    if connector is None:
+        try:
+            connector = open_connector()
+        except Exception as e:
+            logger.exception(f"Error opening GitHub service: {e}")
+            raise HTTPException(
+                status_code=400, detail=f"Can't open GitHub connection: {str(e)!r}"
+            )
+        request.app.state.connector = connector
+    connector.interactive += 1
     try:
         start = time.time()
         yield connector
         logger.debug(f"Elapsed time: {time.time() - start:.3f} seconds")
+    except CircuitOpen as e:
+        logger.warning(f"GitHub unavailable: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
     except Exception as e:
         logger.exception(f"GitHub error: {str(e)!r}")
         raise HTTPException(
             status_code=400, detail=f"Can't open repository: {str(e)!r}"
         )
+    finally:
+        connector.interactive -= 1
+
+
+async def find_linked_prs(
+    gitctx: Connector, numbers: list[int]
+) -> dict[int, list[dict[str, Any]]]:
+    """Find the pull requests that will close each of a list of issues.
+
+    Rather than making a GraphQL call for each issue, we look up a batch of
+    issues in each query using aliases ("i<number>"). Errors are isolated:
+    a failed batch, or a failed issue within a batch, is logged and simply
+    has no linked PRs.
+
+    Args:
+        gitctx: The GitHub connection
+        numbers: Issue numbers (not PRs, which can't have linked PRs)
+
+    Returns:
+        A dict mapping issue number to a list of linked PRs, each with the
+        PR "number", "title" and "url". Issues with no linked PRs may be
+        omitted.
+    """
+    linked: dict[int, list[dict[str, Any]]] = {}
+    batch_size = context.graphql_batch_size
+    for start in range(0, len(numbers), batch_size):
+        batch = numbers[start : start + batch_size]
+        aliases = "\n".join(f"""i{n}: issue(number: {n}) {{
+                    closedByPullRequestsReferences(first: 100, includeClosedPrs: true) {{
+                        nodes {{
+                            number
+                            title
+                            url
+                        }}
+                    }}
+                }}""" for n in batch)
+        query = f"""query($owner: String!, $repo: String!) {{
+            repository(owner: $owner, name: $repo, followRenames: true) {{
+                {aliases}
+            }}
+        }}
+        """
+        try:
+            response = await gitctx.post(
+                "/graphql",
+                data={
+                    "query": query,
+                    "variables": {"owner": gitctx.owner, "repo": gitctx.repo},
+                },
+            )
+            repository = response["data"]["repository"]
+        except Exception as e:
+            logger.exception(f"Error finding linked PRs for issues {batch}: {e!r}")
+            continue
+        for n in batch:
+            try:
+                closed = repository[f"i{n}"]["closedByPullRequestsReferences"]["nodes"]
+            except Exception as e:
+                logger.exception(f"Error finding linked PRs for issue {n}: {e!r}")
+                continue
+            if len(closed) > 0:
+                linked[n] = [
+                    {
+                        "number": pr["number"],
+                        "title": pr["title"],
+                        "url": pr["url"],
+                    }
+                    for pr in closed
+                ]
+    return linked
+
+
+# GraphQL fields for an issue, from which we build the same JSON shape as
+# the REST API's issue listing (see graphql_issue)
+ISSUE_FIELDS = """
+    id
+    databaseId
+    number
+    title
+    url
+    state
+    bodyHTML
+    createdAt
+    updatedAt
+    author {
+        login
+        url
+        avatarUrl
+    }
+    comments {
+        totalCount
+    }
+    reactions {
+        totalCount
+    }
+    issueType {
+        name
+        color
+        description
+    }
+    milestone {
+        id
+        number
+        title
+        description
+        dueOn
+        state
+    }
+    labels(first: 100) {
+        nodes {
+            id
+            name
+            color
+            description
+        }
+    }
+    assignees(first: 20) {
+        nodes {
+            databaseId
+            login
+            url
+            avatarUrl
+        }
+    }
+    closedByPullRequestsReferences(first: 100, includeClosedPrs: true) {
+        nodes {
+            number
+            title
+            url
+        }
+    }
+"""
+
+
+def graphql_user(user: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Convert a GraphQL user (actor) to the REST API shape."""
+    if not user:
+        return None
+    return {
+        "login": user["login"],
+        "id": user.get("databaseId"),
+        "html_url": user["url"],
+        "avatar_url": user["avatarUrl"],
+    }
+
+
+def graphql_issue(node: dict[str, Any]) -> dict[str, Any]:
+    """Convert a GraphQL issue node to the REST API issue shape.
+
+    Only the attributes the UI uses are filled in; GraphQL doesn't have a
+    numeric ID for labels, so those use the GraphQL node ID.
+    """
+    milestone = node.get("milestone")
+    issue_type = node.get("issueType")
+    issue = {
+        "id": node["databaseId"],
+        "node_id": node["id"],
+        "number": node["number"],
+        "title": node["title"],
+        "html_url": node["url"],
+        "state": node["state"].lower(),
+        "body_html": node["bodyHTML"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "user": graphql_user(node.get("author")),
+        "comments": node["comments"]["totalCount"],
+        "reactions": {"total_count": node["reactions"]["totalCount"]},
+        "type": (
+            {
+                "name": issue_type["name"],
+                "color": issue_type["color"].lower(),
+                "description": issue_type["description"],
+            }
+            if issue_type
+            else None
+        ),
+        "milestone": (
+            {
+                "node_id": milestone["id"],
+                "number": milestone["number"],
+                "title": milestone["title"],
+                "description": milestone["description"],
+                "due_on": milestone["dueOn"],
+                "state": milestone["state"].lower(),
+            }
+            if milestone
+            else None
+        ),
+        "labels": [
+            {
+                "id": label["id"],
+                "name": label["name"],
+                "color": label["color"],
+                "description": label["description"],
+            }
+            for label in node["labels"]["nodes"]
+        ],
+        "assignees": [graphql_user(a) for a in node["assignees"]["nodes"]],
+    }
+    closed = node["closedByPullRequestsReferences"]["nodes"]
+    if len(closed) > 0:
+        issue["closed_by"] = [
+            {"number": pr["number"], "title": pr["title"], "url": pr["url"]}
+            for pr in closed
+        ]
+    return issue
+
+
+async def fetch_issues_graphql(
+    gitctx: Connector, milestone_number: int
+) -> list[dict[str, Any]]:
+    """Fetch the open issues of a milestone using paginated GraphQL queries.
+
+    Each page carries the labels, assignees, body HTML and linked PRs of its
+    issues, so a milestone costs one call per page instead of REST pages
+    plus linked-PR lookups. Unlike the REST issue listing, this doesn't
+    include pull requests.
+
+    Issues without a milestone (milestone 0) are listed through REST: the
+    GraphQL filter's way of asking for them is ambiguous, since a null
+    milestoneNumber also means "don't filter".
+
+    Args:
+        gitctx: The GitHub connection
+        milestone_number: The milestone number
+
+    Returns:
+        A list of issues in the REST API shape
+    """
+    issues = []
+    async for page in iter_issues_graphql(gitctx, milestone_number):
+        issues.extend(page)
+    return issues
+
+
+async def iter_issues_graphql(
+    gitctx: Connector, milestone_number: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Iterate over the pages of fetch_issues_graphql, oldest issues first."""
+    query = f"""query($owner: String!, $repo: String!, $milestone: String!, $cursor: String) {{
+        repository(owner: $owner, name: $repo, followRenames: true) {{
+            issues(first: 50, after: $cursor, states: OPEN, filterBy: {{milestoneNumber: $milestone}}, orderBy: {{field: CREATED_AT, direction: ASC}}) {{
+                pageInfo {{
+                    hasNextPage
+                    endCursor
+                }}
+                nodes {{
+                    {ISSUE_FIELDS}
+                }}
+            }}
+        }}
+    }}
+    """
+    variables = {
+        "owner": gitctx.owner,
+        "repo": gitctx.repo,
+        "milestone": str(milestone_number),
+        "cursor": None,
+    }
+    while True:
+        response = await gitctx.post(
+            "/graphql", data={"query": query, "variables": variables}
+        )
+        if response.get("errors"):
+            raise ValueError(f"GraphQL errors: {response['errors']!r}")
+        page = response["data"]["repository"]["issues"]
+        yield [graphql_issue(node) for node in page["nodes"]]
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        variables["cursor"] = page["pageInfo"]["endCursor"]
+        logger.debug(f"paging to: {variables['cursor']}")
+
+
+async def find_closing_issues(gitctx: Connector, numbers: list[int]) -> set[int]:
+    """Find the issues that a list of pull requests will close.
+
+    Like find_linked_prs, the PRs are looked up in batches of aliased
+    GraphQL queries, and errors are logged and ignored.
+
+    Args:
+        gitctx: The GitHub connection
+        numbers: Pull request numbers
+
+    Returns:
+        The numbers of the issues closed by any of the PRs
+    """
+    closing: set[int] = set()
+    batch_size = context.graphql_batch_size
+    for start in range(0, len(numbers), batch_size):
+        batch = numbers[start : start + batch_size]
+        aliases = "\n".join(f"""p{n}: pullRequest(number: {n}) {{
+                    closingIssuesReferences(first: 50) {{
+                        nodes {{
+                            number
+                        }}
+                    }}
+                }}""" for n in batch)
+        query = f"""query($owner: String!, $repo: String!) {{
+            repository(owner: $owner, name: $repo, followRenames: true) {{
+                {aliases}
+            }}
+        }}
+        """
+        try:
+            response = await gitctx.post(
+                "/graphql",
+                data={
+                    "query": query,
+                    "variables": {"owner": gitctx.owner, "repo": gitctx.repo},
+                },
+            )
+            repository = response["data"]["repository"]
+        except Exception as e:
+            logger.exception(f"Error finding issues closed by PRs {batch}: {e!r}")
+            continue
+        for n in batch:
+            try:
+                nodes = repository[f"p{n}"]["closingIssuesReferences"]["nodes"]
+            except Exception as e:
+                logger.exception(f"Error finding issues closed by PR {n}: {e!r}")
+                continue
+            closing.update(node["number"] for node in nodes)
+    return closing
+
+
+async def sync_issues(gitctx: Connector):
+    """Bring the issue working set up to date.
+
+    The first time, all open issues are listed (unless the working set can
+    be restored from the store); after that we only ask for issues changed
+    since the high-water mark. The linked PRs are looked up again for the
+    changed issues, and for issues linked to (or closed by) changed PRs.
+    """
+    headers = {"Accept": "application/vnd.github.html+json"}
+    async with issue_sync.lock:
+        if not issue_sync.loaded and cache.store:
+            saved = await cache.store.load_sync(context.github_repo)
+            if saved:
+                issue_sync.since = saved[0]
+                issue_sync.issues = {i["number"]: i for i in saved[1]}
+        if issue_sync.loaded:
+            changed = issue_sync.changes(
+                await gitctx.get_paged(
+                    f"/repos/{context.github_repo}/issues?state=all"
+                    f"&sort=updated&direction=asc&since={issue_sync.since}",
+                    headers=headers,
+                )
+            )
+            if not changed:
+                return
+            prs = {i["number"] for i in changed if "pull_request" in i}
+        else:
+            started = high_water_now()
+            changed = await gitctx.get_paged(
+                f"/repos/{context.github_repo}/issues?state=open", headers=headers
+            )
+            prs = set()
+        logger.debug(f"issue sync since {issue_sync.since}: {len(changed)} changed")
+        relinked = {i["number"] for i in changed if "pull_request" not in i}
+        if prs:
+            relinked |= issue_sync.linked_to(prs)
+            relinked |= await find_closing_issues(gitctx, sorted(prs))
+        # A changed issue's latest state is the one in the delta
+        latest = {**issue_sync.issues, **{i["number"]: i for i in changed}}
+        open_issues = {
+            n
+            for n, i in latest.items()
+            if "pull_request" not in i and i.get("state", "open") == "open"
+        }
+        relinked &= open_issues
+        linked = await find_linked_prs(gitctx, sorted(relinked))
+        delta = issue_sync.loaded
+        removed = issue_sync.merge(changed, linked, relinked)
+        if not delta:
+            # Start the deltas from when the listing started: an issue may
+            # have changed on a page we'd already listed while we were
+            # listing the rest
+            issue_sync.since = started
+        if delta:
+            # Tell clients about changes made elsewhere
+            for i in changed:
+                if "pull_request" not in i:
+                    publish_issue(issue_sync.issues.get(i["number"], i))
+            for n in relinked - {i["number"] for i in changed}:
+                publish_issue(issue_sync.issues[n])
+        if cache.store:
+            saved = {i["number"] for i in changed} | relinked
+            cache.store.save_sync(
+                context.github_repo,
+                issue_sync.since,
+                [issue_sync.issues[n] for n in saved if n in issue_sync.issues],
+                removed,
+            )
+
+
+async def add_linked_prs(gitctx: Connector, issues: list[dict]):
+    """Add the linked PRs of each issue (not PR) as "closed_by"."""
+    linked = await find_linked_prs(
+        gitctx, [i["number"] for i in issues if "pull_request" not in i]
+    )
+    for i in issues:
+        if linked.get(i["number"]):
+            i["closed_by"] = linked[i["number"]]
+
+
+async def load_issues(gitctx: Connector, milestone_number: int) -> list[dict]:
+    """Load the open issues of a milestone, with their linked PRs.
+
+    Args:
+        gitctx: The GitHub connection
+        milestone_number: The milestone number, or 0 for no milestone
+
+    Returns:
+        A list of issues, in no particular order
+    """
+    if context.issue_engine == "graphql" and milestone_number != 0:
+        return interner.issues(await fetch_issues_graphql(gitctx, milestone_number))
+    if context.issue_engine == "sync":
+        await sync_issues(gitctx)
+        return issue_sync.milestone(milestone_number)
+    milestone = "none" if milestone_number == 0 else milestone_number
+    issues = await gitctx.get_paged(
+        f"/repos/{context.github_repo}/issues?milestone={milestone}&state=open",
+        headers={"Accept": "application/vnd.github.html+json"},
+    )
+    await add_linked_prs(gitctx, issues)
+    return interner.issues(issues)
+
+
+async def iter_issues(
+    gitctx: Connector, milestone_number: int
+) -> AsyncIterator[list[dict]]:
+    """Iterate over the open issues of a milestone a page at a time.
+
+    This loads the same issues as load_issues, but yields each page (with
+    its linked PRs) as soon as it's ready, oldest issues first.
+
+    Args:
+        gitctx: The GitHub connection
+        milestone_number: The milestone number, or 0 for no milestone
+
+    Yields:
+        Lists of issues
+    """
+    if context.issue_engine == "graphql" and milestone_number != 0:
+        async for page in iter_issues_graphql(gitctx, milestone_number):
+            yield interner.issues(page)
+        return
+    if context.issue_engine == "sync":
+        await sync_issues(gitctx)
+        yield sorted(issue_sync.milestone(milestone_number), key=itemgetter("number"))
+        return
+    milestone = "none" if milestone_number == 0 else milestone_number
+    async for page in gitctx.iter_paged(
+        f"/repos/{context.github_repo}/issues?milestone={milestone}&state=open"
+        "&sort=created&direction=asc",
+        headers={"Accept": "application/vnd.github.html+json"},
+    ):
+        await add_linked_prs(gitctx, page)
+        yield interner.issues(page)
+
+
+class IssueSorter:
+    def __init__(self, sort_by: list[str]):
+        """Sort issues into groups by label, and by number within a group.
+
+        Each issue belongs to the group of the first label in `sort_by` that
+        it has, or to the final "other" group. Issues of the first group can
+        be released as they're added, as long as they're added in order;
+        the rest are released by finish().
+
+        Args:
+            sort_by: Lower case label names
+        """
+        self.sort_by = sort_by
+        self.groups: dict[str, list[dict]] = defaultdict(list)
+        self.first = sort_by[0] if sort_by else "other"
+        self.released = 0
+
+    def group(self, issue: dict[str, Any]) -> str:
+        if isinstance(issue, Issue):
+            labels = issue.label_names
+        else:
+            labels = label_names(issue)
+        for label in self.sort_by:
+            if label in labels:
+                return label
+        return "other"
+
+    def hold(self, issues: list[dict]):
+        """Add issues in any order, to be released by finish()."""
+        for i in issues:
+            self.groups[self.group(i)].append(i)
+
+    def add(self, issues: list[dict]) -> list[dict]:
+        """Add issues, returning those that can be released already."""
+        ready = []
+        for i in issues:
+            group = self.group(i)
+            if group == self.first and i["number"] > self.released:
+                ready.append(i)
+                self.released = i["number"]
+            else:
+                self.groups[group].append(i)
+        return ready
+
+    def finish(self) -> list[dict]:
+        """Return the remaining issues, in order.
+
+        Any issues of the first group that were added out of order have
+        missed their place, and come first.
+        """
+        remaining = []
+        for label in self.sort_by + ["other"]:
+            remaining.extend(sorted(self.groups[label], key=itemgetter("number")))
+        return remaining
+
+
+def issue_changed(issue: dict[str, Any]):
+    """Update the cached milestone issue lists for a modified issue.
+
+    The issue is removed from any cached list it was in, and added to the
+    cached list of its (new) milestone if it's open. Mutation responses
+    don't include the HTML body or linked PRs, so we keep those from the
+    cached copy; if there was none, the list is reloaded instead. Clients
+    are sent the changed issue, without its body.
+
+    Args:
+        issue: The issue, as returned by GitHub after a change
+    """
+    issue_sync.update(issue)
+    number = issue["number"]
+    milestone = milestone_of(issue)
+    previous = None
+    for _, issues in cache.items("issues"):
+        for i in issues:
+            if i["number"] == number:
+                previous = i
+    if previous:
+        issue = interner.issue({**previous, **issue})
+    for key, issues in list(cache.items("issues")):
+        if key[1] == milestone and issue.get("state", "open") == "open":
+            if previous:
+                cache.update(
+                    key,
+                    lambda issues: [i for i in issues if i["number"] != number]
+                    + [issue],
+                )
+            else:
+                cache.invalidate(key)
+        elif any(i["number"] == number for i in issues):
+            cache.update(
+                key, lambda issues: [i for i in issues if i["number"] != number]
+            )
+    publish_issue(issue)
+
+
+def publish_issue(issue: dict[str, Any]):
+    """Send a changed issue to clients, in the "slim" profile."""
+    broker.publish("issue", {"issue": project(issue, projection_for("issues", "slim"))})
+
+
+# Changes to labels, assignees and milestones are queued, so that rapid
+# changes to an issue are written together
+issue_writes = IssueWriteQueue(window=context.issue_write_window, changed=issue_changed)
+
+
+def label_deleted(name: str):
+    """Remove a deleted label from the issues in the cached issue lists."""
+
+    def remove(issues: list[dict]) -> list[dict]:
+        return [
+            (
+                interner.issue(
+                    {**i, "labels": [x for x in i["labels"] if x["name"] != name]}
+                )
+                if any(x["name"] == name for x in i["labels"])
+                else i
+            )
+            for i in issues
+        ]
+
+    for key, _ in list(cache.items("issues")):
+        cache.update(key, remove)
+    broker.publish("labels", {"action": "deleted", "name": name})
 
 
 @api_router.get("/project")
@@ -132,6 +1157,26 @@ async def get_project():
     }
 
 
+@api_router.get("/upstream")
+async def get_upstream(gitctx: Annotated[Connector, Depends(connection)]):
+    """Report GitHub's rate limits, and the state of our calls to GitHub"""
+    return {
+        **gitctx.scheduler.status(),
+        "breakers": gitctx.breakers.status(),
+        "coalesced": gitctx.coalesced,
+    }
+
+
+@api_router.get("/events")
+async def get_events():
+    """Stream changes to the repository as Server-Sent Events"""
+    return StreamingResponse(
+        broker.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @api_router.get("/issues/{milestone_number}")
 async def get_issues(
     gitctx: Annotated[Connector, Depends(connection)],
@@ -139,77 +1184,115 @@ async def get_issues(
     sort: Annotated[
         str | None, Query(title="Sort", description="List of labels to sort by")
     ] = None,
+    stream: Annotated[
+        bool, Query(title="Stream", description="Stream issues as NDJSON")
+    ] = False,
+    fields: Annotated[
+        str | None,
+        Query(
+            title="Fields",
+            description='A profile ("default", "full"...) or attribute paths',
+        ),
+    ] = None,
+    accept: Annotated[str | None, Header()] = None,
 ):
     if sort:
         sort_by = [s.strip() for s in sort.split(",")]
     else:
         sort_by = []
-    sorted_issues = defaultdict(list)
+    projection = projection_for("issues", fields)
+    if stream or (accept and NDJSON in accept):
+        return StreamingResponse(
+            await stream_issues(gitctx, milestone_number, sort_by, projection),
+            media_type=NDJSON,
+        )
     start = time.time()
-    milestone = "none" if milestone_number == 0 else milestone_number
-    issues = gitctx.get_paged(
-        f"/repos/{context.github_repo}/issues?milestone={milestone}&state=open",
-        headers={"Accept": "application/vnd.github.html+json"},
+    issues = await cache.get(
+        ("issues", milestone_number), lambda: load_issues(gitctx, milestone_number)
     )
-    for i in issues:
-        labels = set([label["name"].lower() for label in i["labels"]])
-        if "pull_request" not in i:
-            query = """query($owner: String!, $repo: String!, $issue: Int!) {
-                repository(owner: $owner, name: $repo, followRenames: true) {
-                    issue(number: $issue) {
-                        closedByPullRequestsReferences(first: 100, includeClosedPrs: true) {
-                            nodes {
-                                number
-                                title
-                                url
-                            }
-                        }
-                    }
-                }
-            }
-            """
-            try:
-                response = gitctx.post(
-                    "/graphql",
-                    data={
-                        "query": query,
-                        "variables": {
-                            "owner": gitctx.owner,
-                            "repo": gitctx.repo,
-                            "issue": i["number"],
-                        },
-                    },
-                )
-                data = response["data"]
-                issue_node = data["repository"]["issue"]
-                closed = issue_node["closedByPullRequestsReferences"]["nodes"]
-                if len(closed) > 0:
-                    i["closed_by"] = [
-                        {
-                            "number": linked["number"],
-                            "title": linked["title"],
-                            "url": linked["url"],
-                        }
-                        for linked in closed
-                    ]
-            except Exception as e:
-                logger.exception(
-                    f"Error finding linked PRs for issue {i['number']}: {e!r}"
-                )
-                continue
-        for label in sort_by:
-            if label in labels:
-                sorted_issues[label].append(i)
-                break
-        else:
-            sorted_issues["other"].append(i)
-    all_issues = []
-    for label in sort_by + ["other"]:
-        all_issues.extend(sorted(sorted_issues[label], key=lambda x: x["number"]))
+    sorter = IssueSorter(sort_by)
+    sorter.hold(issues)
+    all_issues = sorter.finish()
     logger.debug(
         f"{len(issues)}({len(all_issues)}) issues: {time.time() - start:.3f} seconds"
     )
-    return all_issues
+    return project(all_issues, projection)
+
+
+async def stream_issues(
+    gitctx: Connector,
+    milestone_number: int,
+    sort_by: list[str],
+    projection: Projection | None = None,
+) -> AsyncIterator[bytes]:
+    """Start generating the sorted issues of a milestone as NDJSON lines.
+
+    On a cache miss, the issues are loaded a page at a time, oldest first,
+    and the first sort group is streamed as each page arrives; the other
+    groups follow once the last page is in. The loaded issues are cached as
+    usual.
+
+    The first page is loaded before this returns, so that a failure to load
+    it is reported with an error status; once the response has started, a
+    failure can only be reported by a final {"error": ...} line.
+
+    Args:
+        gitctx: The GitHub connection
+        milestone_number: The milestone number, or 0 for no milestone
+        sort_by: Lower case label names to sort by
+        projection: The attributes of each issue to send
+
+    Returns:
+        A generator of a line of JSON for each issue
+    """
+    start = time.time()
+    pages: asyncio.Queue[list[dict] | None] = asyncio.Queue()
+
+    async def loader() -> list[dict]:
+        issues = []
+        async for page in iter_issues(gitctx, milestone_number):
+            issues.extend(page)
+            pages.put_nowait(page)
+        return issues
+
+    sorter = IssueSorter(sort_by)
+    load = asyncio.ensure_future(cache.get(("issues", milestone_number), loader))
+    load.add_done_callback(lambda _: pages.put_nowait(None))
+    try:
+        first = await pages.get()
+        if first is None:
+            await load
+    except BaseException:
+        load.cancel()
+        raise
+
+    async def lines() -> AsyncIterator[bytes]:
+        page = first
+        # The issues we've been given a page at a time
+        seen: set[int] = set()
+        try:
+            while page is not None:
+                seen.update(i["number"] for i in page)
+                for i in sorter.add(page):
+                    yield dumps(project(i, projection)) + b"\n"
+                page = await pages.get()
+            issues = await load
+        except Exception as e:
+            logger.exception(f"Error streaming issues: {e!r}")
+            yield dumps({"error": str(e)}) + b"\n"
+            return
+        finally:
+            load.cancel()
+        # If the issues were cached or stored, or another request was already
+        # loading them, we've been given (some of) them all at once.
+        sorter.hold([i for i in issues if i["number"] not in seen])
+        for i in sorter.finish():
+            yield dumps(project(i, projection)) + b"\n"
+        logger.debug(
+            f"{len(issues)} issues streamed: {time.time() - start:.3f} seconds"
+        )
+
+    return lines()
 
 
 @api_router.get("/issue/{issue_number}")
@@ -217,53 +1300,14 @@ async def get_issue(
     gitctx: Annotated[Connector, Depends(connection)],
     issue_number: Annotated[int, Path(title="Issue")],
 ):
-    issue = gitctx.get(
+    issue = await gitctx.get(
         f"/repos/{context.github_repo}/issues/{issue_number}",
         headers={"Accept": "application/vnd.github.html+json"},
     )
     if "pull_request" not in issue:
-        query = """query($owner: String!, $repo: String!, $issue: Int!) {
-            repository(owner: $owner, name: $repo, followRenames: true) {
-                issue(number: $issue) {
-                    closedByPullRequestsReferences(first: 100, includeClosedPrs: true) {
-                        nodes {
-                            number
-                            title
-                            url
-                        }
-                    }
-                }
-            }
-        }
-        """
-        try:
-            response = gitctx.post(
-                "/graphql",
-                data={
-                    "query": query,
-                    "variables": {
-                        "owner": gitctx.owner,
-                        "repo": gitctx.repo,
-                        "issue": issue["number"],
-                    },
-                },
-            )
-            data = response["data"]
-            issue_node = data["repository"]["issue"]
-            closed = issue_node["closedByPullRequestsReferences"]["nodes"]
-            if len(closed) > 0:
-                issue["closed_by"] = [
-                    {
-                        "number": linked["number"],
-                        "title": linked["title"],
-                        "url": linked["url"],
-                    }
-                    for linked in closed
-                ]
-        except Exception as e:
-            logger.exception(
-                f"Error finding linked PRs for issue {issue['number']}: {e!r}"
-            )
+        linked = await find_linked_prs(gitctx, [issue["number"]])
+        if linked.get(issue["number"]):
+            issue["closed_by"] = linked[issue["number"]]
     return issue
 
 
@@ -271,16 +1315,26 @@ async def get_issue(
 async def get_comments(
     gitctx: Annotated[Connector, Depends(connection)],
     issue_number: Annotated[int, Path(title="Issue")],
+    fields: Annotated[
+        str | None,
+        Query(
+            title="Fields",
+            description='A profile ("default", "full"...) or attribute paths',
+        ),
+    ] = None,
 ):
     start = time.time()
-    comments = gitctx.get_paged(
-        f"/repos/{context.github_repo}/issues/{issue_number}/comments",
-        headers={"Accept": "application/vnd.github.html+json"},
+    comments = await cache.get(
+        ("comments", issue_number),
+        lambda: gitctx.get_paged(
+            f"/repos/{context.github_repo}/issues/{issue_number}/comments",
+            headers={"Accept": "application/vnd.github.html+json"},
+        ),
     )
     logger.debug(
         f"{len(comments)} issue {issue_number} comments: {time.time() - start:.3f} seconds"
     )
-    return comments
+    return project(comments, projection_for("comments", fields))
 
 
 @api_router.get("/issues/{issue_number}/reactions")
@@ -289,7 +1343,7 @@ async def get_issue_reactions(
     issue_number: Annotated[int, Path(title="Issue")],
 ):
     start = time.time()
-    reactions = gitctx.get_paged(
+    reactions = await gitctx.get_paged(
         f"/repos/{context.github_repo}/issues/{issue_number}/reactions",
         headers={"Accept": "application/vnd.github.html+json"},
     )
@@ -304,19 +1358,242 @@ async def get_comment_reactions(
     gitctx: Annotated[Connector, Depends(connection)],
     comment_id: Annotated[int, Path(title="Comment")],
 ):
-    reactions = gitctx.get_paged(
+    reactions = await gitctx.get_paged(
         f"/repos/{context.github_repo}/issues/comments/{comment_id}/reactions",
         headers={"Accept": "application/vnd.github.html+json"},
     )
     return reactions
 
 
+# GraphQL reaction content, as the REST API names it
+REACTION_CONTENT = {
+    "THUMBS_UP": "+1",
+    "THUMBS_DOWN": "-1",
+    "LAUGH": "laugh",
+    "HOORAY": "hooray",
+    "CONFUSED": "confused",
+    "HEART": "heart",
+    "ROCKET": "rocket",
+    "EYES": "eyes",
+}
+
+REACTION_FIELDS = """
+    reactions(first: 100) {
+        pageInfo {
+            hasNextPage
+        }
+        nodes {
+            id
+            databaseId
+            content
+            createdAt
+            user {
+                databaseId
+                login
+                url
+                avatarUrl
+            }
+        }
+    }
+"""
+
+
+def graphql_reaction(node: dict[str, Any]) -> dict[str, Any]:
+    """Convert a GraphQL reaction node to the REST API shape."""
+    return {
+        "id": node["databaseId"],
+        "node_id": node["id"],
+        "content": REACTION_CONTENT.get(node["content"], node["content"].lower()),
+        "created_at": node["createdAt"],
+        "user": graphql_user(node.get("user")),
+    }
+
+
+class CommentSubject(BaseModel):
+    id: int = Field(title="Comment ID")
+    node_id: str = Field(title="Comment Node ID")
+
+
+class ReactionSubjects(BaseModel):
+    issues: list[int] = Field(default=[], title="Issue Numbers")
+    comments: list[CommentSubject] = Field(default=[], title="Comments")
+
+
+async def find_reactions(
+    gitctx: Connector, issues: list[int], comments: dict[str, int]
+) -> dict[str, dict[str, list[dict[str, Any]]]]:
+    """Find the reactions to many issues and comments.
+
+    Each GraphQL query looks up a batch of issues with aliases ("i<number>")
+    and a batch of comments by node ID. Anything with more than a page of
+    reactions, or in a batch whose query fails, is paged through the REST
+    API instead; a failure there is logged, and only that item is left out.
+
+    Args:
+        gitctx: The GitHub connection
+        issues: Issue numbers
+        comments: The REST IDs of comments, by node ID (the REST "node_id")
+
+    Returns:
+        {"issues": {number: reactions}, "comments": {id: reactions}}, keyed
+        by issue number and the comment's REST ID; comments that can't be
+        found are omitted
+    """
+    found: dict[str, dict[str, list[dict[str, Any]]]] = {"issues": {}, "comments": {}}
+    rest: list[tuple[str, str, str]] = []
+    node_ids = list(comments)
+    batch_size = context.graphql_batch_size
+    for start in range(0, max(len(issues), len(node_ids)), batch_size):
+        issue_batch = issues[start : start + batch_size]
+        comment_batch = node_ids[start : start + batch_size]
+        aliases = "\n".join(
+            f"i{n}: issue(number: {n}) {{ {REACTION_FIELDS} }}" for n in issue_batch
+        )
+        query = f"""query($owner: String!, $repo: String!, $ids: [ID!]!) {{
+            repository(owner: $owner, name: $repo, followRenames: true) {{
+                id
+                {aliases}
+            }}
+            nodes(ids: $ids) {{
+                ... on IssueComment {{
+                    databaseId
+                    {REACTION_FIELDS}
+                }}
+            }}
+        }}
+        """
+        try:
+            response = await gitctx.post(
+                "/graphql",
+                data={
+                    "query": query,
+                    "variables": {
+                        "owner": gitctx.owner,
+                        "repo": gitctx.repo,
+                        "ids": comment_batch,
+                    },
+                },
+            )
+            data = response["data"]
+            if data is None:
+                raise ValueError(f"GraphQL errors: {response.get('errors')!r}")
+        except Exception as e:
+            logger.exception(f"Error finding reactions: {e!r}")
+            # Page through the whole batch with REST instead
+            rest.extend(
+                ("issues", str(n), f"/issues/{n}/reactions") for n in issue_batch
+            )
+            rest.extend(
+                (
+                    "comments",
+                    str(comments[i]),
+                    f"/issues/comments/{comments[i]}/reactions",
+                )
+                for i in comment_batch
+            )
+            continue
+        repository = data.get("repository") or {}
+        for n in issue_batch:
+            reactions = (repository.get(f"i{n}") or {}).get("reactions")
+            if not reactions or reactions["pageInfo"]["hasNextPage"]:
+                rest.append(("issues", str(n), f"/issues/{n}/reactions"))
+                continue
+            found["issues"][str(n)] = [graphql_reaction(r) for r in reactions["nodes"]]
+        nodes = data.get("nodes") or [None] * len(comment_batch)
+        for node_id, node in zip(comment_batch, nodes):
+            if not node or "databaseId" not in node:
+                logger.warning(f"Can't find reactions to comment {node_id}")
+                continue
+            comment_id = str(node["databaseId"])
+            if node["reactions"]["pageInfo"]["hasNextPage"]:
+                rest.append(
+                    (
+                        "comments",
+                        comment_id,
+                        f"/issues/comments/{comment_id}/reactions",
+                    )
+                )
+                continue
+            found["comments"][comment_id] = [
+                graphql_reaction(r) for r in node["reactions"]["nodes"]
+            ]
+
+    async def page(kind: str, key: str, path: str):
+        try:
+            found[kind][key] = await gitctx.get_paged(
+                f"/repos/{context.github_repo}{path}",
+                headers={"Accept": "application/vnd.github.html+json"},
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"Can't find reactions to {kind} {key}: {e!r}")
+
+    await asyncio.gather(*(page(*r) for r in rest))
+    return found
+
+
+@api_router.post("/reactions")
+async def get_reactions(
+    gitctx: Annotated[Connector, Depends(connection)],
+    subjects: Annotated[ReactionSubjects, Body(title="Subjects")],
+):
+    """Get the reactions to a list of issues and comments at once"""
+    start = time.time()
+    reactions = await find_reactions(
+        gitctx, subjects.issues, {c.node_id: c.id for c in subjects.comments}
+    )
+    logger.debug(
+        f"reactions to {len(subjects.issues)} issues, {len(subjects.comments)} "
+        f"comments: {time.time() - start:.3f} seconds"
+    )
+    return reactions
+
+
+def has_reactions(item: dict[str, Any]) -> bool:
+    """Check an issue or comment's reaction rollup, if it has one."""
+    return item.get("reactions", {}).get("total_count", 1) > 0
+
+
+@api_router.get("/issue/{issue_number}/bundle")
+async def get_issue_bundle(
+    gitctx: Annotated[Connector, Depends(connection)],
+    issue_number: Annotated[int, Path(title="Issue")],
+):
+    """Get an issue with its linked PRs, comments and all their reactions.
+
+    The issue and its comments are fetched concurrently, then the reactions
+    to all of them are found together (see find_reactions). Reactions
+    aren't looked up for an issue or comment whose reaction rollup says it
+    has none.
+    """
+    start = time.time()
+    issue, comments = await asyncio.gather(
+        get_issue(gitctx, issue_number), get_comments(gitctx, issue_number)
+    )
+    issues = [issue_number] if has_reactions(issue) else []
+    reacted = {c["node_id"]: c["id"] for c in comments if has_reactions(c)}
+    found = {"issues": {}, "comments": {}}
+    if issues or reacted:
+        found = await find_reactions(gitctx, issues, reacted)
+    logger.debug(
+        f"issue {issue_number} bundle, {len(comments)} comments: "
+        f"{time.time() - start:.3f} seconds"
+    )
+    return {
+        "issue": issue,
+        "reactions": found["issues"].get(str(issue_number), []),
+        "comments": comments,
+        "comment_reactions": {
+            str(c["id"]): found["comments"].get(str(c["id"]), []) for c in comments
+        },
+    }
+
+
 # """Milestone Management"""
 
 
-@api_router.get("/milestones")
-async def get_milestones(gitctx: Annotated[Connector, Depends(connection)]):
-    milestones = gitctx.get_paged(
+async def load_milestones(gitctx: Connector) -> list[dict]:
+    """Load the open milestones, semver titles first then alphabetically."""
+    milestones = await gitctx.get_paged(
         f"/repos/{context.github_repo}/milestones",
         headers={"Accept": "application/vnd.github.html+json"},
     )
@@ -327,18 +1604,22 @@ async def get_milestones(gitctx: Annotated[Connector, Depends(connection)]):
             versions.append(m)
         else:
             others.append(m)
-    milestones = sorted(versions, key=lambda x: x["title"]) + sorted(
+    return sorted(versions, key=lambda x: x["title"]) + sorted(
         others, key=lambda x: x["title"]
     )
-    milestones.append(
+
+
+@api_router.get("/milestones")
+async def get_milestones(gitctx: Annotated[Connector, Depends(connection)]):
+    milestones = await cache.get(("milestones",), lambda: load_milestones(gitctx))
+    return milestones + [
         {
             "title": "none",
             "number": 0,
             "description": "No milestone",
             "due_on": None,
         }
-    )
-    return milestones
+    ]
 
 
 class CreateMilestone(BaseModel):
@@ -362,7 +1643,9 @@ async def create_milestone(
     }
     if milestone.due_on:
         data["due_on"] = milestone.due_on.isoformat()
-    m = gitctx.post(f"/repos/{context.github_repo}/milestones", data=data)
+    m = await gitctx.post(f"/repos/{context.github_repo}/milestones", data=data)
+    cache.invalidate(("milestones",))
+    broker.publish("milestones", {"action": "created", "number": m["number"]})
     return m
 
 
@@ -371,7 +1654,13 @@ async def delete_milestone(
     gitctx: Annotated[Connector, Depends(connection)],
     milestone_number: Annotated[int, Path(title="Milestone")],
 ):
-    gitctx.delete(f"/repos/{context.github_repo}/milestones/{milestone_number}")
+    await gitctx.delete(f"/repos/{context.github_repo}/milestones/{milestone_number}")
+    cache.invalidate(("milestones",))
+    # The milestone's open issues now have no milestone
+    cache.invalidate(("issues", milestone_number))
+    cache.invalidate(("issues", 0))
+    broker.publish("milestones", {"action": "deleted", "number": milestone_number})
+    broker.publish("issues", {"milestone": 0})
     return {"message": f"{milestone_number} milestone deleted"}
 
 
@@ -381,11 +1670,12 @@ async def add_milestone_to_issue(
     issue_number: Annotated[int, Path(title="Issue")],
     milestone_number: Annotated[int, Path(title="Milestone")],
 ):
-    issue = gitctx.patch(
+    return await issue_writes.submit(
+        gitctx,
         f"/repos/{context.github_repo}/issues/{issue_number}",
-        data={"milestone": milestone_number},
+        "set_milestone",
+        milestone_number,
     )
-    return issue
 
 
 @api_router.delete("/issues/{issue_number}/milestone/{milestone_number}")
@@ -394,23 +1684,37 @@ async def remove_milestone_from_issue(
     issue_number: Annotated[int, Path(title="Issue")],
     milestone_number: Annotated[int, Path(title="Milestone")],
 ):
-    issue = gitctx.patch(
+    return await issue_writes.submit(
+        gitctx,
         f"/repos/{context.github_repo}/issues/{issue_number}",
-        data={"milestone": None},
+        "set_milestone",
+        None,
     )
-    return issue
 
 
 # """Label Management"""
 
 
-@api_router.get("/labels")
-async def get_labels(gitctx: Annotated[Connector, Depends(connection)]):
-    labels = gitctx.get_paged(
+async def load_labels(gitctx: Connector) -> list[dict]:
+    return await gitctx.get_paged(
         f"/repos/{context.github_repo}/labels",
         headers={"Accept": "application/vnd.github.html+json"},
     )
-    return labels
+
+
+@api_router.get("/labels")
+async def get_labels(
+    gitctx: Annotated[Connector, Depends(connection)],
+    fields: Annotated[
+        str | None,
+        Query(
+            title="Fields",
+            description='A profile ("default", "full"...) or attribute paths',
+        ),
+    ] = None,
+):
+    labels = await cache.get(("labels",), lambda: load_labels(gitctx))
+    return project(labels, projection_for("labels", fields))
 
 
 class CreateLabel(BaseModel):
@@ -424,7 +1728,7 @@ async def create_label(
     gitctx: Annotated[Connector, Depends(connection)],
     label: Annotated[CreateLabel, Body(title="Label")],
 ):
-    response = gitctx.post(
+    response = await gitctx.post(
         f"/repos/{context.github_repo}/labels",
         data={
             "name": label.name,
@@ -432,6 +1736,8 @@ async def create_label(
             "description": label.description,
         },
     )
+    cache.invalidate(("labels",))
+    broker.publish("labels", {"action": "created", "name": label.name})
     return response
 
 
@@ -439,7 +1745,9 @@ async def create_label(
 async def delete_label(
     gitctx: Annotated[Connector, Depends(connection)], label_name: str
 ):
-    gitctx.delete(f"/repos/{context.github_repo}/labels/{label_name}")
+    await gitctx.delete(f"/repos/{context.github_repo}/labels/{label_name}")
+    cache.invalidate(("labels",))
+    label_deleted(label_name)
     return {"message": f"{label_name} label deleted"}
 
 
@@ -449,15 +1757,12 @@ async def add_label_to_issue(
     issue_number: Annotated[int, Path(title="Issue")],
     label_name: Annotated[str, Path(title="Label")],
 ):
-    issue = gitctx.get(f"/repos/{context.github_repo}/issues/{issue_number}")
-    labels = set([label["name"] for label in issue["labels"]])
-    if label_name not in labels:
-        labels.add(label_name)
-        issue = gitctx.patch(
-            f"/repos/{context.github_repo}/issues/{issue_number}",
-            data={"labels": list(labels)},
-        )
-    return issue
+    return await issue_writes.submit(
+        gitctx,
+        f"/repos/{context.github_repo}/issues/{issue_number}",
+        "add_label",
+        label_name,
+    )
 
 
 @api_router.delete("/issues/{issue_number}/labels/{label_name}")
@@ -466,30 +1771,31 @@ async def remove_label_from_issue(
     issue_number: Annotated[int, Path(title="Issue")],
     label_name: Annotated[str, Path(title="Label")],
 ):
-    issue = gitctx.get(f"/repos/{context.github_repo}/issues/{issue_number}")
-    labels = set([label["name"] for label in issue["labels"]])
-    if label_name in labels:
-        labels.remove(label_name)
-        issue = gitctx.patch(
-            f"/repos/{context.github_repo}/issues/{issue_number}",
-            data={"labels": list(labels)},
-        )
-    return issue
+    return await issue_writes.submit(
+        gitctx,
+        f"/repos/{context.github_repo}/issues/{issue_number}",
+        "remove_label",
+        label_name,
+    )
 
 
 # Assignee Management
 
 
-@api_router.get("/assignees")
-async def get_assignees(gitctx: Annotated[Connector, Depends(connection)]):
-    """Get all allowed assignees for the repository"""
-    assignees = gitctx.get_paged(
+async def load_assignees(gitctx: Connector) -> list[dict]:
+    assignees = await gitctx.get_paged(
         f"/repos/{context.github_repo}/assignees",
         headers={"Accept": "application/vnd.github.html+json"},
     )
     return sorted(assignees, key=lambda x: x["login"])
 
 
+@api_router.get("/assignees")
+async def get_assignees(gitctx: Annotated[Connector, Depends(connection)]):
+    """Get all allowed assignees for the repository"""
+    return await cache.get(("assignees",), lambda: load_assignees(gitctx))
+
+
 @api_router.post("/issues/{issue_number}/assignees")
 async def add_assignee_to_issue(
     gitctx: Annotated[Connector, Depends(connection)],
@@ -497,9 +1803,11 @@ async def add_assignee_to_issue(
     assignees: Annotated[list[str], Body(title="Assignees")],
 ):
     # Use PATCH to replace all assignees (GitHub API best practice)
-    issue = gitctx.patch(
+    issue = await issue_writes.submit(
+        gitctx,
         f"/repos/{context.github_repo}/issues/{issue_number}",
-        data={"assignees": assignees},
+        "set_assignees",
+        assignees,
     )
     logger.info(
         f"Added assignees to issue {issue_number}: {[i['login'] for i in issue['assignees']]}"
@@ -513,11 +1821,98 @@ async def remove_assignee_from_issue(
     issue_number: Annotated[int, Path(title="Issue")],
     assignees: Annotated[list[str], Body(title="Assignees")],
 ):
-    issue = gitctx.delete(
-        f"/repos/{context.github_repo}/issues/{issue_number}/assignees",
-        data={"assignees": assignees},
+    issue = await issue_writes.submit(
+        gitctx,
+        f"/repos/{context.github_repo}/issues/{issue_number}",
+        "remove_assignees",
+        assignees,
     )
     logger.info(
         f"Removed assignees from issue {issue_number}: {[i['login'] for i in issue['assignees']]}"
     )
     return issue
+
+
+# Bulk Changes
+
+
+class IssueOperation(BaseModel):
+    issue: int = Field(title="Issue")
+    action: Literal[
+        "add_label",
+        "remove_label",
+        "add_milestone",
+        "remove_milestone",
+        "add_assignees",
+        "remove_assignees",
+    ] = Field(title="Action")
+    label: str | None = Field(default=None, title="Label Name")
+    milestone: int | None = Field(default=None, title="Milestone")
+    assignees: list[str] | None = Field(default=None, title="Assignees")
+
+    @model_validator(mode="after")
+    def check_argument(self) -> "IssueOperation":
+        if self.action.endswith("_label") and not self.label:
+            raise ValueError(f"{self.action} requires a label")
+        if self.action == "add_milestone" and self.milestone is None:
+            raise ValueError("add_milestone requires a milestone")
+        if self.action.endswith("_assignees") and self.assignees is None:
+            raise ValueError(f"{self.action} requires assignees")
+        return self
+
+
+async def apply_operation(gitctx: Connector, op: IssueOperation) -> dict[str, Any]:
+    """Apply one bulk operation using the single-issue route, and report it."""
+    try:
+        match op.action:
+            case "add_label":
+                await add_label_to_issue(gitctx, op.issue, op.label)
+            case "remove_label":
+                await remove_label_from_issue(gitctx, op.issue, op.label)
+            case "add_milestone":
+                await add_milestone_to_issue(gitctx, op.issue, op.milestone)
+            case "remove_milestone":
+                await remove_milestone_from_issue(gitctx, op.issue, op.milestone or 0)
+            case "add_assignees":
+                await add_assignee_to_issue(gitctx, op.issue, op.assignees)
+            case "remove_assignees":
+                await remove_assignee_from_issue(gitctx, op.issue, op.assignees)
+    except Exception as e:
+        logger.exception(f"Error applying {op.action} to issue {op.issue}: {e!r}")
+        return {"issue": op.issue, "action": op.action, "ok": False, "error": str(e)}
+    return {"issue": op.issue, "action": op.action, "ok": True}
+
+
+@api_router.post("/issues/bulk")
+async def bulk_change_issues(
+    gitctx: Annotated[Connector, Depends(connection)],
+    operations: Annotated[list[IssueOperation], Body(title="Operations")],
+):
+    """Apply a list of changes to issues, reporting the result of each.
+
+    Changes to different issues are made concurrently, up to a limit which
+    keeps us clear of GitHub's secondary rate limits; changes to the same
+    issue are queued together, so they're applied in order and written at
+    once. A failed change doesn't stop the others.
+    """
+    start = time.time()
+    limit = asyncio.Semaphore(context.bulk_concurrency)
+    results: list[dict[str, Any]] = [{}] * len(operations)
+    by_issue: dict[int, list[int]] = defaultdict(list)
+    for n, op in enumerate(operations):
+        by_issue[op.issue].append(n)
+
+    async def apply(indexes: list[int]):
+        async with limit:
+            done = await asyncio.gather(
+                *(apply_operation(gitctx, operations[n]) for n in indexes)
+            )
+        for n, result in zip(indexes, done):
+            results[n] = result
+
+    await asyncio.gather(*(apply(indexes) for indexes in by_issue.values()))
+    failed = sum(1 for r in results if not r["ok"])
+    logger.info(
+        f"{len(operations)} bulk changes ({failed} failed): {time.time() - start:.3f} seconds"
+    )
+    return results
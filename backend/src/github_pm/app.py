@@ -1,8 +1,54 @@
-from fastapi import APIRouter, FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Annotated, AsyncGenerator
 
-from github_pm.api import api_router
+from fastapi import APIRouter, FastAPI, Header, Request, Response
 
-router = APIRouter()
+from github_pm.api import api_router, open_connector
+from github_pm.cache import cache
+from github_pm.codec import FastJSONResponse, loads, NegotiatedRoute
+from github_pm.compress import CompressionMiddleware
+from github_pm.context import context
+from github_pm.logger import logger
+from github_pm.metrics import CONTENT_TYPE, render
+from github_pm.refresher import start_refresher
+from github_pm.store import Store
+from github_pm.webhooks import handle_event, verify_signature
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    """Open the shared GitHub connection pool for the life of the app.
+
+    If a store is configured, it's attached to the response cache so that
+    reads can be answered from disk at once after a restart. If a refresh
+    interval is configured, the cache is kept fresh in the background.
+    """
+    refresher = None
+    try:
+        app.state.connector = open_connector()
+    except Exception as e:
+        # The connection() dependency will retry, and report the failure
+        logger.exception(f"Error opening GitHub service: {e}")
+    if context.store_path:
+        cache.store = Store(context.store_path)
+    if getattr(app.state, "connector", None) is not None:
+        refresher = start_refresher(app.state.connector)
+    yield
+    if refresher:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+    if cache.store:
+        cache.store.close()
+        cache.store = None
+    connector = getattr(app.state, "connector", None)
+    if connector is not None:
+        await connector.close()
+        app.state.connector = None
+
+
+router = APIRouter(route_class=NegotiatedRoute)
 
 
 @router.get("/health")
@@ -10,11 +56,40 @@ async def health():
     return {"message": "OK"}
 
 
+@router.get("/metrics")
+async def get_metrics(request: Request):
+    """Report performance metrics, for Prometheus"""
+    connector = getattr(request.app.state, "connector", None)
+    return Response(render(connector), media_type=CONTENT_TYPE)
+
+
+@router.post("/webhooks/github")
+async def github_webhook(
+    request: Request,
+    x_github_event: Annotated[str, Header()],
+    x_hub_signature_256: Annotated[str | None, Header()] = None,
+):
+    """Receive a GitHub webhook delivery, and apply it to cached state"""
+    body = await request.body()
+    verify_signature(body, x_hub_signature_256)
+    if x_github_event == "ping":
+        return {"message": "pong"}
+    applied = handle_event(x_github_event, loads(body))
+    return {"message": f"{x_github_event} {'applied' if applied else 'ignored'}"}
+
+
 router.include_router(api_router, prefix="/api/v1")
 
 app = FastAPI(
     title="GitHub Project Management API",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=context.compression_min_size,
+    cache_bytes=context.compression_cache_bytes,
+)
 app.include_router(router)
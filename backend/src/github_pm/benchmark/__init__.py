@@ -0,0 +1,6 @@
+"""Benchmarks of the service's hot paths, run against the sample data."""
+
+from pathlib import Path
+
+# The GitHub responses saved in the source tree
+SAMPLES = Path(__file__).parents[3] / "sample_json"
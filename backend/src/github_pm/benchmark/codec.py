@@ -0,0 +1,87 @@
+"""Benchmark JSON and MessagePack encoding of an issue list.
+
+    python -m github_pm.benchmark.codec [--copies N] [--repeat N] [FILE]
+
+Decodes and encodes a saved GitHub issue list (sample_json/issues.json by
+default) with the standard library's json module, FastAPI's default path
+(jsonable_encoder and then json), and orjson and msgpack if installed. The
+sample is small, so --copies repeats its issues to make a list the size of
+a busy milestone.
+"""
+
+import json
+from pathlib import Path
+import timeit
+from typing import Any, Callable
+
+import click
+from fastapi.encoders import jsonable_encoder
+
+from github_pm import codec
+from github_pm.benchmark import SAMPLES
+
+
+def stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fastapi_dumps(value: Any) -> bytes:
+    return stdlib_dumps(jsonable_encoder(value))
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    """Return the best time of a function, in milliseconds."""
+    number = max(1, repeat // 5)
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1000.0
+
+
+def run(issues: list[dict], repeat: int) -> list[tuple[str, float, float, int]]:
+    """Time each codec.
+
+    Returns:
+        (name, decode ms, encode ms, encoded bytes) for each codec
+    """
+    text = stdlib_dumps(issues)
+    codecs: list[tuple[str, Callable[[bytes], Any], Callable[[Any], bytes]]] = [
+        ("json", json.loads, stdlib_dumps),
+        ("fastapi", json.loads, fastapi_dumps),
+    ]
+    if codec.orjson:
+        codecs.append(("orjson", codec.orjson.loads, codec.orjson.dumps))
+    if codec.msgpack:
+        packed = codec.msgpack.packb(issues)
+        codecs.append(
+            ("msgpack", lambda _: codec.msgpack.unpackb(packed), codec.msgpack.packb)
+        )
+    results = []
+    for name, decode, encode in codecs:
+        results.append(
+            (
+                name,
+                measure(lambda: decode(text), repeat),
+                measure(lambda: encode(issues), repeat),
+                len(encode(issues)),
+            )
+        )
+    return results
+
+
+@click.command()
+@click.option("--copies", default=50, help="Repeat the sample's issues N times")
+@click.option("--repeat", default=50, help="Calls timed for each measurement")
+@click.argument(
+    "file",
+    type=click.Path(exists=True, path_type=Path),
+    default=SAMPLES / "issues.json",
+)
+def main(copies: int, repeat: int, file: Path):
+    """Benchmark encoding an issue list."""
+    issues = json.loads(file.read_bytes()) * copies
+    click.echo(f"{len(issues)} issues from {file}")
+    click.echo(f"{'codec':<10}{'decode ms':>12}{'encode ms':>12}{'bytes':>12}")
+    for name, decode, encode, size in run(issues, repeat):
+        click.echo(f"{name:<10}{decode:>12.2f}{encode:>12.2f}{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
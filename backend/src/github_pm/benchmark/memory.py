@@ -0,0 +1,83 @@
+"""Benchmark the memory and sorting time of a cached issue list.
+
+    python -m github_pm.benchmark.memory [--copies N] [FILE]
+
+Compares a list of issues as decoded from GitHub's JSON with the same list
+converted to Issue objects sharing their users, labels and milestones. The
+sample is decoded once for each copy, as separate pages would be, so the
+copies share nothing until they're interned.
+"""
+
+import gc
+import json
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import click
+
+from github_pm.api import IssueSorter
+from github_pm.benchmark import SAMPLES
+from github_pm.model import Interner
+
+
+def allocated(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return a value, and the bytes of memory it holds."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+def sort_time(issues: list[dict], sort_by: list[str], repeat: int) -> float:
+    """Return the best time to sort the issues, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sorter = IssueSorter(sort_by)
+        sorter.hold(issues)
+        sorter.finish()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+@click.command()
+@click.option("--copies", default=50, help="Decode the sample's issues N times")
+@click.option("--repeat", default=10, help="Sorts timed for each measurement")
+@click.option("--sort", default="bug,enhancement", help="Labels to sort by")
+@click.argument(
+    "file",
+    type=click.Path(exists=True, path_type=Path),
+    default=SAMPLES / "issues.json",
+)
+def main(copies: int, repeat: int, sort: str, file: Path):
+    """Compare issue lists as dicts and as interned Issues."""
+    text = file.read_bytes()
+    sort_by = [s.strip().lower() for s in sort.split(",")]
+
+    def decode() -> list[dict]:
+        return [i for _ in range(copies) for i in json.loads(text)]
+
+    def intern() -> list[dict]:
+        interner = Interner()
+        return [i for _ in range(copies) for i in interner.issues(json.loads(text))]
+
+    issues, dict_bytes = allocated(decode)
+    click.echo(f"{len(issues)} issues from {file}")
+    click.echo(f"{'form':<10}{'MiB':>12}{'sort ms':>12}")
+    dict_sort = sort_time(issues, sort_by, repeat)
+    del issues
+    interned, issue_bytes = allocated(intern)
+    issue_sort = sort_time(interned, sort_by, repeat)
+    click.echo(f"{'dict':<10}{dict_bytes / 2**20:>12.2f}{dict_sort:>12.2f}")
+    click.echo(f"{'Issue':<10}{issue_bytes / 2**20:>12.2f}{issue_sort:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""In-process cache of the results of GitHub reads.
+
+Read routes ask the cache for a key like ("issues", 3), giving a loader to
+call on a miss. Entries expire after a per-resource TTL (the first element
+of the key), and the least recently used entries are evicted to keep the
+total (JSON encoded) size within a byte budget. Concurrent misses on the
+same key share a single load, so an expiring entry doesn't cause a stampede
+of identical GitHub calls.
+
+If a persistent Store is attached, values are written through to it, and a
+miss on a key the store has is answered from the store at once while the
+value is reloaded in the background ("warm" entries).
+
+Cached values are shared between requests and must be treated as read-only:
+to change one, use update() to replace it.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from typing import Any, Awaitable, Callable, Iterator, TYPE_CHECKING
+
+from github_pm.codec import dumps
+from github_pm.context import context
+from github_pm.logger import logger
+from github_pm.metrics import CACHE_LOOKUPS
+from github_pm.resilience import shared
+
+if TYPE_CHECKING:
+    from github_pm.store import Store
+
+Key = tuple[Any, ...]
+
+
+@dataclass
+class Entry:
+    value: Any
+    size: int
+    expires: float
+    warm: bool = False
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttls: dict[str, float]):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: The maximum total size of cached values, or 0 to
+                disable caching
+            ttls: Seconds to keep each resource; resources with no TTL (or 0)
+                aren't cached
+        """
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[Key, Entry] = OrderedDict()
+        self.loading: dict[Key, asyncio.Task] = {}
+        self.store: "Store | None" = None
+
+    def enabled(self, resource: str) -> bool:
+        return self.max_bytes > 0 and self.ttls.get(resource, 0) > 0
+
+    async def get(self, key: Key, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Get a cached value, loading it on a miss.
+
+        Args:
+            key: The cache key; key[0] names the resource
+            loader: Called (once, however many callers miss together) to load
+                the value
+
+        Returns:
+            The cached or loaded value
+        """
+        if not self.enabled(key[0]):
+            return await loader()
+        entry = self.entries.get(key)
+        if entry and entry.expires > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.inc("response", "hit")
+            return entry.value
+        if entry is None and self.store:
+            value = await self.store.load(key)
+            # Check again: another request may have loaded it while we waited
+            if value is not None and key not in self.entries:
+                self.put(key, value, expires=0.0, warm=True, save=False)
+            entry = self.entries.get(key)
+        task, _ = shared(self.loading, key, lambda: self._load(key, loader))
+        if entry and entry.warm:
+            # Serve the stored value while it's refreshed
+            self.entries.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.inc("response", "hit")
+            return entry.value
+        self.misses += 1
+        CACHE_LOOKUPS.inc("response", "miss")
+        return await asyncio.shield(task)
+
+    async def refresh(self, key: Key, loader: Callable[[], Awaitable[Any]]):
+        """Reload a value ahead of its expiration.
+
+        Callers asking for the key meanwhile are still served the cached
+        value (or share the reload, if there is none).
+
+        Args:
+            key: The cache key
+            loader: Called to load the value, unless a load is in progress
+        """
+        if not self.enabled(key[0]):
+            return
+        task, _ = shared(self.loading, key, lambda: self._load(key, loader))
+        await asyncio.shield(task)
+
+    async def _load(self, key: Key, loader: Callable[[], Awaitable[Any]]) -> Any:
+        me = asyncio.current_task()
+        value = await loader()
+        # If the key was invalidated or updated while we were loading, our
+        # value may predate the change, so don't save it.
+        if self.loading.get(key) is me:
+            self.put(key, value)
+        return value
+
+    def put(
+        self,
+        key: Key,
+        value: Any,
+        expires: float | None = None,
+        warm: bool = False,
+        save: bool = True,
+    ):
+        """Save a value, evicting least recently used entries to make room.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+            expires: The monotonic time the value expires (default per TTL)
+            warm: The value came from the store, and hasn't been refreshed
+            save: Write the value through to the store
+        """
+        if not self.enabled(key[0]):
+            return
+        if save and self.store:
+            self.store.save(key, value)
+        self.discard(key)
+        size = len(dumps(value))
+        if size > self.max_bytes:
+            logger.debug(f"{key} is too big to cache: {size} bytes")
+            return
+        if expires is None:
+            expires = time.monotonic() + self.ttls[key[0]]
+        self.entries[key] = Entry(value=value, size=size, expires=expires, warm=warm)
+        self.size += size
+        while self.size > self.max_bytes:
+            old_key, old = self.entries.popitem(last=False)
+            self.size -= old.size
+            logger.debug(f"evicted {old_key} ({old.size} bytes)")
+
+    def discard(self, key: Key):
+        old = self.entries.pop(key, None)
+        if old:
+            self.size -= old.size
+
+    def invalidate(self, key: Key):
+        """Forget a cached value, and any load of it in progress."""
+        self.discard(key)
+        self.loading.pop(key, None)
+        if self.store:
+            self.store.discard(key)
+
+    def invalidate_resource(self, resource: str):
+        """Forget all cached values of a resource."""
+        for key in [k for k in (*self.entries, *self.loading) if k[0] == resource]:
+            self.invalidate(key)
+
+    def items(self, resource: str) -> Iterator[tuple[Key, Any]]:
+        """Iterate over the cached (key, value) pairs of a resource."""
+        for key, entry in list(self.entries.items()):
+            if key[0] == resource:
+                yield key, entry.value
+
+    def update(self, key: Key, change: Callable[[Any], Any]):
+        """Replace a cached value with a changed copy, keeping its expiration.
+
+        Any load of the key in progress is abandoned, as it may not reflect
+        the change.
+
+        Args:
+            key: The cache key
+            change: Given the cached value, returns the new value
+        """
+        self.loading.pop(key, None)
+        entry = self.entries.get(key)
+        if entry:
+            self.put(key, change(entry.value), expires=entry.expires, warm=entry.warm)
+
+    def clear(self):
+        self.entries.clear()
+        self.loading.clear()
+        self.size = 0
+
+
+cache = ResponseCache(
+    max_bytes=context.cache_max_bytes,
+    ttls={
+        "milestones": context.cache_ttl_milestones,
+        "labels": context.cache_ttl_labels,
+        "assignees": context.cache_ttl_assignees,
+        "issues": context.cache_ttl_issues,
+        "comments": context.cache_ttl_comments,
+    },
+)
@@ -0,0 +1,186 @@
+"""Fast JSON encoding and decoding, and MessagePack responses.
+
+GitHub's issue lists are large, and decoding them (and encoding our replies)
+with the standard library's json module is a noticeable part of each
+request. When the optional "orjson" package is installed we use it instead;
+otherwise we fall back to json, with the same results.
+
+Our routes are registered with NegotiatedRoute, which encodes their results
+directly rather than through FastAPI's jsonable_encoder and JSONResponse.
+A client which asks for "application/msgpack" in its Accept header gets
+MessagePack instead of JSON, if the optional "msgpack" package is installed.
+"""
+
+from contextvars import ContextVar
+import functools
+import inspect
+import json
+import time
+from typing import Any, Callable
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from github_pm.metrics import ROUTE_BYTES, ROUTE_SECONDS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+
+# The Accept header of the request being handled
+accept: ContextVar[str] = ContextVar("accept", default="")
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON.
+
+    Values JSON doesn't represent directly (like datetimes and pydantic
+    models) are converted as FastAPI would.
+    """
+    if orjson:
+        return orjson.dumps(value, default=jsonable_encoder)
+    return json.dumps(
+        value,
+        default=jsonable_encoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def packb(value: Any) -> bytes:
+    """Encode a value as MessagePack."""
+    return msgpack.packb(value, default=jsonable_encoder)
+
+
+def accepts_msgpack(accept_header: str) -> bool:
+    """Decide whether a client asked for MessagePack.
+
+    MessagePack is only sent when the client lists it (with a non-zero
+    quality) and the msgpack package is installed.
+    """
+    if msgpack is None:
+        return False
+    for item in accept_header.split(","):
+        media_type, _, params = item.strip().partition(";")
+        if media_type.strip().lower() in (MSGPACK, "application/x-msgpack"):
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    return float(params[2:]) > 0.0
+                except ValueError:
+                    return False
+            return True
+    return False
+
+
+class FastJSONResponse(JSONResponse):
+    """A JSON response encoded by dumps(), or MessagePack if negotiated."""
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        self.msgpack = media_type is None and accepts_msgpack(accept.get())
+        super().__init__(content, status_code, headers, media_type, background)
+        if msgpack is not None:
+            self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if self.msgpack:
+            self.media_type = MSGPACK
+            return packb(content)
+        return dumps(content)
+
+
+def encoded(endpoint: Callable, status_code: int | None = None) -> Callable:
+    """Wrap a route endpoint so that its result is returned as a Response.
+
+    FastAPI passes a result that isn't a Response through jsonable_encoder,
+    which copies every dict and list before it's encoded; our results are
+    already JSON-compatible, so we skip that.
+    """
+
+    def respond(result: Any) -> Response:
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result, status_code=status_code or 200)
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return respond(await endpoint(*args, **kwargs))
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return respond(endpoint(*args, **kwargs))
+
+    return wrapper
+
+
+class NegotiatedRoute(APIRoute):
+    """An APIRoute encoding results with FastJSONResponse.
+
+    The request's Accept header is made available to the response while the
+    route is handled, so that it can choose MessagePack. The time taken and
+    the size of the response are recorded by route template.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # An explicit response model must still filter the result
+        model = kwargs.get("response_model")
+        if model is None or isinstance(model, DefaultPlaceholder):
+            endpoint = encoded(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            token = accept.set(request.headers.get("accept", ""))
+            start = time.monotonic()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                length = response.headers.get("content-length")
+                if length is not None:
+                    ROUTE_BYTES.observe(int(length), request.method, self.path)
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            finally:
+                accept.reset(token)
+                ROUTE_SECONDS.observe(
+                    time.monotonic() - start, request.method, self.path, status
+                )
+
+        return route_handler
@@ -0,0 +1,242 @@
+"""Compress responses with the best encoding the client accepts.
+
+This is ASGI middleware negotiating zstd, brotli or gzip from the request's
+Accept-Encoding. zstd needs Python 3.14's compression.zstd, and brotli the
+optional "brotli" package; gzip is always available.
+
+A complete response body is compressed at once, and the compressed bytes are
+remembered (in a byte-budgeted LRU) by a digest of the body: responses built
+from cached data repeat exactly, so they're compressed once and then served
+again without recompressing. Streamed responses are compressed a chunk at a
+time, flushing each chunk so that nothing is held back. Server-Sent Events
+are left alone.
+"""
+
+from collections import OrderedDict
+import gzip
+import hashlib
+from typing import Callable
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from github_pm.logger import logger
+from github_pm.metrics import CACHE_LOOKUPS
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# The content types worth compressing
+COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 9
+BROTLI_QUALITY = 6
+
+
+class Encoder:
+    """Incrementally compress a stream, flushing after each chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self.compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+        elif encoding == "br":
+            self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self.compressor.compress(data, zstd.ZstdCompressor.FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self.compressor.process(data) + self.compressor.flush()
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "zstd":
+            return self.compressor.flush(zstd.ZstdCompressor.FLUSH_FRAME)
+        if self.encoding == "br":
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def compressor(encoding: str) -> Callable[[bytes], bytes]:
+    """Return the function compressing a complete body."""
+    if encoding == "zstd":
+        return lambda data: zstd.compress(data, level=ZSTD_LEVEL)
+    if encoding == "br":
+        return lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    return lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def available() -> list[str]:
+    """Return the encodings we can produce, most preferred first."""
+    encodings = []
+    if zstd:
+        encodings.append("zstd")
+    if brotli:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Choose an encoding from an Accept-Encoding header.
+
+    The client's quality values rank the encodings; where they tie, we
+    prefer the order of available().
+
+    Returns:
+        The encoding, or None to send the response as it is
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    best = None
+    best_quality = 0.0
+    for encoding in available():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressedBodies:
+    def __init__(self, max_bytes: int):
+        """Initialize the store of compressed response bodies.
+
+        Args:
+            max_bytes: The maximum total size of compressed bodies kept, or 0
+                to compress every time
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a body, or return the bytes it was compressed to before."""
+        if self.max_bytes <= 0:
+            return compressor(encoding)(body)
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self.entries.get(key)
+        if compressed is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.inc("compressed", "hit")
+            return compressed
+        self.misses += 1
+        CACHE_LOOKUPS.inc("compressed", "miss")
+        compressed = compressor(encoding)(body)
+        if len(compressed) <= self.max_bytes:
+            self.entries[key] = compressed
+            self.size += len(compressed)
+            while self.size > self.max_bytes:
+                _, old = self.entries.popitem(last=False)
+                self.size -= len(old)
+        return compressed
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache_bytes: int = 0):
+        """Initialize the middleware.
+
+        Args:
+            app: The ASGI application
+            minimum_size: Smaller complete bodies aren't compressed
+            cache_bytes: Memory for compressed bodies (see CompressedBodies)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.bodies = CompressedBodies(cache_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+        responder = Responder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class Responder:
+    """Compress one response, as the application sends it."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start: Message | None = None
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+
+    def compressible(self, headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            "content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE)
+            and not content_type.startswith("text/event-stream")
+            and self.start["status"] not in (204, 304)
+        )
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until we know whether we'll compress
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder:
+            data = self.encoder.compress(body) if body else b""
+            if not more_body:
+                data += self.encoder.finish()
+            await self.downstream(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+            return
+        headers = MutableHeaders(raw=self.start["headers"])
+        if not self.compressible(headers) or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            self.passthrough = True
+            await self.downstream(self.start)
+            await self.downstream(message)
+            return
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+            self.encoder = Encoder(self.encoding)
+            await self.downstream(self.start)
+            await self.send(message)
+            return
+        compressed = self.middleware.bodies.compress(body, self.encoding)
+        logger.debug(f"{self.encoding}: {len(body)} -> {len(compressed)} bytes")
+        headers["Content-Length"] = str(len(compressed))
+        await self.downstream(self.start)
+        await self.downstream({"type": "http.response.body", "body": compressed})
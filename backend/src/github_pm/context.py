@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -14,6 +14,37 @@ class Settings(BaseSettings):
     app_name: Annotated[str, Field(default="GitHub Project Manager")]
     github_repo: Annotated[str, Field(default="vllm-project/guidellm")]
     github_token: Annotated[str, Field(default="")]
+    github_http2: Annotated[bool, Field(default=False)]
+    github_max_connections: Annotated[int, Field(default=20, gt=0)]
+    github_max_keepalive_connections: Annotated[int, Field(default=10, ge=0)]
+    github_keepalive_expiry: Annotated[float, Field(default=30.0, ge=0.0)]
+    github_page_concurrency: Annotated[int, Field(default=4, gt=0)]
+    github_validator_cache_bytes: Annotated[int, Field(default=64 * 1024 * 1024, ge=0)]
+    github_max_concurrency: Annotated[int, Field(default=10, gt=0)]
+    github_mutation_rate: Annotated[float, Field(default=1.0, ge=0.0)]
+    github_mutation_burst: Annotated[int, Field(default=10, gt=0)]
+    github_rate_limit_reserve: Annotated[float, Field(default=0.1, ge=0.0, le=1.0)]
+    github_retries: Annotated[int, Field(default=3, ge=0)]
+    github_retry_base: Annotated[float, Field(default=0.5, ge=0.0)]
+    github_retry_cap: Annotated[float, Field(default=8.0, ge=0.0)]
+    github_breaker_threshold: Annotated[int, Field(default=5, ge=0)]
+    github_breaker_cooldown: Annotated[float, Field(default=30.0, ge=0.0)]
+    issue_write_window: Annotated[float, Field(default=0.05, ge=0.0)]
+    bulk_concurrency: Annotated[int, Field(default=4, gt=0)]
+    graphql_batch_size: Annotated[int, Field(default=50, gt=0, le=100)]
+    issue_engine: Annotated[Literal["rest", "graphql", "sync"], Field(default="rest")]
+    cache_max_bytes: Annotated[int, Field(default=128 * 1024 * 1024, ge=0)]
+    cache_ttl_milestones: Annotated[float, Field(default=300.0, ge=0.0)]
+    cache_ttl_labels: Annotated[float, Field(default=300.0, ge=0.0)]
+    cache_ttl_assignees: Annotated[float, Field(default=600.0, ge=0.0)]
+    cache_ttl_issues: Annotated[float, Field(default=60.0, ge=0.0)]
+    cache_ttl_comments: Annotated[float, Field(default=60.0, ge=0.0)]
+    compression_min_size: Annotated[int, Field(default=1024, ge=0)]
+    compression_cache_bytes: Annotated[int, Field(default=32 * 1024 * 1024, ge=0)]
+    store_path: Annotated[str | None, Field(default=None)]
+    refresh_interval: Annotated[float, Field(default=0.0, ge=0.0)]
+    refresh_min_rate_limit: Annotated[int, Field(default=500, ge=0)]
+    webhook_secret: Annotated[str, Field(default="")]
 
 
 context = Settings()
@@ -0,0 +1,98 @@
+"""Broadcast repository changes to browsers as Server-Sent Events.
+
+Whenever we change the repository, or learn of a change made elsewhere (by
+webhook or issue sync), a small event describing it is published to every
+connected client, so that they can patch their state rather than reloading
+whole issue lists. The events are:
+
+    issue       {"issue": {...}} an issue changed; it belongs to the list of
+                its milestone if it's open, and to no list if it's closed.
+                The issue has the attributes of the "slim" issues profile:
+                everything the UI lists except the body
+    issues      {"milestone": n} a milestone's issue list changed in a way
+                that can't be described, and should be reloaded
+    comments    {"issue": n} an issue's comments changed
+    labels      {"action": ..., "name": ...} a label was created, edited or
+                deleted
+    milestones  {"action": ..., "number": n} a milestone was created,
+                edited, closed or deleted
+    resync      {} the client fell too far behind, and events were lost
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from github_pm.codec import dumps
+from github_pm.logger import logger
+
+# The events a client can fall behind by before it's told to resync
+QUEUE_SIZE = 256
+
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE = 15.0
+
+
+@dataclass
+class Event:
+    id: int
+    event: str
+    data: dict[str, Any]
+
+    def encode(self) -> bytes:
+        header = f"id: {self.id}\nevent: {self.event}\ndata: ".encode()
+        return header + dumps(self.data) + b"\n\n"
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        """Initialize the broker.
+
+        Args:
+            queue_size: The maximum events queued for a slow client
+        """
+        self.queue_size = queue_size
+        self.last_id = 0
+        self.subscribers: set[asyncio.Queue[Event]] = set()
+
+    def publish(self, event: str, data: dict[str, Any]):
+        """Send an event to every subscriber.
+
+        A subscriber whose queue is full has its queue replaced by a single
+        "resync" event.
+        """
+        self.last_id += 1
+        message = Event(id=self.last_id, event=event, data=data)
+        for queue in self.subscribers:
+            if queue.full():
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(Event(id=self.last_id, event="resync", data={}))
+            else:
+                queue.put_nowait(message)
+
+    async def stream(self, keepalive: float = KEEPALIVE) -> AsyncIterator[bytes]:
+        """Subscribe, and generate the SSE stream of events until closed.
+
+        Args:
+            keepalive: Seconds of silence after which a comment is sent, so
+                that proxies don't close the connection
+        """
+        queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        logger.debug(f"Event subscriber added: {len(self.subscribers)}")
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), keepalive)
+                except TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            self.subscribers.discard(queue)
+            logger.debug(f"Event subscriber removed: {len(self.subscribers)}")
+
+
+broker = EventBroker()
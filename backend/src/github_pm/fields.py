@@ -0,0 +1,111 @@
+"""Project GitHub objects down to the attributes a client needs.
+
+GitHub's issue, comment and label objects carry many URLs and complete user
+objects that the UI never looks at. The list routes take a `fields` query
+parameter selecting what to return, either as the name of a profile or as
+a comma-separated list of attribute paths like "number,user.login". Paths
+apply to each element of a list, so "labels.name" selects the name of each
+label. Without the parameter, the "default" profile of the resource gives
+what the UI renders; "full" returns GitHub's objects as they are.
+"""
+
+from typing import Any
+
+# A projection maps each selected attribute to True (the whole value) or to
+# the projection of the value's own attributes.
+Projection = dict[str, Any]
+
+USER: Projection = {"id": True, "login": True, "html_url": True, "avatar_url": True}
+
+LABEL: Projection = {"id": True, "name": True, "color": True, "description": True}
+
+ISSUE: Projection = {
+    "id": True,
+    "number": True,
+    "title": True,
+    "html_url": True,
+    "state": True,
+    "created_at": True,
+    "updated_at": True,
+    "user": USER,
+    "labels": LABEL,
+    "assignees": USER,
+    "milestone": {"number": True, "title": True, "description": True, "due_on": True},
+    "comments": True,
+    "reactions": {"total_count": True},
+    "type": {"name": True, "color": True, "description": True},
+    "pull_request": {"html_url": True},
+    "closed_by": True,
+    "body_html": True,
+}
+
+COMMENT: Projection = {
+    "id": True,
+    "node_id": True,
+    "html_url": True,
+    "created_at": True,
+    "user": USER,
+    "reactions": {"total_count": True},
+    "body_html": True,
+}
+
+PROFILES: dict[str, dict[str, Projection]] = {
+    "issues": {
+        "default": ISSUE,
+        # Without the bodies, which can be fetched with the issue later
+        "slim": {k: v for k, v in ISSUE.items() if k != "body_html"},
+    },
+    "comments": {"default": COMMENT},
+    "labels": {"default": LABEL},
+}
+
+
+def parse_fields(fields: str) -> Projection:
+    """Parse a comma-separated list of attribute paths into a projection."""
+    projection: Projection = {}
+    for path in fields.split(","):
+        names = [n.strip() for n in path.split(".") if n.strip()]
+        level = projection
+        for n, name in enumerate(names):
+            if n == len(names) - 1:
+                level[name] = True
+            elif level.get(name) is True:
+                break
+            else:
+                level = level.setdefault(name, {})
+    return projection
+
+
+def projection_for(resource: str, fields: str | None) -> Projection | None:
+    """Resolve the `fields` parameter of a route.
+
+    Args:
+        resource: The kind of object listed ("issues", "comments", "labels")
+        fields: The parameter: None, a profile name, "full" or a list of paths
+
+    Returns:
+        The projection, or None to return the objects whole
+    """
+    profiles = PROFILES[resource]
+    if fields is None:
+        return profiles["default"]
+    if fields == "full":
+        return None
+    if fields in profiles:
+        return profiles[fields]
+    return parse_fields(fields)
+
+
+def project(value: Any, projection: Projection | None) -> Any:
+    """Select the attributes of a value (or of each value in a list)."""
+    if projection is None:
+        return value
+    if isinstance(value, list):
+        return [project(v, projection) for v in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        k: value[k] if p is True else project(value[k], p)
+        for k, p in projection.items()
+        if k in value
+    }
@@ -0,0 +1,294 @@
+"""Performance metrics, in the Prometheus text format.
+
+The service counts and times its routes and its GitHub calls, and the
+lookups of each of its caches; GET /metrics reports them, with the current
+state of the GitHub connection (rate limits, concurrency and circuit
+breakers), for Prometheus to scrape. The format is simple enough that we
+write it ourselves rather than depending on a client library.
+"""
+
+import bisect
+from typing import Any, Iterable, Iterator, TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from github_pm.api import Connector
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds for latencies (seconds), sizes (bytes) and page counts
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+PAGES = (1, 2, 3, 5, 10, 20, 50, 100)
+
+BREAKER_STATES = {"closed": 0, "half-open": 1, "open": 2}
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def labelled(name: str, labels: dict[str, Any]) -> str:
+    if not labels:
+        return name
+    text = ",".join(f'{k}="{escape(str(v))}"' for k, v in labels.items())
+    return f"{name}{{{text}}}"
+
+
+def number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def header(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0):
+        key = tuple(str(v) for v in labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, *labels: Any) -> float:
+        return self.values.get(tuple(str(v) for v in labels), 0.0)
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for key, value in sorted(self.values.items()):
+            yield f"{labelled(self.name, dict(zip(self.labels, key)))} {number(value)}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = SECONDS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # For each set of labels: the count in each bucket, the sum, the count
+        self.values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: Any):
+        key = tuple(str(v) for v in labels)
+        counts, totals = self.values.setdefault(
+            key, ([0] * (len(self.buckets) + 1), [0.0, 0])
+        )
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def count(self, *labels: Any) -> int:
+        values = self.values.get(tuple(str(v) for v in labels))
+        return int(values[1][1]) if values else 0
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for key, (counts, (total, count)) in sorted(self.values.items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                name = labelled(f"{self.name}_bucket", {**labels, "le": number(bound)})
+                yield f"{name} {cumulative}"
+            yield f"{labelled(f'{self.name}_sum', labels)} {number(total)}"
+            yield f"{labelled(f'{self.name}_count', labels)} {int(count)}"
+
+
+class Sampled(Metric):
+    """Values read from the state of the service when they're reported."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        samples: Iterable[tuple[tuple[Any, ...], float]] = (),
+        type: str = "gauge",
+    ):
+        super().__init__(name, help, labels)
+        self.samples = list(samples)
+        self.type = type
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for key, value in self.samples:
+            yield f"{labelled(self.name, dict(zip(self.labels, key)))} {number(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = SECONDS,
+    ) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+
+registry = Registry()
+
+ROUTE_SECONDS = registry.histogram(
+    "github_pm_request_duration_seconds",
+    "Time to handle a request, until the response starts",
+    ["method", "route", "status"],
+)
+ROUTE_BYTES = registry.histogram(
+    "github_pm_response_bytes",
+    "Size of complete (not streamed) response bodies, before compression",
+    ["method", "route"],
+    buckets=BYTES,
+)
+GITHUB_SECONDS = registry.histogram(
+    "github_pm_github_request_duration_seconds",
+    "Time taken by GitHub calls",
+    ["api", "method", "endpoint", "status"],
+)
+GITHUB_BYTES = registry.histogram(
+    "github_pm_github_response_bytes",
+    "Size of GitHub response bodies",
+    ["api", "endpoint"],
+    buckets=BYTES,
+)
+GITHUB_PAGES = registry.histogram(
+    "github_pm_github_list_pages",
+    "Pages fetched to list a GitHub resource",
+    ["endpoint"],
+    buckets=PAGES,
+)
+CACHE_LOOKUPS = registry.counter(
+    "github_pm_cache_lookups_total",
+    "Cache lookups, by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+
+
+def endpoint_template(url: httpx.URL | str) -> str:
+    """Return the path of a GitHub URL, with identifiers replaced.
+
+    For example, /repos/o/r/issues/5/labels/bug becomes
+    /repos/{owner}/{repo}/issues/{number}/labels/{name}
+    """
+    parts = [p for p in httpx.URL(url).path.split("/") if p]
+    template = []
+    for n, part in enumerate(parts):
+        if parts[0] == "repos" and n == 1:
+            part = "{owner}"
+        elif parts[0] == "repos" and n == 2:
+            part = "{repo}"
+        elif part.isdigit():
+            part = "{number}"
+        elif n > 0 and parts[n - 1] == "labels":
+            part = "{name}"
+        template.append(part)
+    return "/" + "/".join(template)
+
+
+def connection_state(gitctx: "Connector") -> list[Metric]:
+    """Report the current state of the GitHub connection."""
+    scheduler = gitctx.scheduler
+    budgets = scheduler.budgets.items()
+    breakers = gitctx.breakers.breakers.items()
+    return [
+        Sampled(
+            "github_pm_github_rate_limit_remaining",
+            "GitHub calls left in the rate limit",
+            ["resource"],
+            [((r,), b.remaining) for r, b in budgets if b.remaining is not None],
+        ),
+        Sampled(
+            "github_pm_github_rate_limit_limit",
+            "GitHub calls allowed in each rate limit period",
+            ["resource"],
+            [((r,), b.limit) for r, b in budgets if b.limit is not None],
+        ),
+        Sampled(
+            "github_pm_github_rate_limit_reset_timestamp_seconds",
+            "When the GitHub rate limit is reset",
+            ["resource"],
+            [((r,), b.reset) for r, b in budgets if b.remaining is not None],
+        ),
+        Sampled(
+            "github_pm_github_concurrency_limit",
+            "GitHub calls allowed in progress at once",
+            samples=[((), scheduler.limit)],
+        ),
+        Sampled(
+            "github_pm_github_active_requests",
+            "GitHub calls in progress",
+            samples=[((), scheduler.active)],
+        ),
+        Sampled(
+            "github_pm_github_rate_limited_total",
+            "Rate limit responses from GitHub",
+            samples=[((), scheduler.limited)],
+            type="counter",
+        ),
+        Sampled(
+            "github_pm_github_delayed_total",
+            "GitHub calls delayed to stay within the rate limits",
+            samples=[((), scheduler.delayed)],
+            type="counter",
+        ),
+        Sampled(
+            "github_pm_github_circuit_state",
+            "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+            ["endpoint"],
+            [((n,), BREAKER_STATES[b.state]) for n, b in breakers],
+        ),
+        Sampled(
+            "github_pm_github_retries_total",
+            "GitHub calls retried",
+            ["endpoint"],
+            [((n,), b.retries) for n, b in breakers],
+            type="counter",
+        ),
+        Sampled(
+            "github_pm_github_refused_total",
+            "GitHub calls refused by an open circuit breaker",
+            ["endpoint"],
+            [((n,), b.refused) for n, b in breakers],
+            type="counter",
+        ),
+    ]
+
+
+def render(gitctx: "Connector | None" = None) -> str:
+    """Report the metrics in the Prometheus text format."""
+    metrics = list(registry.metrics)
+    if gitctx is not None:
+        metrics.extend(connection_state(gitctx))
+    lines = [line for metric in metrics for line in metric.render()]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+"""Compact representation of the issues we keep in memory.
+
+We return GitHub's issue objects as they are (or projected), so issues stay
+dicts; but the issues we cache are Issue dicts, which carry in a slot what
+every request would otherwise compute from them again: the set of their
+lower case label names, by which issue lists are sorted.
+
+Many issues share a user, a label or a milestone, and each decoded issue
+carries its own copy of them. The Interner replaces those copies with one
+shared object, which is safe because cached values are never modified in
+place. An object may be seen in more than one version (a milestone that was
+edited, or a user described by GraphQL rather than REST), so the latest few
+versions of each are kept.
+"""
+
+from typing import Any, Iterable
+
+# The versions of an object kept for sharing
+VERSIONS = 4
+
+# The attributes of an issue holding shared objects, the kind of object, and
+# the attribute identifying it
+SHARED = {
+    "user": ("user", "login"),
+    "assignee": ("user", "login"),
+    "milestone": ("milestone", "number"),
+    "type": ("type", "name"),
+}
+SHARED_LISTS = {
+    "assignees": ("user", "login"),
+    "labels": ("label", "id"),
+    "closed_by": ("pull", "number"),
+}
+
+
+def label_names(issue: dict[str, Any]) -> frozenset[str]:
+    """Return the lower case names of an issue's labels."""
+    return frozenset(label["name"].lower() for label in issue.get("labels", ()))
+
+
+class Issue(dict):
+    """A GitHub issue, with the label names we sort by computed once."""
+
+    __slots__ = ("label_names",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.label_names = label_names(self)
+
+
+class Interner:
+    def __init__(self):
+        """Initialize the shared objects."""
+        self.objects: dict[tuple[str, Any], list[dict[str, Any]]] = {}
+
+    def shared(self, kind: str, attribute: str, value: Any) -> Any:
+        """Return the shared copy of an object, or the object if it's new."""
+        if not isinstance(value, dict) or value.get(attribute) is None:
+            return value
+        versions = self.objects.setdefault((kind, value[attribute]), [])
+        for known in versions:
+            if known is value or known == value:
+                return known
+        versions.append(value)
+        if len(versions) > VERSIONS:
+            del versions[0]
+        return value
+
+    def issue(self, issue: dict[str, Any]) -> Issue:
+        """Convert an issue to an Issue sharing the objects it carries."""
+        if isinstance(issue, Issue):
+            return issue
+        fields = dict(issue)
+        for name, (kind, attribute) in SHARED.items():
+            if name in fields:
+                fields[name] = self.shared(kind, attribute, fields[name])
+        for name, (kind, attribute) in SHARED_LISTS.items():
+            if fields.get(name):
+                fields[name] = [self.shared(kind, attribute, v) for v in fields[name]]
+        return Issue(fields)
+
+    def issues(self, issues: Iterable[dict[str, Any]]) -> list[Issue]:
+        """Convert a list of issues."""
+        return [self.issue(i) for i in issues]
+
+    def clear(self):
+        self.objects.clear()
+
+
+interner = Interner()
@@ -0,0 +1,142 @@
+"""Background refresh of the cached repository state.
+
+So that reads are almost always answered from the cache rather than waiting
+on GitHub, the application lifespan runs a task which periodically reloads
+the milestones, labels, assignees and the issue lists of open milestones.
+
+The refresher gives way to user requests: before each GitHub call it waits
+until no request is using the connection (for up to a refresh interval), and
+it skips the refreshes which use a rate limit (REST or GraphQL) while that
+limit is running low.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from github_pm.api import (
+    Connector,
+    load_assignees,
+    load_issues,
+    load_labels,
+    load_milestones,
+)
+from github_pm.cache import cache
+from github_pm.context import context
+from github_pm.logger import logger
+from github_pm.scheduler import RESOURCES
+
+# Seconds between checks for user requests using the connection
+IDLE_POLL = 0.1
+
+
+def issue_resources(milestone_number: int) -> tuple[str, ...]:
+    """Return the rate limits used to load a milestone's issues."""
+    if context.issue_engine == "graphql" and milestone_number != 0:
+        return ("graphql",)
+    # The REST listings look up linked PRs with GraphQL
+    return ("core", "graphql")
+
+
+class Refresher:
+    def __init__(self, gitctx: Connector, interval: float, min_rate_limit: int):
+        """Initialize the refresher.
+
+        Args:
+            gitctx: The shared GitHub connection
+            interval: Seconds between refreshes
+            min_rate_limit: Skip refreshes while fewer GitHub calls than this
+                remain in a rate limit they use
+        """
+        self.gitctx = gitctx
+        self.interval = interval
+        self.min_rate_limit = min_rate_limit
+
+    async def run(self):
+        """Refresh the cache every interval, until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.exception(f"Error refreshing cache: {e!r}")
+            await asyncio.sleep(self.backoff())
+
+    def backoff(self) -> float:
+        """Return the seconds to wait before the next refresh.
+
+        That's normally the refresh interval, but if every rate limit is low
+        we wait for the first to be reset.
+        """
+        limited = self.rate_limited()
+        if limited.keys() >= set(RESOURCES):
+            wait = min(limited.values()) - time.time()
+            logger.info(f"GitHub rate limits low: pausing refresh for {wait:.0f}s")
+            return max(wait, self.interval)
+        return self.interval
+
+    def rate_limited(self) -> dict[str, float]:
+        """Return the rate limits running low, with the time of their reset."""
+        now = time.time()
+        return {
+            resource: budget.reset
+            for resource, budget in self.gitctx.scheduler.budgets.items()
+            if budget.remaining is not None
+            and budget.remaining < self.min_rate_limit
+            and budget.reset > now
+        }
+
+    async def idle(self):
+        """Wait until no user request is using the connection."""
+        deadline = time.monotonic() + self.interval
+        while self.gitctx.interactive > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(IDLE_POLL)
+
+    async def reload(
+        self,
+        key: tuple[Any, ...],
+        loader: Callable[[], Awaitable],
+        resources: tuple[str, ...] = ("core",),
+    ):
+        """Reload a cache entry, unless a rate limit it uses is low.
+
+        Args:
+            key: The cache key
+            loader: Loads the entry
+            resources: The rate limits the loader uses
+        """
+        if not self.rate_limited().keys().isdisjoint(resources):
+            return
+        await self.idle()
+        await cache.refresh(key, loader)
+
+    async def refresh(self):
+        """Reload the cached repository state, one GitHub read at a time."""
+        start = time.time()
+        gitctx = self.gitctx
+        await self.reload(("milestones",), lambda: load_milestones(gitctx))
+        await self.reload(("labels",), lambda: load_labels(gitctx))
+        await self.reload(("assignees",), lambda: load_assignees(gitctx))
+        milestones = dict(cache.items("milestones")).get(("milestones",), [])
+        for number in [m["number"] for m in milestones] + [0]:
+            await self.reload(
+                ("issues", number),
+                lambda n=number: load_issues(gitctx, n),
+                issue_resources(number),
+            )
+        logger.debug(f"Refreshed cache: {time.time() - start:.3f} seconds")
+
+
+def start_refresher(gitctx: Connector) -> asyncio.Task | None:
+    """Start refreshing the cache in the background, if configured.
+
+    Returns:
+        The refresh task, to be cancelled at shutdown, or None
+    """
+    if context.refresh_interval <= 0 or cache.max_bytes <= 0:
+        return None
+    refresher = Refresher(
+        gitctx,
+        interval=context.refresh_interval,
+        min_rate_limit=context.refresh_min_rate_limit,
+    )
+    return asyncio.create_task(refresher.run())
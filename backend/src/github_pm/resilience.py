@@ -0,0 +1,204 @@
+"""Retry transient GitHub failures, and fail fast while GitHub is down.
+
+A call that fails transiently (a dropped connection, a timeout, or a 502,
+503 or 504 response) is retried if repeating it is safe: reads, GraphQL
+queries, and any call that never reached GitHub. Retries are spaced by
+exponential backoff with "full jitter" (a random delay up to the backoff),
+so that many callers retrying together don't all return at once.
+
+Each class of endpoint (GraphQL, or the first part of a REST path under the
+repository, like "issues" or "labels") has a circuit breaker. When several
+calls in a row have failed even after retrying, the breaker opens: calls
+fail at once with CircuitOpen instead of waiting on GitHub, until a cooldown
+has passed. Then a single trial call is let through ("half-open"), and its
+success closes the breaker again.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import random
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+import httpx
+
+# The response statuses worth retrying
+RETRY_STATUSES = {502, 503, 504}
+
+# Failures which happened before the request reached GitHub
+UNSENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def shared(
+    flights: dict[Hashable, asyncio.Future],
+    key: Hashable,
+    factory: Callable[[], Awaitable[Any]],
+) -> tuple[asyncio.Future, bool]:
+    """Start a call, or join the identical call already in flight.
+
+    The call is recorded in `flights` under its key until it's done (unless
+    the caller has removed or replaced it first). Its exception is retrieved
+    even if nobody waits for it. Callers should await it through
+    asyncio.shield, so that one cancelled caller doesn't cancel it for
+    everyone.
+
+    Args:
+        flights: The calls in flight, by key
+        key: Identifies the call
+        factory: Makes the call, if it isn't already in flight
+
+    Returns:
+        The call, and whether it was already in flight
+    """
+    flight = flights.get(key)
+    if flight is not None:
+        return flight, True
+    flight = asyncio.ensure_future(factory())
+    flight.add_done_callback(lambda f: f.cancelled() or f.exception())
+    flight.add_done_callback(lambda f: flights.get(key) is f and flights.pop(key))
+    flights[key] = flight
+    return flight, False
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str, retry_after: float):
+        """A call was refused because its circuit breaker is open.
+
+        Args:
+            name: The endpoint class
+            retry_after: Seconds until a call will be tried again
+        """
+        super().__init__(
+            f"GitHub {name} calls are failing: retry in {retry_after:.0f}s"
+        )
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass
+class RetryPolicy:
+    """How often, and how long apart, to retry a failed call."""
+
+    retries: int = 0
+    base: float = 0.5
+    cap: float = 8.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the seconds to wait before a retry.
+
+        The cap limits our own backoff, not a delay GitHub asked for.
+
+        Args:
+            attempt: The number of retries already made
+            retry_after: The delay GitHub asked for, if any
+        """
+        backoff = random.uniform(0.0, min(self.cap, self.base * 2**attempt))
+        if retry_after is not None:
+            return max(backoff, retry_after)
+        return backoff
+
+
+def endpoint_class(url: httpx.URL | str) -> str:
+    """Return the class of a GitHub endpoint, to choose its circuit breaker."""
+    parts = [p for p in httpx.URL(url).path.split("/") if p]
+    if parts[:1] == ["repos"]:
+        parts = parts[3:] or ["repos"]
+    return parts[0] if parts else "root"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, threshold: int, cooldown: float):
+        """Initialize a closed breaker.
+
+        Args:
+            name: The endpoint class
+            threshold: Failed calls in a row which open the breaker, or 0 to
+                never open it
+            cooldown: Seconds the breaker stays open before a trial call
+        """
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial = False
+        # Counts, for monitoring
+        self.calls = 0
+        self.retries = 0
+        self.refused = 0
+        self.trips = 0
+
+    def allow(self):
+        """Check that a call may be made.
+
+        Raises:
+            CircuitOpen: if the breaker is open, or a trial call is in
+                progress
+        """
+        if self.state == "open":
+            wait = self.opened_at + self.cooldown - time.monotonic()
+            if wait > 0.0:
+                self.refused += 1
+                raise CircuitOpen(self.name, wait)
+            self.state = "half-open"
+        if self.state == "half-open":
+            if self.trial:
+                self.refused += 1
+                raise CircuitOpen(self.name, self.cooldown)
+            self.trial = True
+        self.calls += 1
+
+    def succeeded(self):
+        self.failures = 0
+        self.trial = False
+        self.state = "closed"
+
+    def failed(self):
+        self.failures += 1
+        self.trial = False
+        if self.state == "half-open" or (
+            self.threshold and self.failures >= self.threshold
+        ):
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def abandoned(self):
+        """A call ended without telling us whether GitHub is healthy."""
+        self.trial = False
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "calls": self.calls,
+            "retries": self.retries,
+            "refused": self.refused,
+            "trips": self.trips,
+        }
+
+
+class Breakers:
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        """Initialize the breakers, one per endpoint class as it's used.
+
+        Args:
+            threshold: Failed calls in a row which open a breaker, or 0 to
+                never open it
+            cooldown: Seconds a breaker stays open before a trial call
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, self.threshold, self.cooldown)
+            self.breakers[name] = breaker
+        return breaker
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        return {name: b.status() for name, b in sorted(self.breakers.items())}
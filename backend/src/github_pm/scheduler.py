@@ -0,0 +1,274 @@
+"""Schedule GitHub calls within GitHub's rate limits.
+
+GitHub gives each token an hourly budget of calls, separately for the REST
+API ("core") and for GraphQL, and reports what's left with every response
+in the X-RateLimit-* headers. It also has "secondary" limits on concurrent
+requests and on how quickly content is created, which it enforces with a
+403 or 429 response, usually carrying a Retry-After header.
+
+Every call the Connector makes goes through the Scheduler, which:
+
+- limits the calls in progress, adapting the limit as TCP adapts its window:
+  it grows by one after each limit's worth of successful calls, up to the
+  configured maximum, and is halved whenever GitHub says we're too fast;
+- once a budget runs low, spaces out the calls using it so that what's left
+  lasts until the budget is reset, rather than running out;
+- holds all calls after a rate limit response until GitHub's Retry-After,
+  and calls using an exhausted budget until it's reset;
+- admits mutations (REST calls other than GET) through a token bucket, to
+  stay within the content creation limit.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import asdict, dataclass
+import time
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from github_pm.logger import logger
+
+RESOURCES = ("core", "graphql")
+
+# Seconds to wait after a rate limit response without a Retry-After header,
+# as GitHub recommends
+DEFAULT_RETRY_AFTER = 60.0
+
+
+@dataclass
+class Budget:
+    """The state of one of GitHub's primary rate limits."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset: float = 0.0
+
+    def update(self, headers: httpx.Headers):
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is None:
+            return
+        self.remaining = int(remaining)
+        self.reset = float(headers.get("x-ratelimit-reset", 0))
+        limit = headers.get("x-ratelimit-limit")
+        self.limit = int(limit) if limit else None
+
+    def interval(self, reserve: float, now: float) -> float:
+        """Return the seconds to leave between calls.
+
+        Args:
+            reserve: The fraction of the budget below which calls are paced
+            now: The current time, as time.time()
+        """
+        if (
+            self.remaining is None
+            or self.remaining <= 0
+            or not self.limit
+            or self.reset <= now
+            or self.remaining >= self.limit * reserve
+        ):
+            return 0.0
+        return (self.reset - now) / self.remaining
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        """Initialize the bucket, full.
+
+        Args:
+            rate: Tokens added per second, or 0 for no limit
+            burst: The most tokens the bucket holds
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def take(self):
+        """Wait for a token, and take it."""
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class Scheduler:
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        mutation_rate: float = 0.0,
+        mutation_burst: int = 10,
+        reserve: float = 0.1,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: The most calls in progress at once
+            mutation_rate: Mutations allowed per second, or 0 for no limit
+            mutation_burst: Mutations allowed at once after a quiet spell
+            reserve: The fraction of a budget below which calls are paced
+        """
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.reserve = reserve
+        self.active = 0
+        self.successes = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.budgets = {r: Budget() for r in RESOURCES}
+        self.next_call = {r: 0.0 for r in RESOURCES}
+        self.paused_until = {r: 0.0 for r in RESOURCES}
+        self.mutations = TokenBucket(mutation_rate, mutation_burst)
+        # The number of rate limit responses, and of calls we delayed
+        self.limited = 0
+        self.delayed = 0
+
+    @staticmethod
+    def resource(url: httpx.URL | str) -> str:
+        """Return the rate limit resource used by a call to a URL."""
+        return "graphql" if httpx.URL(url).path == "/graphql" else "core"
+
+    async def send(
+        self,
+        resource: str,
+        mutation: bool,
+        call: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """Make a GitHub call when the rate limits allow it.
+
+        Args:
+            resource: The rate limit resource, "core" or "graphql"
+            mutation: The call creates or changes content
+            call: Makes the call
+
+        Returns:
+            The response
+        """
+        if mutation:
+            await self.mutations.take()
+        await self.wait(resource)
+        await self.acquire()
+        try:
+            response = await call()
+        finally:
+            self.release()
+        self.observe(resource, response)
+        return response
+
+    async def wait(self, resource: str):
+        """Wait until a call using a resource may start."""
+        now = time.monotonic()
+        interval = self.budgets[resource].interval(self.reserve, time.time())
+        start = max(now, self.paused_until[resource])
+        if interval:
+            start = max(start, self.next_call[resource])
+            self.next_call[resource] = start + interval
+        if start > now:
+            self.delayed += 1
+            logger.debug(f"{resource}: delaying call {start - now:.3f}s")
+            await asyncio.sleep(start - now)
+
+    async def acquire(self):
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.active -= 1
+        self.wake()
+
+    def wake(self):
+        while self.waiters and self.active < self.limit:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+    def observe(self, resource: str, response: httpx.Response):
+        """Adapt to what a response tells us of the rate limits."""
+        headers = response.headers
+        resource = headers.get("x-ratelimit-resource", resource)
+        budget = self.budgets.get(resource)
+        if budget is None:
+            return
+        budget.update(headers)
+        if self.rate_limited(response):
+            self.limited += 1
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+            if "retry-after" in headers:
+                wait = float(headers["retry-after"])
+            elif budget.remaining == 0:
+                wait = budget.reset - time.time()
+            else:
+                wait = DEFAULT_RETRY_AFTER
+            # A secondary limit applies to every kind of call
+            paused = (resource,) if budget.remaining == 0 else RESOURCES
+            self.pause(paused, wait)
+            logger.warning(
+                f"GitHub rate limit ({response.status_code}): concurrency "
+                f"{self.limit}, pausing {', '.join(paused)} for {wait:.0f}s"
+            )
+            return
+        if budget.remaining == 0:
+            self.pause((resource,), budget.reset - time.time())
+        if response.status_code < 400:
+            self.successes += 1
+            if self.successes >= self.limit and self.limit < self.max_concurrency:
+                self.limit += 1
+                self.successes = 0
+                self.wake()
+
+    @staticmethod
+    def rate_limited(response: httpx.Response) -> bool:
+        """Decide whether GitHub refused a call for going over a rate limit."""
+        headers = response.headers
+        return response.status_code == 429 or (
+            response.status_code == 403
+            and (
+                "retry-after" in headers
+                or headers.get("x-ratelimit-remaining") == "0"
+                or "rate limit" in response.text.lower()
+            )
+        )
+
+    def paused_for(self, resource: str) -> float:
+        """Return the seconds until calls using a resource may start again."""
+        return max(self.paused_until[resource] - time.monotonic(), 0.0)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "rate_limits": {r: asdict(b) for r, b in self.budgets.items()},
+            "concurrency": {
+                "limit": self.limit,
+                "max": self.max_concurrency,
+                "active": self.active,
+                "waiting": len(self.waiters),
+            },
+            "rate_limited": self.limited,
+            "delayed": self.delayed,
+        }
+
+    def pause(self, resources: tuple[str, ...], seconds: float):
+        until = time.monotonic() + max(seconds, 0.0)
+        for resource in resources:
+            self.paused_until[resource] = max(self.paused_until[resource], until)
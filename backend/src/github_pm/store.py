@@ -0,0 +1,301 @@
+"""Persistent on-disk store of repository state.
+
+The store keeps the same data as the in-process cache (see cache.py) in a
+SQLite database, so that after a restart the read routes can answer
+immediately from disk while the data is refreshed from GitHub in the
+background. Each GitHub object is saved as a compressed JSON blob alongside
+the indexed columns we query it by.
+
+SQLite calls are blocking, so all database access runs in a single worker
+thread; this also keeps the writes in the order they were made.
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+from pathlib import Path
+import sqlite3
+import time
+from typing import Any
+import zlib
+
+from github_pm.codec import dumps, loads
+from github_pm.logger import logger
+
+Key = tuple[Any, ...]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    key TEXT PRIMARY KEY,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS milestones (
+    number INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS labels (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assignees (
+    login TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS issues (
+    number INTEGER PRIMARY KEY,
+    milestone INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    updated_at TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_milestone ON issues (milestone, state);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    issue_number INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comments_issue ON comments (issue_number);
+CREATE TABLE IF NOT EXISTS sync (
+    repo TEXT PRIMARY KEY,
+    since TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pr_links (
+    issue_number INTEGER NOT NULL,
+    pr_number INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (issue_number, pr_number)
+);
+"""
+
+# The tables holding simple ordered lists, and the column identifying a row
+ORDERED = {"milestones": "number", "labels": "name", "assignees": "login"}
+
+
+def pack(value: Any) -> bytes:
+    return zlib.compress(dumps(value))
+
+
+def unpack(data: bytes) -> Any:
+    return loads(zlib.decompress(data))
+
+
+class Store:
+    def __init__(self, path: str):
+        """Open (creating if necessary) the store.
+
+        Args:
+            path: The SQLite database file
+        """
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store")
+        self.db: sqlite3.Connection | None = None
+        self.executor.submit(self._open).result()
+
+    def _open(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        logger.info(f"Opened repository store {self.path}")
+
+    def close(self):
+        self.executor.submit(self._close).result()
+        self.executor.shutdown()
+
+    def _close(self):
+        if self.db:
+            self.db.close()
+            self.db = None
+
+    async def load(self, key: Key) -> Any | None:
+        """Load a saved value, or None if the key was never saved."""
+        return await asyncio.wrap_future(self.executor.submit(self._load, key))
+
+    def save(self, key: Key, value: Any) -> Future:
+        """Save (replace) the value of a key, in the background."""
+        return self.executor.submit(self._save, key, value)
+
+    def discard(self, key: Key) -> Future:
+        """Forget the saved value of a key, in the background."""
+        return self.executor.submit(self._discard, key)
+
+    async def load_sync(self, repo: str) -> tuple[str, list[dict]] | None:
+        """Load the issue sync high-water mark and all open issues.
+
+        Returns:
+            The high-water mark and issues, or None if the repo was never
+            synchronized
+        """
+        return await asyncio.wrap_future(self.executor.submit(self._load_sync, repo))
+
+    def save_sync(
+        self, repo: str, since: str, issues: list[dict], removed: list[int]
+    ) -> Future:
+        """Save synchronized changes to issues, in the background.
+
+        Args:
+            repo: The repository
+            since: The new high-water mark
+            issues: Issues added or changed
+            removed: The numbers of issues removed (closed)
+        """
+        return self.executor.submit(self._save_sync, repo, since, issues, removed)
+
+    def _load_sync(self, repo: str) -> tuple[str, list[dict]] | None:
+        row = self.db.execute(
+            "SELECT since FROM sync WHERE repo = ?", (repo,)
+        ).fetchone()
+        if not row:
+            return None
+        rows = self.db.execute(
+            "SELECT number, data FROM issues WHERE state = 'open' ORDER BY number"
+        )
+        issues = {number: unpack(data) for number, data in rows}
+        links = self.db.execute(
+            "SELECT issue_number, data FROM pr_links ORDER BY issue_number, pr_number"
+        )
+        for number, data in links:
+            if number in issues:
+                issues[number].setdefault("closed_by", []).append(unpack(data))
+        return row[0], list(issues.values())
+
+    def _save_sync(self, repo: str, since: str, issues: list[dict], removed: list[int]):
+        try:
+            with self.db:
+                for issue in issues:
+                    self._save_issue(issue)
+                self.db.executemany(
+                    "DELETE FROM pr_links WHERE issue_number = ?",
+                    [(n,) for n in removed],
+                )
+                self.db.executemany(
+                    "DELETE FROM issues WHERE number = ?", [(n,) for n in removed]
+                )
+                self.db.execute(
+                    "INSERT OR REPLACE INTO sync (repo, since) VALUES (?, ?)",
+                    (repo, since),
+                )
+        except Exception as e:
+            logger.exception(f"Error saving issue sync to store: {e!r}")
+
+    def _saved(self, key: Key) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM lists WHERE key = ?", (json.dumps(key),)
+        ).fetchone()
+        return row is not None
+
+    def _load(self, key: Key) -> Any | None:
+        if not self._saved(key):
+            return None
+        resource = key[0]
+        if resource in ORDERED:
+            rows = self.db.execute(f"SELECT data FROM {resource} ORDER BY position")
+            return [unpack(data) for (data,) in rows]
+        if resource == "issues":
+            rows = self.db.execute(
+                "SELECT number, data FROM issues"
+                " WHERE milestone = ? AND state = 'open' ORDER BY number",
+                (key[1],),
+            )
+            issues = {number: unpack(data) for number, data in rows}
+            links = self.db.execute(
+                "SELECT p.issue_number, p.data FROM pr_links p"
+                " JOIN issues i ON i.number = p.issue_number"
+                " WHERE i.milestone = ? AND i.state = 'open'"
+                " ORDER BY p.issue_number, p.pr_number",
+                (key[1],),
+            )
+            for number, data in links:
+                issues[number].setdefault("closed_by", []).append(unpack(data))
+            return list(issues.values())
+        if resource == "comments":
+            rows = self.db.execute(
+                "SELECT data FROM comments WHERE issue_number = ? ORDER BY id",
+                (key[1],),
+            )
+            return [unpack(data) for (data,) in rows]
+        return None
+
+    def _save(self, key: Key, value: Any):
+        resource = key[0]
+        try:
+            with self.db:
+                self._delete(key)
+                if resource in ORDERED:
+                    column = ORDERED[resource]
+                    self.db.executemany(
+                        f"INSERT OR REPLACE INTO {resource} ({column}, position, data)"
+                        " VALUES (?, ?, ?)",
+                        [(v[column], n, pack(v)) for n, v in enumerate(value)],
+                    )
+                elif resource == "issues":
+                    for issue in value:
+                        self._save_issue(issue)
+                elif resource == "comments":
+                    self.db.executemany(
+                        "INSERT OR REPLACE INTO comments (id, issue_number, data)"
+                        " VALUES (?, ?, ?)",
+                        [(c["id"], key[1], pack(c)) for c in value],
+                    )
+                else:
+                    return
+                self.db.execute(
+                    "INSERT OR REPLACE INTO lists (key, saved_at) VALUES (?, ?)",
+                    (json.dumps(key), time.time()),
+                )
+        except Exception as e:
+            logger.exception(f"Error saving {key} to store: {e!r}")
+
+    def _save_issue(self, issue: dict[str, Any]):
+        number = issue["number"]
+        closed_by = issue.get("closed_by", [])
+        data = {k: v for k, v in issue.items() if k != "closed_by"}
+        milestone = issue["milestone"]["number"] if issue.get("milestone") else 0
+        self.db.execute(
+            "INSERT OR REPLACE INTO issues (number, milestone, state, updated_at, data)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                number,
+                milestone,
+                issue.get("state", "open"),
+                issue.get("updated_at"),
+                pack(data),
+            ),
+        )
+        self.db.execute("DELETE FROM pr_links WHERE issue_number = ?", (number,))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO pr_links (issue_number, pr_number, data)"
+            " VALUES (?, ?, ?)",
+            [(number, pr["number"], pack(pr)) for pr in closed_by],
+        )
+
+    def _delete(self, key: Key):
+        resource = key[0]
+        self.db.execute("DELETE FROM lists WHERE key = ?", (json.dumps(key),))
+        if resource in ORDERED:
+            self.db.execute(f"DELETE FROM {resource}")
+        elif resource == "issues":
+            # The open issues of the milestone are replaced: any that aren't in
+            # the new list have moved or been closed.
+            self.db.execute(
+                "DELETE FROM pr_links WHERE issue_number IN"
+                " (SELECT number FROM issues WHERE milestone = ? AND state = 'open')",
+                (key[1],),
+            )
+            self.db.execute(
+                "DELETE FROM issues WHERE milestone = ? AND state = 'open'", (key[1],)
+            )
+        elif resource == "comments":
+            self.db.execute("DELETE FROM comments WHERE issue_number = ?", (key[1],))
+
+    def _discard(self, key: Key):
+        # Just forget that the key was saved: the rows are replaced when it's
+        # next saved, and the issue rows are shared with the issue sync.
+        try:
+            with self.db:
+                self.db.execute("DELETE FROM lists WHERE key = ?", (json.dumps(key),))
+        except Exception as e:
+            logger.exception(f"Error removing {key} from store: {e!r}")
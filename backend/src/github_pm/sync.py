@@ -0,0 +1,143 @@
+"""Incrementally synchronized working set of a repository's open issues.
+
+Rather than listing a milestone's issues on every call, the "sync" issue
+engine keeps every open issue (and pull request) of the repository in
+memory. After the first full listing, it asks GitHub only for issues
+updated since the high-water mark (when that listing started, and then the
+latest `updated_at` it has seen), using `state=all` so that closed issues are dropped and issues moved to
+another milestone are moved here too. GitHub's `since` is inclusive, so
+issues we already have at their latest update are dropped from each delta.
+
+The GitHub calls are made by the API module; this module holds the working
+set and merges changes into it.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, UTC
+from typing import Any
+
+from github_pm.model import interner
+
+# How far our clock may be ahead of GitHub's: a listing which finds nothing
+# sets the high-water mark this far before it started
+CLOCK_SKEW = timedelta(minutes=1)
+
+
+def high_water_now() -> str:
+    """Return a high-water mark for a listing starting now."""
+    return (datetime.now(UTC) - CLOCK_SKEW).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def milestone_of(issue: dict[str, Any]) -> int:
+    """Return the milestone number of an issue, or 0 for no milestone."""
+    return issue["milestone"]["number"] if issue.get("milestone") else 0
+
+
+class IssueSync:
+    def __init__(self):
+        self.issues: dict[int, dict[str, Any]] = {}
+        self.since: str | None = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.since is not None
+
+    def milestone(self, number: int) -> list[dict[str, Any]]:
+        """Return the open issues of a milestone (0 for no milestone)."""
+        return [i for i in self.issues.values() if milestone_of(i) == number]
+
+    def linked_to(self, pr_numbers: set[int]) -> set[int]:
+        """Return the issues currently linked to any of a set of PRs."""
+        return {
+            n
+            for n, i in self.issues.items()
+            if any(pr["number"] in pr_numbers for pr in i.get("closed_by", []))
+        }
+
+    def changes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the issues of a delta that we haven't already merged.
+
+        An issue we have is unchanged unless its `updated_at` is newer; one
+        we don't have is only new if it's open or was updated after the
+        high-water mark.
+        """
+        fresh = []
+        for issue in issues:
+            updated = issue.get("updated_at")
+            previous = self.issues.get(issue["number"])
+            if previous is not None:
+                seen = previous.get("updated_at")
+            elif issue.get("state", "open") != "open":
+                seen = self.since
+            else:
+                seen = None
+            if updated and seen and updated <= seen:
+                continue
+            fresh.append(issue)
+        return fresh
+
+    def merge(
+        self,
+        changed: list[dict[str, Any]],
+        linked: dict[int, list[dict[str, Any]]],
+        relinked: set[int],
+    ) -> list[int]:
+        """Merge changed issues into the working set.
+
+        Args:
+            changed: Issues and PRs changed since the high-water mark
+            linked: The linked PRs of issues whose links were looked up
+            relinked: The issues whose links were looked up; those not in
+                `linked` have no linked PRs
+
+        Returns:
+            The numbers of issues removed (closed) from the working set
+        """
+        removed = []
+        for issue in changed:
+            number = issue["number"]
+            # Closed issues move the mark too, or they'd be listed again and
+            # again
+            if issue.get("updated_at") and (
+                self.since is None or issue["updated_at"] > self.since
+            ):
+                self.since = issue["updated_at"]
+            if issue.get("state", "open") != "open":
+                if self.issues.pop(number, None):
+                    removed.append(number)
+                continue
+            previous = self.issues.get(number)
+            if previous and "closed_by" in previous and number not in relinked:
+                issue = {**issue, "closed_by": previous["closed_by"]}
+            self.issues[number] = interner.issue(issue)
+        for number in relinked:
+            issue = self.issues.get(number)
+            if not issue:
+                continue
+            issue = {k: v for k, v in issue.items() if k != "closed_by"}
+            if linked.get(number):
+                issue["closed_by"] = linked[number]
+            self.issues[number] = interner.issue(issue)
+        return removed
+
+    def update(self, issue: dict[str, Any]):
+        """Apply a change we made to an issue ourselves.
+
+        The high-water mark isn't moved, since other changes made before ours
+        may not have been seen yet. Mutation responses don't include the HTML
+        body or linked PRs, so those are kept.
+        """
+        number = issue["number"]
+        previous = self.issues.get(number)
+        if issue.get("state", "open") != "open":
+            self.issues.pop(number, None)
+        elif previous:
+            self.issues[number] = interner.issue({**previous, **issue})
+
+    def clear(self):
+        self.issues.clear()
+        self.since = None
+
+
+issue_sync = IssueSync()
@@ -0,0 +1,201 @@
+"""Apply GitHub webhook events to the cached repository state.
+
+GitHub pushes an event for each change to the repository; rather than
+waiting for cached data to expire, we patch (or, where the payload doesn't
+carry what we cache, invalidate) just the affected cache entries.
+"""
+
+import hashlib
+import hmac
+import re
+from typing import Any
+
+from fastapi import HTTPException
+
+from github_pm.api import issue_changed, label_deleted
+from github_pm.cache import cache
+from github_pm.context import context
+from github_pm.events import broker
+from github_pm.logger import logger
+from github_pm.model import interner
+from github_pm.sync import issue_sync, milestone_of
+
+# GitHub's keywords for linking a pull request to the issue it closes
+CLOSES = re.compile(
+    r"\b(?:close[sd]?|fix(?:e[sd])?|resolve[sd]?)\s*:?\s+#(\d+)", re.IGNORECASE
+)
+
+# The pull_request actions which change a PR as we list it
+PR_LISTED_ACTIONS = {
+    "opened",
+    "closed",
+    "reopened",
+    "edited",
+    "labeled",
+    "unlabeled",
+    "milestoned",
+    "demilestoned",
+    "assigned",
+    "unassigned",
+}
+
+# The fields a PR is listed with, as an issue
+PR_FIELDS = (
+    "number",
+    "title",
+    "state",
+    "draft",
+    "labels",
+    "assignees",
+    "milestone",
+    "user",
+    "html_url",
+    "created_at",
+    "updated_at",
+    "closed_at",
+)
+
+
+def verify_signature(body: bytes, signature: str | None):
+    """Check the X-Hub-Signature-256 of a webhook delivery.
+
+    Args:
+        body: The raw request body
+        signature: The signature header, "sha256=<hex digest>"
+
+    Raises:
+        HTTPException(403) if no secret is configured or the signature
+        doesn't match
+    """
+    if not context.webhook_secret:
+        raise HTTPException(status_code=403, detail="Webhooks aren't configured")
+    expected = hmac.new(
+        context.webhook_secret.encode(), body, hashlib.sha256
+    ).hexdigest()
+    if not signature or not hmac.compare_digest(signature, f"sha256={expected}"):
+        raise HTTPException(status_code=403, detail="Invalid webhook signature")
+
+
+def invalidate_issue_lists(numbers: set[int]):
+    """Invalidate the cached milestone issue lists containing any of the issues."""
+    for key, issues in list(cache.items("issues")):
+        if any(i["number"] in numbers for i in issues):
+            cache.invalidate(key)
+            broker.publish("issues", {"milestone": key[1]})
+
+
+def on_issues(action: str, payload: dict[str, Any]):
+    issue = payload["issue"]
+    if action in ("deleted", "transferred"):
+        issue = {**issue, "state": "closed"}
+    if action == "edited" and "body" in payload.get("changes", {}):
+        # The payload has the new Markdown body, but we cache the HTML; the
+        # issue sync will pick up the change by itself.
+        invalidate_issue_lists({issue["number"]})
+        broker.publish("issues", {"milestone": milestone_of(issue)})
+        return
+    issue_changed(issue)
+
+
+def on_issue_comment(action: str, payload: dict[str, Any]):
+    cache.invalidate(("comments", payload["issue"]["number"]))
+    broker.publish("comments", {"issue": payload["issue"]["number"]})
+    # The issue's comment count has changed
+    issue_changed(payload["issue"])
+
+
+def on_label(action: str, payload: dict[str, Any]):
+    label = payload["label"]
+    cache.invalidate(("labels",))
+    if action == "deleted":
+        label_deleted(label["name"])
+        return
+    broker.publish("labels", {"action": action, "name": label["name"]})
+    if action == "edited":
+        old = payload.get("changes", {}).get("name", {}).get("from", label["name"])
+
+        def rename(issues: list[dict]) -> list[dict]:
+            return [
+                (
+                    interner.issue(
+                        {
+                            **i,
+                            "labels": [
+                                label if x["name"] == old else x for x in i["labels"]
+                            ],
+                        }
+                    )
+                    if any(x["name"] == old for x in i["labels"])
+                    else i
+                )
+                for i in issues
+            ]
+
+        for key, _ in list(cache.items("issues")):
+            cache.update(key, rename)
+
+
+def on_milestone(action: str, payload: dict[str, Any]):
+    number = payload["milestone"]["number"]
+    cache.invalidate(("milestones",))
+    broker.publish("milestones", {"action": action, "number": number})
+    if action in ("edited", "closed", "deleted"):
+        # The issues carry a copy of their milestone
+        cache.invalidate(("issues", number))
+    if action == "deleted":
+        cache.invalidate(("issues", 0))
+        broker.publish("issues", {"milestone": 0})
+
+
+def on_pull_request(action: str, payload: dict[str, Any]):
+    if action not in PR_LISTED_ACTIONS:
+        # Like a push ("synchronize") or a review request
+        return
+    pr = payload["pull_request"]
+    number = pr["number"]
+    changes = payload.get("changes", {})
+    if action == "opened" or "body" in changes or "title" in changes:
+        # Issues this PR closes (or used to close) show it as a linked PR
+        affected = {int(n) for n in CLOSES.findall(pr.get("body") or "")}
+        affected |= issue_sync.linked_to({number})
+        for _, issues in cache.items("issues"):
+            for i in issues:
+                if any(p["number"] == number for p in i.get("closed_by", [])):
+                    affected.add(i["number"])
+        invalidate_issue_lists(affected - {number})
+    if "body" in changes:
+        # As for an issue, we cache the HTML body
+        invalidate_issue_lists({number})
+        broker.publish("issues", {"milestone": milestone_of(pr)})
+        return
+    # Open PRs are listed with the issues of their milestone
+    issue_changed({k: pr[k] for k in PR_FIELDS if k in pr})
+
+
+HANDLERS = {
+    "issues": on_issues,
+    "issue_comment": on_issue_comment,
+    "label": on_label,
+    "milestone": on_milestone,
+    "pull_request": on_pull_request,
+}
+
+
+def handle_event(event: str, payload: dict[str, Any]) -> bool:
+    """Apply a webhook event to the cached state.
+
+    Args:
+        event: The X-GitHub-Event header
+        payload: The event payload
+
+    Returns:
+        True if the event was applied, False if it was ignored
+    """
+    handler = HANDLERS.get(event)
+    repo = payload.get("repository", {}).get("full_name", "")
+    if not handler or repo.lower() != context.github_repo.lower():
+        logger.debug(f"Ignoring {event} event for {repo!r}")
+        return False
+    logger.debug(f"Applying {event} {payload.get('action')} event")
+    handler(payload.get("action", ""), payload)
+    return True
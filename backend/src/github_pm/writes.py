@@ -0,0 +1,178 @@
+"""Coalesce rapid changes to an issue into a single GitHub write.
+
+Clicking several labels on an issue in quick succession would otherwise
+make a GET and a PATCH for each click, racing each other. Instead, changes
+to an issue are queued: those made within a short window (or while an
+earlier write to the issue is still in progress) are applied in order to
+the issue's current labels, assignees and milestone, and written with one
+PATCH. If they cancel out, nothing is written. Every caller gets back the
+final state of the issue.
+
+If GitHub rejects the combined PATCH (a 4xx response, like a 422 for an
+unknown assignee), the changes are written again one at a time, so that
+one bad change doesn't fail the others and each caller gets the result of
+its own change.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, TYPE_CHECKING
+
+import httpx
+
+from github_pm.logger import logger
+from github_pm.resilience import shared
+
+if TYPE_CHECKING:
+    from github_pm.api import Connector
+
+# Changes which depend on the issue's current state, so need a GET first
+RELATIVE = {"add_label", "remove_label", "remove_assignees"}
+
+
+@dataclass
+class Change:
+    action: str
+    value: Any
+    # The issue after the change is written, for the caller
+    result: asyncio.Future
+
+
+def current(issue: dict[str, Any]) -> dict[str, Any]:
+    """Return the fields of an issue we change, in the form PATCH takes."""
+    return {
+        "labels": [label["name"] for label in issue.get("labels", [])],
+        "assignees": [a["login"] for a in issue.get("assignees", [])],
+        "milestone": issue["milestone"]["number"] if issue.get("milestone") else None,
+    }
+
+
+def apply(fields: dict[str, Any], action: str, value: Any):
+    """Apply a change to the PATCH fields of an issue."""
+    match action:
+        case "add_label":
+            if value not in fields["labels"]:
+                fields["labels"] = fields["labels"] + [value]
+        case "remove_label":
+            fields["labels"] = [x for x in fields["labels"] if x != value]
+        case "set_assignees":
+            fields["assignees"] = list(value)
+        case "remove_assignees":
+            fields["assignees"] = [x for x in fields["assignees"] if x not in value]
+        case "set_milestone":
+            fields["milestone"] = value
+        case _:
+            raise ValueError(f"Unknown issue change {action!r}")
+
+
+class IssueWriteQueue:
+    def __init__(self, window: float, changed: Callable[[dict[str, Any]], None]):
+        """Initialize the queue.
+
+        Args:
+            window: Seconds to wait for more changes before writing
+            changed: Called with the issue after each write
+        """
+        self.window = window
+        self.changed = changed
+        # The next write of each issue, and the changes queued for it
+        self.pending: dict[str, asyncio.Future] = {}
+        self.changes: dict[str, list[Change]] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+
+    async def submit(
+        self, gitctx: "Connector", path: str, action: str, value: Any = None
+    ) -> dict[str, Any]:
+        """Queue a change to an issue, and wait for it to be written.
+
+        Args:
+            gitctx: The GitHub connection
+            path: The API path of the issue
+            action: add_label, remove_label, set_assignees, remove_assignees
+                or set_milestone
+            value: The label name, assignee logins or milestone number
+
+        Returns:
+            The issue after the write (or as it was, if nothing changed)
+        """
+        change = Change(action, value, asyncio.get_running_loop().create_future())
+        change.result.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.changes.setdefault(path, []).append(change)
+        shared(self.pending, path, lambda: self._flush(gitctx, path))
+        # Don't let one cancelled request cancel the write for everyone
+        return await asyncio.shield(change.result)
+
+    def _take(self, path: str) -> list[Change]:
+        """Take the changes queued for an issue; any made later are written next."""
+        del self.pending[path]
+        return self.changes.pop(path)
+
+    async def _flush(self, gitctx: "Connector", path: str):
+        changes = None
+        try:
+            await asyncio.sleep(self.window)
+            lock = self.locks.setdefault(path, asyncio.Lock())
+            try:
+                async with lock:
+                    changes = self._take(path)
+                    await self._write(gitctx, path, changes)
+            finally:
+                if path not in self.pending:
+                    self.locks.pop(path, None)
+        finally:
+            for change in self._take(path) if changes is None else changes:
+                if not change.result.done():
+                    change.result.cancel()
+
+    async def _write(self, gitctx: "Connector", path: str, changes: list[Change]):
+        """Write the changes together, or one at a time if that's rejected."""
+        try:
+            issue = await self._patch(gitctx, path, changes)
+        except httpx.HTTPStatusError as e:
+            if len(changes) == 1 or not 400 <= e.response.status_code < 500:
+                for change in changes:
+                    change.result.set_exception(e)
+                return
+            logger.info(
+                f"{path}: {len(changes)} changes rejected together "
+                f"({e.response.status_code}), writing them one at a time"
+            )
+            for change in changes:
+                try:
+                    change.result.set_result(await self._patch(gitctx, path, [change]))
+                except Exception as e:
+                    change.result.set_exception(e)
+            return
+        except Exception as e:
+            for change in changes:
+                change.result.set_exception(e)
+            return
+        for change in changes:
+            change.result.set_result(issue)
+
+    async def _patch(
+        self, gitctx: "Connector", path: str, changes: list[Change]
+    ) -> dict[str, Any]:
+        """Apply changes to an issue with a single PATCH, if they change it.
+
+        Returns:
+            The issue after the write (or as it was, if nothing changed)
+        """
+        issue = None
+        if any(change.action in RELATIVE for change in changes):
+            issue = await gitctx.get(path)
+            before = current(issue)
+            fields = dict(before)
+        else:
+            before = {}
+            fields = {}
+        for change in changes:
+            apply(fields, change.action, change.value)
+        data = {k: v for k, v in fields.items() if k not in before or v != before[k]}
+        if not data:
+            logger.debug(f"{path}: {len(changes)} changes, nothing to write")
+            return issue
+        logger.debug(f"{path}: {len(changes)} changes written as {data}")
+        issue = await gitctx.patch(path, data=data)
+        self.changed(issue)
+        return issue
@@ -5,9 +5,79 @@ ai-generated: Cursor
 
 from pathlib import Path
 import sys
+from unittest.mock import patch
 
 # Add src directory to Python path for imports
 backend_dir = Path(__file__).parent.parent
 src_dir = backend_dir / "src"
 if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from github_pm.api import Connector  # noqa: E402
+from github_pm.cache import cache  # noqa: E402
+from github_pm.sync import issue_sync  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Don't let cached GitHub results leak from one test to another."""
+    cache.clear()
+    issue_sync.clear()
+    yield
+    cache.clear()
+    issue_sync.clear()
+
+
+@pytest.fixture
+def make_connector():
+    """Build Connectors whose HTTP client is served by a mock transport."""
+
+    def make(handler) -> Connector:
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            connector = Connector(github_token="test_token")
+        connector.github = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return connector
+
+    return make
+
+
+@pytest.fixture
+def make_issue():
+    """Build open GitHub issues."""
+
+    def make(
+        number: int,
+        milestone: int | None = None,
+        *,
+        login: str | None = None,
+        labels: tuple[str, ...] | list[str] = (),
+        **extra,
+    ) -> dict:
+        """Build an issue.
+
+        Args:
+            number: The issue number
+            milestone: The milestone number, or None for no milestone
+            login: The author, also assigned to the issue, if any
+            labels: The label names
+            extra: Any other fields
+        """
+        issue = {
+            "number": number,
+            "state": "open",
+            "milestone": (
+                {"number": milestone, "title": f"v{milestone}"} if milestone else None
+            ),
+            "labels": [{"id": n, "name": name} for n, name in enumerate(labels)],
+        }
+        if login:
+            user = {"login": login, "id": 1, "html_url": f"https://github.com/{login}"}
+            issue["user"] = user
+            issue["assignees"] = [dict(user)]
+        return {**issue, **extra}
+
+    return make
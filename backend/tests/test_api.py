@@ -3,16 +3,22 @@
 ai-generated: Cursor
 """
 
-from unittest.mock import Mock, patch
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
+import httpx
 import pytest
 
 from github_pm.api import (
     add_label_to_issue,
     add_milestone_to_issue,
     api_router,
+    bulk_change_issues,
     connection,
     Connector,
     create_label,
@@ -21,17 +27,44 @@ from github_pm.api import (
     CreateMilestone,
     delete_label,
     delete_milestone,
+    fetch_issues_graphql,
+    find_linked_prs,
+    find_reactions,
     get_comment_reactions,
     get_comments,
+    get_issue_bundle,
     get_issue_reactions,
     get_issues,
     get_labels,
     get_milestones,
     get_project,
+    get_reactions,
+    get_upstream,
+    IssueOperation,
+    IssueSorter,
+    load_issues,
+    ReactionSubjects,
     remove_label_from_issue,
     remove_milestone_from_issue,
+    stream_issues,
+    Validated,
+    ValidatorCache,
 )
 from github_pm.app import app
+from github_pm.cache import cache
+from github_pm.model import Issue
+from github_pm.resilience import Breakers, CircuitOpen, RetryPolicy
+from github_pm.store import Store
+from github_pm.sync import issue_sync
+
+
+def make_request(connector: Connector | None = None) -> Mock:
+    """Build a minimal request whose app state may hold a shared Connector."""
+    request = Mock()
+    request.app.state = SimpleNamespace()
+    if connector is not None:
+        request.app.state.connector = connector
+    return request
 
 
 class TestConnection:
@@ -41,16 +74,17 @@ class TestConnection:
     async def test_connection_success(self):
         """Test successful GitHub connection."""
         # Arrange
-        mock_session = Mock()
+        mock_session = AsyncMock()
+        request = make_request()
         with (
-            patch("github_pm.api.requests.session", return_value=mock_session),
+            patch("github_pm.api.httpx.AsyncClient", return_value=mock_session),
             patch("github_pm.api.context") as mock_context,
         ):
             mock_context.github_repo = "test/repo"
             mock_context.github_token = "test_token"
 
             # Act
-            async_gen = connection()
+            async_gen = connection(request)
             gitctx = await async_gen.__anext__()
 
             # Assert
@@ -59,6 +93,7 @@ class TestConnection:
             assert gitctx.owner == "test"
             assert gitctx.repo == "repo"
             assert gitctx.github == mock_session
+            assert request.app.state.connector is gitctx
 
             # Clean up - trigger the finally block
             try:
@@ -66,13 +101,38 @@ class TestConnection:
             except StopAsyncIteration:
                 pass
 
+    @pytest.mark.asyncio
+    async def test_connection_reuses_shared_connector(self):
+        """Test that the application's shared Connector is reused."""
+        # Arrange
+        shared = Mock(spec=Connector)
+        shared.interactive = 0
+        request = make_request(shared)
+        with patch("github_pm.api.Connector") as mock_connector:
+
+            # Act
+            async_gen = connection(request)
+            gitctx = await async_gen.__anext__()
+
+            # Assert
+            assert gitctx is shared
+            assert shared.interactive == 1
+            mock_connector.assert_not_called()
+
+            try:
+                await async_gen.__anext__()
+            except StopAsyncIteration:
+                pass
+
     @pytest.mark.asyncio
     async def test_connection_github_init_error(self):
         """Test connection when GitHub initialization fails."""
         # Arrange
+        request = make_request()
         with (
             patch(
-                "github_pm.api.requests.session", side_effect=Exception("Auth failed")
+                "github_pm.api.httpx.AsyncClient",
+                side_effect=Exception("Auth failed"),
             ),
             patch("github_pm.api.context") as mock_context,
         ):
@@ -80,52 +140,65 @@ class TestConnection:
             mock_context.github_token = "test_token"
 
             # Act & Assert
-            async_gen = connection()
+            async_gen = connection(request)
             with pytest.raises(HTTPException) as exc_info:
                 await async_gen.__anext__()
             assert exc_info.value.status_code == 400
+            assert getattr(request.app.state, "connector", None) is None
 
     @pytest.mark.asyncio
     async def test_connection_get_repo_error(self):
         """Test connection when repository access fails."""
         # Arrange
-        mock_session = Mock()
-        # Simulate an error during initialization (e.g., invalid token)
-        with (
-            patch("github_pm.api.requests.session", return_value=mock_session),
-            patch("github_pm.api.context") as mock_context,
-        ):
-            mock_context.github_repo = "test/repo"
-            mock_context.github_token = "test_token"
-            # Simulate error when trying to access repo
-            mock_session.get.side_effect = Exception("Repo not found")
+        shared = Mock(spec=Connector)
+        shared.interactive = 0
+        request = make_request(shared)
 
-            # Act
-            async_gen = connection()
-            gitctx = await async_gen.__anext__()
-            # The error would occur when actually using the connector, not during init
-            assert isinstance(gitctx, Connector)
+        # Act
+        async_gen = connection(request)
+        gitctx = await async_gen.__anext__()
+        assert gitctx is shared
 
-            # Clean up
-            try:
-                await async_gen.__anext__()
-            except StopAsyncIteration:
-                pass
+        # Simulate an error while the route is using the connector
+        with pytest.raises(HTTPException) as exc_info:
+            await async_gen.athrow(Exception("Repo not found"))
+        assert exc_info.value.status_code == 400
+        assert shared.interactive == 0
+
+    @pytest.mark.asyncio
+    async def test_connection_circuit_open(self):
+        """Test that an open circuit breaker is reported as 503."""
+        # Arrange
+        shared = Mock(spec=Connector)
+        shared.interactive = 0
+        request = make_request(shared)
+        async_gen = connection(request)
+        await async_gen.__anext__()
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await async_gen.athrow(CircuitOpen("issues", 12.5))
+
+        # Assert
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "13"}
+        assert shared.interactive == 0
 
     @pytest.mark.asyncio
-    async def test_connection_closes_on_exit(self):
-        """Test that GitHub connection is properly initialized."""
+    async def test_connection_stays_open_on_exit(self):
+        """Test that the shared connection isn't closed after a request."""
         # Arrange
-        mock_session = Mock()
+        mock_session = AsyncMock()
+        request = make_request()
         with (
-            patch("github_pm.api.requests.session", return_value=mock_session),
+            patch("github_pm.api.httpx.AsyncClient", return_value=mock_session),
             patch("github_pm.api.context") as mock_context,
         ):
             mock_context.github_repo = "test/repo"
             mock_context.github_token = "test_token"
 
             # Act
-            async_gen = connection()
+            async_gen = connection(request)
             gitctx = await async_gen.__anext__()
             assert isinstance(gitctx, Connector)
             assert gitctx.github == mock_session
@@ -136,8 +209,379 @@ class TestConnection:
             except StopAsyncIteration:
                 pass
 
-            # Assert - session should have headers set
-            mock_session.headers.update.assert_called()
+            # Assert - the pooled client is left for the next request
+            mock_session.aclose.assert_not_awaited()
+
+
+class TestConnector:
+    """Test the asynchronous GitHub Connector."""
+
+    @pytest.mark.asyncio
+    async def test_get(self, make_connector):
+        """Test a simple GET request."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/repos/test/repo/issues/1"
+            return httpx.Response(200, json={"number": 1})
+
+        connector = make_connector(handler)
+
+        assert await connector.get("/repos/test/repo/issues/1") == {"number": 1}
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_tracks_rate_limit(self, make_connector):
+        """Test that the rate limit reported by GitHub is recorded by resource."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                json={},
+                headers={"X-RateLimit-Remaining": "42", "X-RateLimit-Reset": "1700"},
+            )
+
+        connector = make_connector(handler)
+        budgets = connector.scheduler.budgets
+        assert budgets["graphql"].remaining is None
+
+        await connector.post("/graphql", data={"query": "{}"})
+
+        assert budgets["graphql"].remaining == 42
+        assert budgets["graphql"].reset == 1700.0
+        assert budgets["core"].remaining is None
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_coalesced(self, make_connector):
+        """Test that concurrent identical GETs share one call."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(str(request.url))
+            return httpx.Response(200, json={"number": 1})
+
+        connector = make_connector(handler)
+
+        results = await asyncio.gather(
+            *(connector.get("/repos/test/repo/issues/1") for _ in range(5)),
+            connector.get("/repos/test/repo/issues/2"),
+        )
+
+        assert len(calls) == 2
+        assert connector.coalesced == 4
+        assert not connector.in_flight
+        # Every caller has its own copy
+        results[0]["number"] = 99
+        assert results[1] == {"number": 1}
+        await connector.get("/repos/test/repo/issues/1")
+        assert len(calls) == 3
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_graphql_queries_coalesced(self, make_connector):
+        """Test that identical GraphQL queries, but not mutations, are shared."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(json.loads(request.content)["query"])
+            return httpx.Response(200, json={"data": {}})
+
+        connector = make_connector(handler)
+        query = {"query": "query { viewer { login } }"}
+        mutation = {"query": "mutation { addReaction }"}
+
+        await asyncio.gather(
+            *(connector.post("/graphql", data=query) for _ in range(3)),
+            *(connector.post("/graphql", data=mutation) for _ in range(2)),
+        )
+
+        assert calls.count(query["query"]) == 1
+        assert calls.count(mutation["query"]) == 2
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesced_caller_cancelled(self, make_connector):
+        """Test that a cancelled caller doesn't cancel the shared call."""
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await release.wait()
+            return httpx.Response(200, json={"number": 1})
+
+        connector = make_connector(handler)
+        first = asyncio.ensure_future(connector.get("/repos/test/repo/issues/1"))
+        second = asyncio.ensure_future(connector.get("/repos/test/repo/issues/1"))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        release.set()
+
+        assert await second == {"number": 1}
+        assert first.cancelled()
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self, make_connector):
+        """Test that reads are retried after transient failures."""
+        responses = [
+            httpx.ConnectError("reset"),
+            httpx.Response(503),
+            httpx.Response(200, json={"number": 1}),
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            result = responses.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        connector = make_connector(handler)
+        connector.retry = RetryPolicy(retries=2, base=0.0)
+
+        assert await connector.get("/repos/test/repo/issues/1") == {"number": 1}
+        assert connector.breakers.status()["issues"]["retries"] == 2
+        assert connector.breakers.status()["issues"]["failures"] == 0
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_mutation_not_retried(self, make_connector):
+        """Test that a mutation which may have been applied isn't repeated."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            return httpx.Response(502)
+
+        connector = make_connector(handler)
+        connector.retry = RetryPolicy(retries=2, base=0.0)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await connector.patch("/repos/test/repo/issues/1", data={})
+        assert calls == ["PATCH"]
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_read_retried(self, make_connector):
+        """Test that a rate limited read waits for the pause and retries once."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            return httpx.Response(429, headers={"Retry-After": "30"})
+
+        connector = make_connector(handler)
+
+        with patch("github_pm.scheduler.asyncio.sleep") as mock_sleep:
+            with pytest.raises(httpx.HTTPStatusError):
+                await connector.get("/repos/test/repo/issues/1")
+            with pytest.raises(httpx.HTTPStatusError):
+                await connector.patch("/repos/test/repo/issues/1", data={})
+
+        assert calls == ["GET", "GET", "PATCH"]
+        assert 29 < mock_sleep.call_args_list[0][0][0] <= 30
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_opens(self, make_connector):
+        """Test that repeated failures make calls fail fast."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(503)
+
+        connector = make_connector(handler)
+        connector.breakers = Breakers(threshold=2, cooldown=60.0)
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await connector.get("/repos/test/repo/issues/1")
+        with pytest.raises(CircuitOpen):
+            await connector.get("/repos/test/repo/issues/2")
+        # Other classes of endpoint are unaffected
+        with pytest.raises(httpx.HTTPStatusError):
+            await connector.get("/repos/test/repo/labels")
+
+        assert len(calls) == 3
+        assert connector.breakers.status()["issues"]["state"] == "open"
+        assert connector.breakers.status()["labels"]["state"] == "closed"
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_get_paged_follows_next_links(self, make_connector):
+        """Test that paged GETs follow the rel="next" links."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params.get("page", "1"))
+            headers = {}
+            if page < 3:
+                headers["link"] = (
+                    f'<https://api.github.com/repos/test/repo/labels?page={page + 1}>; rel="next"'
+                )
+            return httpx.Response(200, json=[{"page": page}], headers=headers)
+
+        connector = make_connector(handler)
+
+        result = await connector.get_paged("/repos/test/repo/labels")
+
+        assert result == [{"page": 1}, {"page": 2}, {"page": 3}]
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_get_paged_fetches_remaining_pages_concurrently(self, make_connector):
+        """Test that a rel="last" link lets us fetch pages concurrently."""
+        active = 0
+        peak = 0
+        requested = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            page = int(request.url.params.get("page", "1"))
+            requested.append((page, request.url.params.get("per_page")))
+            headers = {}
+            if page == 1:
+                headers["link"] = (
+                    '<https://api.github.com/repos/test/repo/labels?per_page=100&page=2>; rel="next", '
+                    '<https://api.github.com/repos/test/repo/labels?per_page=100&page=6>; rel="last"'
+                )
+            active += 1
+            peak = max(peak, active)
+            # Make later pages finish first to check that order is preserved
+            await asyncio.sleep(0.01 * (7 - page))
+            active -= 1
+            return httpx.Response(200, json=[{"page": page}], headers=headers)
+
+        connector = make_connector(handler)
+        connector.page_concurrency = 3
+
+        result = await connector.get_paged("/repos/test/repo/labels")
+
+        assert result == [{"page": p} for p in range(1, 7)]
+        assert sorted(requested) == [(p, "100") for p in range(1, 7)]
+        assert peak == 3
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_conditional_requests_replay_cached_body(self, make_connector):
+        """Test that a 304 Not Modified replays the saved response."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[{"name": "bug"}], headers={"etag": '"v1"'})
+
+        connector = make_connector(handler)
+        connector.validators.max_bytes = 1024
+
+        first = await connector.get_paged("/repos/test/repo/labels")
+        first[0]["name"] = "changed by caller"
+        second = await connector.get_paged("/repos/test/repo/labels")
+
+        assert second == [{"name": "bug"}]
+        assert seen == [None, '"v1"']
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_conditional_requests_disabled(self, make_connector):
+        """Test that no validators are sent when the cache is disabled."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("if-none-match"))
+            return httpx.Response(200, json={"n": 1}, headers={"etag": '"v1"'})
+
+        connector = make_connector(handler)
+
+        await connector.get("/x")
+        await connector.get("/x")
+
+        assert seen == [None, None]
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_sends_body(self, make_connector):
+        """Test that DELETE carries a JSON body and tolerates empty responses."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.method, json.loads(request.content)))
+            return httpx.Response(204)
+
+        connector = make_connector(handler)
+
+        result = await connector.delete("/x", data={"assignees": ["a"]})
+
+        assert result == {}
+        assert seen == [("DELETE", {"assignees": ["a"]})]
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises(self, make_connector):
+        """Test that GitHub errors are raised."""
+        connector = make_connector(lambda request: httpx.Response(404))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await connector.get("/missing")
+        await connector.close()
+
+
+def linked_prs_response(linked: dict[int, list[dict]] | None = None):
+    """Build a fake GraphQL POST answering batched linked-PR lookups.
+
+    Each "iN: issue(number: N)" alias in the query is answered with the PRs
+    listed for N in `linked`, or with no PRs.
+    """
+    linked = linked or {}
+
+    async def post(path: str, data: dict) -> dict:
+        numbers = [int(n) for n in re.findall(r"i(\d+): issue", data["query"])]
+        return {
+            "data": {
+                "repository": {
+                    f"i{n}": {
+                        "closedByPullRequestsReferences": {"nodes": linked.get(n, [])}
+                    }
+                    for n in numbers
+                }
+            }
+        }
+
+    return post
+
+
+class TestValidatorCache:
+    """Test the conditional request validator cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the least recently used entry."""
+        # Arrange
+        cache = ValidatorCache(max_bytes=10)
+        cache.put(("a", ""), Validated("1", None, {}, b"aaaa"))
+        cache.put(("b", ""), Validated("2", None, {}, b"bbbb"))
+        cache.get(("a", ""))
+
+        # Act
+        cache.put(("c", ""), Validated("3", None, {}, b"cccc"))
+
+        # Assert
+        assert cache.get(("b", "")) is None
+        assert cache.get(("a", "")).etag == "1"
+        assert cache.get(("c", "")).etag == "3"
+        assert cache.size == 8
+
+    def test_oversized_entry_not_saved(self):
+        """Test that a body larger than the whole budget isn't saved."""
+        # Arrange
+        cache = ValidatorCache(max_bytes=3)
+
+        # Act
+        cache.put(("a", ""), Validated("1", None, {}, b"aaaa"))
+
+        # Assert
+        assert cache.get(("a", "")) is None
+        assert cache.size == 0
 
 
 class TestGetProject:
@@ -161,6 +605,46 @@ class TestGetProject:
             }
 
 
+class TestGetUpstream:
+    """Test the get_upstream endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_get_upstream(self, make_connector):
+        """Test reporting rate limits, concurrency and circuit breakers."""
+
+        # Arrange
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                json={},
+                headers={
+                    "X-RateLimit-Limit": "5000",
+                    "X-RateLimit-Remaining": "4999",
+                    "X-RateLimit-Reset": "1700",
+                    "X-RateLimit-Resource": "core",
+                },
+            )
+
+        connector = make_connector(handler)
+        await connector.get("/repos/test/repo/labels")
+
+        # Act
+        result = await get_upstream(connector)
+
+        # Assert
+        assert result["rate_limits"]["core"] == {
+            "limit": 5000,
+            "remaining": 4999,
+            "reset": 1700.0,
+        }
+        assert result["rate_limits"]["graphql"]["remaining"] is None
+        assert result["concurrency"]["active"] == 0
+        assert result["breakers"]["labels"]["state"] == "closed"
+        assert result["breakers"]["labels"]["calls"] == 1
+        assert result["coalesced"] == 0
+        await connector.close()
+
+
 class TestGetIssues:
     """Test the get_issues endpoint."""
 
@@ -185,16 +669,8 @@ class TestGetIssues:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
-                }
-            }
-        )
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
@@ -213,6 +689,36 @@ class TestGetIssues:
             # Issue 2 doesn't have pull_request, so GraphQL should be called
             assert mock_gitctx.post.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_load_issues_shares_objects(self):
+        """Test that loaded issues are Issues sharing their users and labels."""
+        # Arrange
+        user = {"login": "alice", "id": 7}
+        mock_issues = [
+            {
+                "number": n,
+                "user": dict(user),
+                "labels": [{"id": 1, "name": "Bug"}],
+                "pull_request": {},
+            }
+            for n in (1, 2)
+        ]
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "rest"
+
+            # Act
+            result = await load_issues(mock_gitctx, 1)
+
+        # Assert
+        assert all(isinstance(i, Issue) for i in result)
+        assert result[0]["user"] is result[1]["user"]
+        assert result[0]["labels"][0] is result[1]["labels"][0]
+        assert result[1].label_names == {"bug"}
+
     @pytest.mark.asyncio
     async def test_get_issues_with_linked_prs(self):
         """Test getting issues with linked PRs from GraphQL."""
@@ -227,30 +733,24 @@ class TestGetIssues:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {
-                            "closedByPullRequestsReferences": {
-                                "nodes": [
-                                    {
-                                        "number": 123,
-                                        "title": "Fix Issue 1",
-                                        "url": "https://github.com/test/repo/pull/123",
-                                    },
-                                    {
-                                        "number": 456,
-                                        "title": "Another fix",
-                                        "url": "https://github.com/test/repo/pull/456",
-                                    },
-                                ]
-                            }
-                        }
-                    }
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(
+            side_effect=linked_prs_response(
+                {
+                    1: [
+                        {
+                            "number": 123,
+                            "title": "Fix Issue 1",
+                            "url": "https://github.com/test/repo/pull/123",
+                        },
+                        {
+                            "number": 456,
+                            "title": "Another fix",
+                            "url": "https://github.com/test/repo/pull/456",
+                        },
+                    ]
                 }
-            }
+            )
         )
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
@@ -289,16 +789,8 @@ class TestGetIssues:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
-                }
-            }
-        )
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
@@ -341,16 +833,8 @@ class TestGetIssues:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
-                }
-            }
-        )
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
@@ -401,16 +885,8 @@ class TestGetIssues:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
-                }
-            }
-        )
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
@@ -450,16 +926,8 @@ class TestGetIssues:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
-                }
-            }
-        )
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
@@ -496,153 +964,1146 @@ class TestGetIssues:
             },
         ]
 
-        mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act - with whitespace in sort parameter
+            result = await get_issues(
+                mock_gitctx, milestone_number=0, sort=" bug , feature "
+            )
+
+            # Assert
+            assert len(result) == 2
+            # Should match despite whitespace
+            assert result[0]["id"] == 1  # bug
+            assert result[1]["id"] == 2  # feature
+
+    @pytest.mark.asyncio
+    async def test_get_issues_with_sort_first_match_wins(self):
+        """Test that issues matching multiple labels go to the first matching label."""
+        # Arrange
+        mock_issues = [
+            {
+                "id": 1,
+                "number": 1,
+                "title": "Bug/Feature Issue",
+                "labels": [
+                    {"name": "bug"},
+                    {"name": "feature"},
+                ],  # Issue with both labels
+            },
+            {
+                "id": 2,
+                "number": 2,
+                "title": "Feature Only Issue",
+                "labels": [{"name": "feature"}],
+            },
+        ]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act - bug comes first in sort order
+            result = await get_issues(
+                mock_gitctx, milestone_number=0, sort="bug,feature"
+            )
+
+            # Assert
+            assert len(result) == 2
+            # Issue 1 should be in bug category (first match), not feature
+            assert result[0]["id"] == 1  # bug (first match wins)
+            assert result[1]["id"] == 2  # feature
+
+    @pytest.mark.asyncio
+    async def test_get_issues_with_sort_all_other(self):
+        """Test that issues without sort parameter all go to 'other'."""
+        # Arrange
+        mock_issues = [
+            {
+                "id": 1,
+                "number": 1,
+                "title": "Bug Issue",
+                "labels": [{"name": "bug"}],
+            },
+            {
+                "id": 2,
+                "number": 2,
+                "title": "Feature Issue",
+                "labels": [{"name": "feature"}],
+            },
+        ]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_issues)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act - no sort parameter
+            result = await get_issues(mock_gitctx, milestone_number=0, sort=None)
+
+            # Assert
+            assert len(result) == 2
+            # Both should be in "other" since no sort labels specified
+            assert result[0]["id"] == 1
+            assert result[1]["id"] == 2
+
+
+class TestStreamIssues:
+    """Test streaming the issues of a milestone as NDJSON."""
+
+    @staticmethod
+    def issue(number: int, *labels: str) -> dict:
+        return {"number": number, "labels": [{"name": n} for n in labels]}
+
+    @staticmethod
+    async def lines(response) -> list[int]:
+        return [json.loads(line)["number"] async for line in response.body_iterator]
+
+    @pytest.mark.asyncio
+    async def test_first_group_streamed_before_last_page(self):
+        """Test that the first sort group is sent as each page arrives."""
+        # Arrange
+        last_page = asyncio.Event()
+
+        async def iter_paged(path, headers=None):
+            assert "sort=created&direction=asc" in path
+            yield [self.issue(1, "bug"), self.issue(2), self.issue(3, "Bug")]
+            await last_page.wait()
+            yield [self.issue(4, "feature"), self.issue(5, "bug")]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.iter_paged = iter_paged
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "rest"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            response = await get_issues(
+                mock_gitctx, milestone_number=1, sort="bug,feature", stream=True
+            )
+            body = response.body_iterator
+            first = [json.loads(await anext(body))["number"] for _ in range(2)]
+            last_page.set()
+            rest = [json.loads(line)["number"] async for line in body]
+
+        # Assert
+        assert response.media_type == "application/x-ndjson"
+        assert first == [1, 3]
+        assert rest == [5, 4, 2]
+
+    @pytest.mark.asyncio
+    async def test_cached_issues_streamed_sorted(self):
+        """Test that cached issues are streamed in the usual order."""
+        # Arrange
+        cached = [self.issue(3), self.issue(2, "bug"), self.issue(1)]
+        mock_gitctx = Mock(spec=Connector)
+
+        with (
+            patch.object(cache, "max_bytes", 1024 * 1024),
+            patch.object(cache, "ttls", {"issues": 60}),
+        ):
+            cache.put(("issues", 1), cached)
+
+            # Act
+            response = await get_issues(
+                mock_gitctx,
+                milestone_number=1,
+                sort="bug",
+                accept="application/x-ndjson",
+            )
+            result = await self.lines(response)
+
+        # Assert
+        assert result == [2, 1, 3]
+
+    @pytest.mark.asyncio
+    async def test_streamed_issues_are_cached(self):
+        """Test that the streamed issues are cached like any other load."""
+
+        # Arrange
+        async def iter_paged(path, headers=None):
+            yield [self.issue(1), self.issue(2)]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.iter_paged = iter_paged
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with (
+            patch("github_pm.api.context") as mock_context,
+            patch.object(cache, "max_bytes", 1024 * 1024),
+            patch.object(cache, "ttls", {"issues": 60}),
+        ):
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "rest"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            response = await get_issues(mock_gitctx, milestone_number=1, stream=True)
+            result = await self.lines(response)
+
+            # Assert
+            assert result == [1, 2]
+            assert dict(cache.items("issues")) == {
+                ("issues", 1): [self.issue(1), self.issue(2)]
+            }
+
+    @pytest.mark.asyncio
+    async def test_stored_issues_streamed_while_refreshing(self, tmp_path, make_issue):
+        """Test that a warm start streams the stored issues."""
+        # Arrange
+        store = Store(str(tmp_path / "repo.db"))
+        store.save(("issues", 3), [make_issue(1, 3)])
+        release = asyncio.Event()
+
+        async def iter_paged(path, headers=None):
+            await release.wait()
+            yield [make_issue(1, 3), make_issue(2, 3)]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.iter_paged = iter_paged
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with (
+            patch("github_pm.api.context") as mock_context,
+            patch.object(cache, "max_bytes", 1024 * 1024),
+            patch.object(cache, "ttls", {"issues": 60}),
+            patch.object(cache, "store", store),
+        ):
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "rest"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            result = [
+                json.loads(line)["number"]
+                async for line in await stream_issues(mock_gitctx, 3, [])
+            ]
+            release.set()
+            await asyncio.gather(*cache.loading.values())
+
+        # Assert
+        assert result == [1]
+        assert await store.load(("issues", 3)) == [make_issue(1, 3), make_issue(2, 3)]
+        store.close()
+
+    @staticmethod
+    def stream(connector: Connector) -> httpx.Response:
+        """Stream milestone 1 through the application, with a Connector."""
+        client = TestClient(app)
+        app.state.connector = connector
+        try:
+            with patch("github_pm.api.context") as mock_context:
+                mock_context.github_repo = "test/repo"
+                mock_context.issue_engine = "rest"
+                mock_context.graphql_batch_size = 50
+                return client.get("/api/v1/issues/1?stream=1")
+        finally:
+            del app.state.connector
+
+    def test_github_failure_reported_before_streaming(self, make_connector):
+        """Test that failing to load the first page gives an error status."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404, json={"message": "Not Found"})
+
+        response = self.stream(make_connector(handler))
+
+        assert response.status_code == 400
+        assert "404" in response.json()["detail"]
+
+    def test_open_circuit_reported_before_streaming(self, make_connector):
+        """Test that an open circuit breaker gives a 503 instead of a stream."""
+        connector = make_connector(lambda r: httpx.Response(200, json=[]))
+        connector.breakers = Breakers(threshold=1, cooldown=60.0)
+        connector.breakers.get("issues").failed()
+
+        response = self.stream(connector)
+
+        assert response.status_code == 503
+        assert 0 < int(response.headers["retry-after"]) <= 60
+
+    def test_github_failure_while_streaming(self, make_connector):
+        """Test that a failure after the first page ends with an error line."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/graphql":
+                return httpx.Response(200, json={"data": {"repository": {}}})
+            if request.url.params.get("page") == "2":
+                return httpx.Response(404, json={"message": "Not Found"})
+            next_page = request.url.copy_set_param("page", 2)
+            return httpx.Response(
+                200,
+                json=[self.issue(1)],
+                headers={"Link": f'<{next_page}>; rel="next"'},
+            )
+
+        response = self.stream(make_connector(handler))
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0] == self.issue(1)
+        assert "404" in lines[1]["error"]
+        assert len(lines) == 2
+
+    def test_sorter_out_of_order(self):
+        """Test that first-group issues added out of order still come out."""
+        sorter = IssueSorter(["bug"])
+
+        assert sorter.add([self.issue(5, "bug"), self.issue(1)]) == [
+            self.issue(5, "bug")
+        ]
+        assert sorter.add([self.issue(3, "bug"), self.issue(7, "bug")]) == [
+            self.issue(7, "bug")
+        ]
+        assert [i["number"] for i in sorter.finish()] == [3, 1]
+
+
+class TestFindLinkedPrs:
+    """Test the batched GraphQL lookup of linked PRs."""
+
+    @pytest.mark.asyncio
+    async def test_batches_aliased_queries(self):
+        """Test that issues are looked up in batches of aliased queries."""
+        # Arrange
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response({3: [pr]}))
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.graphql_batch_size = 2
+
+            # Act
+            result = await find_linked_prs(mock_gitctx, [1, 2, 3, 4, 5])
+
+        # Assert
+        assert result == {3: [pr]}
+        assert mock_gitctx.post.call_count == 3
+        first = mock_gitctx.post.call_args_list[0][1]["data"]
+        assert "i1: issue(number: 1)" in first["query"]
+        assert "i2: issue(number: 2)" in first["query"]
+        assert first["variables"] == {"owner": "test", "repo": "repo"}
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_isolated(self):
+        """Test that a failed batch doesn't lose the other batches."""
+        # Arrange
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        answer = linked_prs_response({3: [pr]})
+
+        async def post(path: str, data: dict) -> dict:
+            if "i1: issue" in data["query"]:
+                raise Exception("GraphQL exploded")
+            return await answer(path, data)
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(side_effect=post)
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.graphql_batch_size = 2
+
+            # Act
+            result = await find_linked_prs(mock_gitctx, [1, 2, 3])
+
+        # Assert
+        assert result == {3: [pr]}
+
+    @pytest.mark.asyncio
+    async def test_failed_issue_is_isolated(self):
+        """Test that an unresolvable issue in a batch doesn't fail the rest."""
+        # Arrange
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(
+            return_value={
+                "data": {
+                    "repository": {
+                        "i1": None,
+                        "i2": {"closedByPullRequestsReferences": {"nodes": [pr]}},
+                    }
+                },
+                "errors": [{"path": ["repository", "i1"], "message": "Not found"}],
+            }
+        )
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            result = await find_linked_prs(mock_gitctx, [1, 2])
+
+        # Assert
+        assert result == {2: [pr]}
+        mock_gitctx.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_issues(self):
+        """Test that no GraphQL call is made without issues."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock()
+
+        # Act
+        result = await find_linked_prs(mock_gitctx, [])
+
+        # Assert
+        assert result == {}
+        mock_gitctx.post.assert_not_called()
+
+
+def graphql_issue_node(number: int, **overrides) -> dict:
+    """Build a GraphQL issue node as returned by the issue listing query."""
+    node = {
+        "id": f"I_{number}",
+        "databaseId": 1000 + number,
+        "number": number,
+        "title": f"Issue {number}",
+        "url": f"https://github.com/test/repo/issues/{number}",
+        "state": "OPEN",
+        "bodyHTML": f"<p>Body {number}</p>",
+        "createdAt": "2025-01-01T00:00:00Z",
+        "updatedAt": "2025-01-02T00:00:00Z",
+        "author": {
+            "login": "alice",
+            "url": "https://github.com/alice",
+            "avatarUrl": "a",
+        },
+        "comments": {"totalCount": 2},
+        "reactions": {"totalCount": 1},
+        "issueType": {"name": "Bug", "color": "RED", "description": "A bug"},
+        "milestone": {
+            "id": "M_1",
+            "number": 1,
+            "title": "v1.0.0",
+            "description": None,
+            "dueOn": None,
+            "state": "OPEN",
+        },
+        "labels": {
+            "nodes": [
+                {"id": "L_1", "name": "bug", "color": "d73a4a", "description": None}
+            ]
+        },
+        "assignees": {
+            "nodes": [
+                {
+                    "databaseId": 7,
+                    "login": "bob",
+                    "url": "https://github.com/bob",
+                    "avatarUrl": "b",
+                }
+            ]
+        },
+        "closedByPullRequestsReferences": {"nodes": []},
+    }
+    node.update(overrides)
+    return node
+
+
+class TestFetchIssuesGraphql:
+    """Test the GraphQL milestone issue listing engine."""
+
+    @pytest.mark.asyncio
+    async def test_pages_and_converts(self):
+        """Test that all pages are fetched and converted to the REST shape."""
+        # Arrange
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        pages = [
+            {
+                "data": {
+                    "repository": {
+                        "issues": {
+                            "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                            "nodes": [graphql_issue_node(1)],
+                        }
+                    }
+                }
+            },
+            {
+                "data": {
+                    "repository": {
+                        "issues": {
+                            "pageInfo": {"hasNextPage": False, "endCursor": "c2"},
+                            "nodes": [
+                                graphql_issue_node(
+                                    2,
+                                    milestone=None,
+                                    issueType=None,
+                                    closedByPullRequestsReferences={"nodes": [pr]},
+                                )
+                            ],
+                        }
+                    }
+                }
+            },
+        ]
+        variables = []
+
+        async def post(path: str, data: dict) -> dict:
+            variables.append(dict(data["variables"]))
+            return pages[len(variables) - 1]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(side_effect=post)
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        # Act
+        result = await fetch_issues_graphql(mock_gitctx, 1)
+
+        # Assert
+        assert variables == [
+            {"owner": "test", "repo": "repo", "milestone": "1", "cursor": None},
+            {"owner": "test", "repo": "repo", "milestone": "1", "cursor": "c1"},
+        ]
+        assert [i["number"] for i in result] == [1, 2]
+        first = result[0]
+        assert first["id"] == 1001
+        assert first["html_url"] == "https://github.com/test/repo/issues/1"
+        assert first["body_html"] == "<p>Body 1</p>"
+        assert first["state"] == "open"
+        assert first["comments"] == 2
+        assert first["reactions"] == {"total_count": 1}
+        assert first["user"]["login"] == "alice"
+        assert first["type"]["color"] == "red"
+        assert first["milestone"]["number"] == 1
+        assert first["labels"][0]["name"] == "bug"
+        assert first["assignees"][0]["login"] == "bob"
+        assert first["assignees"][0]["html_url"] == "https://github.com/bob"
+        assert "closed_by" not in first
+        assert result[1]["milestone"] is None
+        assert result[1]["type"] is None
+        assert result[1]["closed_by"] == [pr]
+
+    @pytest.mark.asyncio
+    async def test_no_milestone_uses_rest(self):
+        """Test that milestone 0 is listed through REST, not GraphQL."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(
+            return_value=[{"id": 1, "number": 1, "title": "Issue 1", "labels": []}]
+        )
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.issue_engine = "graphql"
+            mock_context.github_repo = "test/repo"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            result = await get_issues(mock_gitctx, milestone_number=0)
+
+        # Assert
+        assert [i["number"] for i in result] == [1]
+        path = mock_gitctx.get_paged.call_args[0][0]
+        assert "milestone=none" in path
+        # Only the linked PR lookup uses GraphQL
+        query = mock_gitctx.post.call_args[1]["data"]["query"]
+        assert "issues(first:" not in query
+
+    @pytest.mark.asyncio
+    async def test_errors_raise(self):
+        """Test that GraphQL errors are reported."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(
+            return_value={"data": None, "errors": [{"message": "Bad"}]}
+        )
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await fetch_issues_graphql(mock_gitctx, 1)
+
+    @pytest.mark.asyncio
+    async def test_get_issues_uses_graphql_engine(self):
+        """Test that get_issues uses the GraphQL engine when configured."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock()
+        mock_gitctx.post = AsyncMock(
+            return_value={
+                "data": {
+                    "repository": {
+                        "issues": {
+                            "pageInfo": {"hasNextPage": False, "endCursor": None},
+                            "nodes": [graphql_issue_node(2), graphql_issue_node(1)],
+                        }
+                    }
+                }
+            }
+        )
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.issue_engine = "graphql"
+
+            # Act
+            result = await get_issues(mock_gitctx, milestone_number=1)
+
+        # Assert
+        assert [i["number"] for i in result] == [1, 2]
+        mock_gitctx.get_paged.assert_not_called()
+        mock_gitctx.post.assert_called_once()
+
+
+class TestSyncIssues:
+    """Test the incremental "sync" issue engine."""
+
+    @pytest.fixture(autouse=True)
+    def disable_cache(self):
+        with patch.object(cache, "max_bytes", 0):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_full_listing_then_delta(self):
+        """Test that only changes since the high-water mark are fetched."""
+        # Arrange
+        listing = [
+            {
+                "number": 1,
+                "state": "open",
+                "updated_at": "2025-01-01T00:00:00Z",
+                "milestone": {"number": 1},
+                "labels": [],
+            },
+            {
+                "number": 2,
+                "state": "open",
+                "updated_at": "2025-01-02T00:00:00Z",
+                "milestone": {"number": 1},
+                "labels": [],
+            },
+        ]
+        delta = [
+            {
+                "number": 1,
+                "state": "closed",
+                "updated_at": "2025-02-01T00:00:00Z",
+                "milestone": {"number": 1},
+                "labels": [],
+            },
+            {
+                "number": 2,
+                "state": "open",
+                "updated_at": "2025-02-02T00:00:00Z",
+                "milestone": {"number": 2},
+                "labels": [],
+            },
+        ]
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(side_effect=[listing, delta, []])
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response({2: [pr]}))
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with (
+            patch("github_pm.api.context") as mock_context,
+            patch("github_pm.api.high_water_now", return_value="2025-01-05T00:00:00Z"),
+        ):
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "sync"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            first = await get_issues(mock_gitctx, milestone_number=1)
+            second = await get_issues(mock_gitctx, milestone_number=1)
+            moved = await get_issues(mock_gitctx, milestone_number=2)
+
+        # Assert
+        assert [i["number"] for i in first] == [1, 2]
+        assert second == []
+        assert [i["number"] for i in moved] == [2]
+        assert moved[0]["closed_by"] == [pr]
+        paths = [c[0][0] for c in mock_gitctx.get_paged.call_args_list]
+        assert paths[0] == "/repos/test/repo/issues?state=open"
+        assert "state=all" in paths[1]
+        assert "since=2025-01-05T00:00:00Z" in paths[1]
+        assert len(paths) == 3
+
+    @pytest.mark.asyncio
+    async def test_changed_pr_relinks_issues(self):
+        """Test that a changed PR updates the links of the issues it closes."""
+        # Arrange
+        listing = [
+            {
+                "number": 1,
+                "state": "open",
+                "updated_at": "2025-01-01T00:00:00Z",
+                "milestone": None,
+                "labels": [],
+            },
+        ]
+        delta = [
+            {
+                "number": 9,
+                "state": "open",
+                "updated_at": "2025-02-01T00:00:00Z",
+                "milestone": None,
+                "labels": [],
+                "pull_request": {},
+            },
+        ]
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        links = linked_prs_response({})
+        relinks = linked_prs_response({1: [pr]})
+
+        async def post(path: str, data: dict) -> dict:
+            if "p9: pullRequest" in data["query"]:
+                return {
+                    "data": {
+                        "repository": {
+                            "p9": {
+                                "closingIssuesReferences": {"nodes": [{"number": 1}]}
+                            }
+                        }
+                    }
+                }
+            if mock_gitctx.get_paged.call_count == 1:
+                return await links(path, data)
+            return await relinks(path, data)
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(side_effect=[listing, delta])
+        mock_gitctx.post = AsyncMock(side_effect=post)
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "sync"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            first = await get_issues(mock_gitctx, milestone_number=0)
+            second = await get_issues(mock_gitctx, milestone_number=0)
+
+        # Assert
+        assert "closed_by" not in first[0]
+        assert [i["number"] for i in second] == [1, 9]
+        assert second[0]["closed_by"] == [pr]
+
+    @pytest.mark.asyncio
+    async def test_repeated_delta_is_ignored(self):
+        """Test that issues returned again by an inclusive `since` are skipped."""
+        # Arrange
+        listing = [
+            {
+                "number": 1,
+                "state": "open",
+                "updated_at": "2025-01-01T00:00:00Z",
+                "milestone": None,
+                "labels": [],
+            },
+        ]
+        delta = [
+            {
+                **listing[0],
+                "title": "Changed",
+                "body_html": "<p>Body</p>",
+                "updated_at": "2025-02-01T00:00:00Z",
+            }
+        ]
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(side_effect=[listing, delta, delta])
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with (
+            patch("github_pm.api.context") as mock_context,
+            patch("github_pm.api.broker") as mock_broker,
+        ):
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "sync"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            await get_issues(mock_gitctx, milestone_number=0)
+            await get_issues(mock_gitctx, milestone_number=0)
+            published = mock_broker.publish.call_count
+            posted = mock_gitctx.post.call_count
+            result = await get_issues(mock_gitctx, milestone_number=0)
+
+        # Assert
+        assert published == 1
+        assert mock_broker.publish.call_count == 1
+        event, data = mock_broker.publish.call_args[0]
+        assert event == "issue"
+        assert data["issue"]["title"] == "Changed"
+        assert "body_html" not in data["issue"]
+        assert mock_gitctx.post.call_count == posted
+        assert result[0]["title"] == "Changed"
+
+    @pytest.mark.asyncio
+    async def test_closed_issue_moves_high_water_mark(self, make_issue):
+        """Test that a closed issue is merged and published only once."""
+        # Arrange
+        listing = [make_issue(1, updated_at="2025-01-01T00:00:00Z")]
+        closed = make_issue(1, updated_at="2025-02-01T00:00:00Z", state="closed")
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(side_effect=[listing, [closed], [closed]])
+        mock_gitctx.post = AsyncMock(side_effect=linked_prs_response())
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with (
+            patch("github_pm.api.context") as mock_context,
+            patch("github_pm.api.high_water_now", return_value="2025-01-05T00:00:00Z"),
+            patch("github_pm.api.broker") as mock_broker,
+        ):
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "sync"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            await get_issues(mock_gitctx, milestone_number=0)
+            posted = mock_gitctx.post.call_count
+            await get_issues(mock_gitctx, milestone_number=0)
+            result = await get_issues(mock_gitctx, milestone_number=0)
+
+        # Assert
+        assert result == []
+        assert issue_sync.since == "2025-02-01T00:00:00Z"
+        assert mock_broker.publish.call_count == 1
+        assert mock_gitctx.post.call_count == posted
+
+    @pytest.mark.asyncio
+    async def test_empty_listing_sets_high_water_mark(self):
+        """Test that a repository without open issues is then synced by delta."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(side_effect=[[], []])
+        mock_gitctx.post = AsyncMock()
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.issue_engine = "sync"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            first = await get_issues(mock_gitctx, milestone_number=1)
+            second = await get_issues(mock_gitctx, milestone_number=1)
+
+        # Assert
+        assert first == second == []
+        paths = [c[0][0] for c in mock_gitctx.get_paged.call_args_list]
+        assert paths[0] == "/repos/test/repo/issues?state=open"
+        assert "state=all" in paths[1]
+        assert f"since={issue_sync.since}" in paths[1]
+        mock_gitctx.post.assert_not_called()
+
+
+class TestGetComments:
+    """Test the get_comments endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_get_comments(self):
+        """Test getting comments for an issue."""
+        # Arrange
+        mock_comments = [
+            {"id": 1, "body": "Comment 1", "body_html": "<p>Comment 1</p>"},
+            {"id": 2, "body": "Comment 2", "body_html": "<p>Comment 2</p>"},
+        ]
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_comments)
+
+        # Act
+        result = await get_comments(mock_gitctx, issue_number=123)
+
+        # Assert
+        assert len(result) == 2
+        assert result[0]["id"] == 1
+        assert result[1]["id"] == 2
+        mock_gitctx.get_paged.assert_called_once()
+
+
+class TestGetIssueBundle:
+    """Test the issue bundle endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_bundle(self):
+        """Test that the issue, comments and their reactions come together."""
+        # Arrange
+        comments = [
+            {"id": 11, "node_id": "IC_11", "reactions": {"total_count": 1}},
+            {"id": 12, "node_id": "IC_12", "reactions": {"total_count": 0}},
+        ]
+        linked = linked_prs_response()
+
+        async def get(path: str, headers=None) -> dict:
+            assert path == "/repos/test/repo/issues/5"
+            return {"number": 5, "reactions": {"total_count": 1}}
+
+        async def post(path: str, data: dict) -> dict:
+            if "closedByPullRequestsReferences" in data["query"]:
+                return await linked(path, data)
+            assert data["variables"]["ids"] == ["IC_11"]
+            return {
+                "data": {
+                    "repository": {"i5": TestFindReactions.reactions("THUMBS_UP")},
+                    "nodes": [
+                        {"databaseId": 11, **TestFindReactions.reactions("HEART")}
+                    ],
+                }
+            }
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get = AsyncMock(side_effect=get)
+        mock_gitctx.get_paged = AsyncMock(return_value=comments)
+        mock_gitctx.post = AsyncMock(side_effect=post)
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            result = await get_issue_bundle(mock_gitctx, issue_number=5)
+
+        # Assert
+        assert result["issue"] == {"number": 5, "reactions": {"total_count": 1}}
+        assert [r["content"] for r in result["reactions"]] == ["+1"]
+        assert result["comments"] == comments
+        assert [r["content"] for r in result["comment_reactions"]["11"]] == ["heart"]
+        assert result["comment_reactions"]["12"] == []
+        # The comments are listed, and all the reactions found in one query
+        mock_gitctx.get_paged.assert_awaited_once()
+        assert mock_gitctx.post.await_count == 2
+
+
+class TestFindReactions:
+    """Test the batched reactions lookup."""
+
+    @staticmethod
+    def reactions(*contents: str, more: bool = False) -> dict:
+        return {
+            "reactions": {
+                "pageInfo": {"hasNextPage": more},
+                "nodes": [
+                    {
+                        "id": f"R_{n}",
+                        "databaseId": n,
+                        "content": content,
+                        "createdAt": "2025-01-01T00:00:00Z",
+                        "user": {
+                            "databaseId": 7,
+                            "login": "bob",
+                            "url": "https://github.com/bob",
+                            "avatarUrl": "https://avatars/bob",
+                        },
                     }
-                }
+                    for n, content in enumerate(contents)
+                ],
             }
-        )
+        }
+
+    @pytest.mark.asyncio
+    async def test_find_reactions(self):
+        """Test that issues and comments are looked up in one query."""
+        # Arrange
+        response = {
+            "data": {
+                "repository": {
+                    "id": "R_repo",
+                    "i1": self.reactions("THUMBS_UP", "HEART"),
+                    "i2": self.reactions("EYES", more=True),
+                },
+                "nodes": [
+                    {"databaseId": 11, **self.reactions("THUMBS_DOWN")},
+                    None,
+                ],
+            }
+        }
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(return_value=response)
+        mock_gitctx.get_paged = AsyncMock(return_value=[{"content": "eyes"}])
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
+            mock_context.graphql_batch_size = 50
 
-            # Act - with whitespace in sort parameter
-            result = await get_issues(
-                mock_gitctx, milestone_number=0, sort=" bug , feature "
+            # Act
+            result = await get_reactions(
+                mock_gitctx,
+                ReactionSubjects(
+                    issues=[1, 2],
+                    comments=[
+                        {"id": 11, "node_id": "IC_11"},
+                        {"id": 12, "node_id": "IC_gone"},
+                    ],
+                ),
             )
 
-            # Assert
-            assert len(result) == 2
-            # Should match despite whitespace
-            assert result[0]["id"] == 1  # bug
-            assert result[1]["id"] == 2  # feature
+        # Assert
+        mock_gitctx.post.assert_awaited_once()
+        query = mock_gitctx.post.call_args[1]["data"]
+        assert "i1: issue(number: 1)" in query["query"]
+        assert query["variables"]["ids"] == ["IC_11", "IC_gone"]
+        assert [r["content"] for r in result["issues"]["1"]] == ["+1", "heart"]
+        assert result["issues"]["1"][0]["user"] == {
+            "login": "bob",
+            "id": 7,
+            "html_url": "https://github.com/bob",
+            "avatar_url": "https://avatars/bob",
+        }
+        # Issue 2 has more than a page of reactions, so REST is used
+        mock_gitctx.get_paged.assert_awaited_once_with(
+            "/repos/test/repo/issues/2/reactions",
+            headers={"Accept": "application/vnd.github.html+json"},
+        )
+        assert result["issues"]["2"] == [{"content": "eyes"}]
+        # The missing comment is left out
+        assert result["comments"] == {
+            "11": [
+                {
+                    "id": 0,
+                    "node_id": "R_0",
+                    "content": "-1",
+                    "created_at": "2025-01-01T00:00:00Z",
+                    "user": result["issues"]["1"][0]["user"],
+                }
+            ]
+        }
 
     @pytest.mark.asyncio
-    async def test_get_issues_with_sort_first_match_wins(self):
-        """Test that issues matching multiple labels go to the first matching label."""
-        # Arrange
-        mock_issues = [
-            {
-                "id": 1,
-                "number": 1,
-                "title": "Bug/Feature Issue",
-                "labels": [
-                    {"name": "bug"},
-                    {"name": "feature"},
-                ],  # Issue with both labels
-            },
-            {
-                "id": 2,
-                "number": 2,
-                "title": "Feature Only Issue",
-                "labels": [{"name": "feature"}],
-            },
-        ]
+    async def test_batches(self):
+        """Test that lookups are split into batches."""
 
-        mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
+        # Arrange
+        async def post(path: str, data: dict) -> dict:
+            numbers = re.findall(r"i(\d+): issue", data["query"])
+            return {
                 "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
+                    "repository": {f"i{n}": self.reactions() for n in numbers},
+                    "nodes": [
+                        {"databaseId": int(i[3:]), **self.reactions()}
+                        for i in data["variables"]["ids"]
+                    ],
                 }
             }
-        )
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.post = AsyncMock(side_effect=post)
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
+            mock_context.graphql_batch_size = 50
 
-            # Act - bug comes first in sort order
-            result = await get_issues(
-                mock_gitctx, milestone_number=0, sort="bug,feature"
+            # Act
+            result = await find_reactions(
+                mock_gitctx, list(range(1, 11)), {f"IC_{n}": n for n in range(80)}
             )
 
-            # Assert
-            assert len(result) == 2
-            # Issue 1 should be in bug category (first match), not feature
-            assert result[0]["id"] == 1  # bug (first match wins)
-            assert result[1]["id"] == 2  # feature
+        # Assert
+        assert mock_gitctx.post.await_count == 2
+        assert len(result["issues"]) == 10
+        assert len(result["comments"]) == 80
 
     @pytest.mark.asyncio
-    async def test_get_issues_with_sort_all_other(self):
-        """Test that issues without sort parameter all go to 'other'."""
+    async def test_failed_batch_uses_rest(self):
+        """Test that a failed GraphQL batch is looked up with REST instead."""
         # Arrange
-        mock_issues = [
-            {
-                "id": 1,
-                "number": 1,
-                "title": "Bug Issue",
-                "labels": [{"name": "bug"}],
-            },
-            {
-                "id": 2,
-                "number": 2,
-                "title": "Feature Issue",
-                "labels": [{"name": "feature"}],
-            },
-        ]
-
+        request = httpx.Request("POST", "https://api.github.com/graphql")
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_issues)
-        mock_gitctx.post = Mock(
-            return_value={
-                "data": {
-                    "repository": {
-                        "issue": {"closedByPullRequestsReferences": {"nodes": []}}
-                    }
-                }
-            }
+        mock_gitctx.post = AsyncMock(
+            side_effect=httpx.HTTPStatusError(
+                "Bad Gateway", request=request, response=httpx.Response(502)
+            )
+        )
+        mock_gitctx.get_paged = AsyncMock(
+            side_effect=lambda path, headers: [{"content": path.split("/")[-2]}]
         )
         mock_gitctx.owner = "test"
         mock_gitctx.repo = "repo"
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
+            mock_context.graphql_batch_size = 50
 
-            # Act - no sort parameter
-            result = await get_issues(mock_gitctx, milestone_number=0, sort=None)
-
-            # Assert
-            assert len(result) == 2
-            # Both should be in "other" since no sort labels specified
-            assert result[0]["id"] == 1
-            assert result[1]["id"] == 2
-
+            # Act
+            result = await find_reactions(mock_gitctx, [1], {"IC_11": 11, "IC_12": 12})
 
-class TestGetComments:
-    """Test the get_comments endpoint."""
+        # Assert
+        assert result == {
+            "issues": {"1": [{"content": "1"}]},
+            "comments": {"11": [{"content": "11"}], "12": [{"content": "12"}]},
+        }
 
     @pytest.mark.asyncio
-    async def test_get_comments(self):
-        """Test getting comments for an issue."""
+    async def test_rest_failures_isolated(self):
+        """Test that a failed REST lookup only leaves out that item."""
+
         # Arrange
-        mock_comments = [
-            {"id": 1, "body": "Comment 1", "body_html": "<p>Comment 1</p>"},
-            {"id": 2, "body": "Comment 2", "body_html": "<p>Comment 2</p>"},
-        ]
+        async def get_paged(path: str, headers=None) -> list[dict]:
+            if "/comments/12/" in path:
+                request = httpx.Request("GET", f"https://api.github.com{path}")
+                raise httpx.HTTPStatusError(
+                    "Not Found", request=request, response=httpx.Response(404)
+                )
+            return [{"content": "eyes"}]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_comments)
+        mock_gitctx.post = AsyncMock(return_value={"data": None, "errors": ["Bad"]})
+        mock_gitctx.get_paged = AsyncMock(side_effect=get_paged)
+        mock_gitctx.owner = "test"
+        mock_gitctx.repo = "repo"
 
-        # Act
-        result = await get_comments(mock_gitctx, issue_number=123)
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.graphql_batch_size = 50
+
+            # Act
+            result = await find_reactions(mock_gitctx, [1], {"IC_11": 11, "IC_12": 12})
 
         # Assert
-        assert len(result) == 2
-        assert result[0]["id"] == 1
-        assert result[1]["id"] == 2
-        mock_gitctx.get_paged.assert_called_once()
+        assert result == {
+            "issues": {"1": [{"content": "eyes"}]},
+            "comments": {"11": [{"content": "eyes"}]},
+        }
 
 
 class TestGetMilestones:
@@ -668,7 +2129,7 @@ class TestGetMilestones:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_milestones)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_milestones)
 
         # Act
         result = await get_milestones(mock_gitctx)
@@ -694,7 +2155,7 @@ class TestCreateMilestone:
         # Arrange
         from datetime import datetime
 
-        mock_milestone_response = {"id": 1, "title": "New Milestone"}
+        mock_milestone_response = {"id": 1, "number": 1, "title": "New Milestone"}
 
         milestone_data = CreateMilestone(
             title="New Milestone",
@@ -703,7 +2164,7 @@ class TestCreateMilestone:
         )
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.post = Mock(return_value=mock_milestone_response)
+        mock_gitctx.post = AsyncMock(return_value=mock_milestone_response)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -724,12 +2185,12 @@ class TestCreateMilestone:
     async def test_create_milestone_with_defaults(self):
         """Test creating a milestone with default values."""
         # Arrange
-        mock_milestone_response = {"id": 1, "title": "New Milestone"}
+        mock_milestone_response = {"id": 1, "number": 1, "title": "New Milestone"}
 
         milestone_data = CreateMilestone(title="New Milestone")
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.post = Mock(return_value=mock_milestone_response)
+        mock_gitctx.post = AsyncMock(return_value=mock_milestone_response)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -756,7 +2217,7 @@ class TestDeleteMilestone:
         """Test successfully deleting a milestone."""
         # Arrange
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.delete = Mock(return_value={})
+        mock_gitctx.delete = AsyncMock(return_value={})
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -773,7 +2234,7 @@ class TestDeleteMilestone:
         """Test deleting a milestone that doesn't exist."""
         # Arrange
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.delete = Mock(side_effect=Exception("Milestone not found"))
+        mock_gitctx.delete = AsyncMock(side_effect=Exception("Milestone not found"))
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -790,10 +2251,10 @@ class TestAddMilestoneToIssue:
     async def test_add_milestone_to_issue(self):
         """Test adding a milestone to an issue."""
         # Arrange
-        mock_issue_response = {"id": 123, "milestone": {"number": 1}}
+        mock_issue_response = {"id": 123, "number": 123, "milestone": {"number": 1}}
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.patch = Mock(return_value=mock_issue_response)
+        mock_gitctx.patch = AsyncMock(return_value=mock_issue_response)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -817,10 +2278,10 @@ class TestRemoveMilestoneFromIssue:
     async def test_remove_milestone_from_issue(self):
         """Test removing a milestone from an issue."""
         # Arrange
-        mock_issue_response = {"id": 123, "milestone": None}
+        mock_issue_response = {"id": 123, "number": 123, "milestone": None}
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.patch = Mock(return_value=mock_issue_response)
+        mock_gitctx.patch = AsyncMock(return_value=mock_issue_response)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -850,7 +2311,7 @@ class TestGetLabels:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_labels)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_labels)
 
         # Act
         result = await get_labels(mock_gitctx)
@@ -861,6 +2322,26 @@ class TestGetLabels:
         assert result[1]["name"] == "feature"
         mock_gitctx.get_paged.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_labels_fields(self):
+        """Test selecting the label attributes to return."""
+        # Arrange
+        mock_labels = [
+            {"id": 1, "name": "bug", "color": "red", "url": "https://api/1"},
+        ]
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_labels)
+
+        # Act
+        default = await get_labels(mock_gitctx)
+        names = await get_labels(mock_gitctx, fields="name")
+        full = await get_labels(mock_gitctx, fields="full")
+
+        # Assert
+        assert default == [{"id": 1, "name": "bug", "color": "red"}]
+        assert names == [{"name": "bug"}]
+        assert full == mock_labels
+
 
 class TestCreateLabel:
     """Test the create_label endpoint."""
@@ -876,7 +2357,7 @@ class TestCreateLabel:
         )
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.post = Mock(return_value=mock_label_response)
+        mock_gitctx.post = AsyncMock(return_value=mock_label_response)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -902,7 +2383,7 @@ class TestCreateLabel:
         label_data = CreateLabel(name="new-label", color="green")
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.post = Mock(return_value=mock_label_response)
+        mock_gitctx.post = AsyncMock(return_value=mock_label_response)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -928,7 +2409,7 @@ class TestDeleteLabel:
         """Test successfully deleting a label."""
         # Arrange
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.delete = Mock(return_value={})
+        mock_gitctx.delete = AsyncMock(return_value={})
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -945,7 +2426,7 @@ class TestDeleteLabel:
         """Test deleting a label that doesn't exist."""
         # Arrange
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.delete = Mock(side_effect=Exception("Label not found"))
+        mock_gitctx.delete = AsyncMock(side_effect=Exception("Label not found"))
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -964,16 +2445,18 @@ class TestAddLabelToIssue:
         # Arrange
         mock_issue_get = {
             "id": 123,
+            "number": 123,
             "labels": [{"name": "existing"}],
         }
         mock_issue_patch = {
             "id": 123,
+            "number": 123,
             "labels": [{"name": "existing"}, {"name": "bug"}],
         }
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get = Mock(return_value=mock_issue_get)
-        mock_gitctx.patch = Mock(return_value=mock_issue_patch)
+        mock_gitctx.get = AsyncMock(return_value=mock_issue_get)
+        mock_gitctx.patch = AsyncMock(return_value=mock_issue_patch)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -998,12 +2481,13 @@ class TestAddLabelToIssue:
         # Arrange
         mock_issue_get = {
             "id": 123,
+            "number": 123,
             "labels": [{"name": "bug"}],
         }
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get = Mock(return_value=mock_issue_get)
-        mock_gitctx.patch = Mock()
+        mock_gitctx.get = AsyncMock(return_value=mock_issue_get)
+        mock_gitctx.patch = AsyncMock()
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1028,16 +2512,18 @@ class TestRemoveLabelFromIssue:
         # Arrange
         mock_issue_get = {
             "id": 123,
+            "number": 123,
             "labels": [{"name": "bug"}, {"name": "feature"}],
         }
         mock_issue_patch = {
             "id": 123,
+            "number": 123,
             "labels": [{"name": "feature"}],
         }
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get = Mock(return_value=mock_issue_get)
-        mock_gitctx.patch = Mock(return_value=mock_issue_patch)
+        mock_gitctx.get = AsyncMock(return_value=mock_issue_get)
+        mock_gitctx.patch = AsyncMock(return_value=mock_issue_patch)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1060,12 +2546,13 @@ class TestRemoveLabelFromIssue:
         # Arrange
         mock_issue_get = {
             "id": 123,
+            "number": 123,
             "labels": [{"name": "feature"}],
         }
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get = Mock(return_value=mock_issue_get)
-        mock_gitctx.patch = Mock()
+        mock_gitctx.get = AsyncMock(return_value=mock_issue_get)
+        mock_gitctx.patch = AsyncMock()
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1094,7 +2581,7 @@ class TestGetIssueReactions:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_reactions)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_reactions)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1115,7 +2602,7 @@ class TestGetIssueReactions:
         """Test getting reactions for an issue with no reactions."""
         # Arrange
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=[])
+        mock_gitctx.get_paged = AsyncMock(return_value=[])
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1142,7 +2629,7 @@ class TestGetCommentReactions:
         ]
 
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=mock_reactions)
+        mock_gitctx.get_paged = AsyncMock(return_value=mock_reactions)
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1165,7 +2652,7 @@ class TestGetCommentReactions:
         """Test getting reactions for a comment with no reactions."""
         # Arrange
         mock_gitctx = Mock(spec=Connector)
-        mock_gitctx.get_paged = Mock(return_value=[])
+        mock_gitctx.get_paged = AsyncMock(return_value=[])
 
         with patch("github_pm.api.context") as mock_context:
             mock_context.github_repo = "test/repo"
@@ -1178,6 +2665,269 @@ class TestGetCommentReactions:
             mock_gitctx.get_paged.assert_called_once()
 
 
+class TestBulkChangeIssues:
+    """Test the bulk issue change endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_abort_batch(self):
+        """Test that each change is reported, and failures are isolated."""
+
+        # Arrange
+        async def patch_issue(path: str, data: dict) -> dict:
+            number = int(path.rsplit("/", 1)[1])
+            if number == 2:
+                raise Exception("Validation Failed")
+            return {
+                "number": number,
+                "state": "open",
+                "milestone": None,
+                "assignees": [],
+            }
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.patch = AsyncMock(side_effect=patch_issue)
+        operations = [
+            IssueOperation(issue=1, action="add_milestone", milestone=3),
+            IssueOperation(issue=2, action="add_milestone", milestone=3),
+            IssueOperation(issue=3, action="add_assignees", assignees=["me"]),
+        ]
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.bulk_concurrency = 2
+
+            # Act
+            results = await bulk_change_issues(mock_gitctx, operations)
+
+        # Assert
+        assert results == [
+            {"issue": 1, "action": "add_milestone", "ok": True},
+            {
+                "issue": 2,
+                "action": "add_milestone",
+                "ok": False,
+                "error": "Validation Failed",
+            },
+            {"issue": 3, "action": "add_assignees", "ok": True},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limited_and_same_issue_coalesced(self):
+        """Test the concurrency limit, and that one issue's changes are merged."""
+        # Arrange
+        active = 0
+        peak = 0
+        applied = []
+
+        async def patch_issue(path: str, data: dict) -> dict:
+            nonlocal active, peak
+            number = int(path.rsplit("/", 1)[1])
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            applied.append((number, data["milestone"]))
+            return {"number": number, "state": "open", "milestone": None}
+
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.patch = AsyncMock(side_effect=patch_issue)
+        operations = [
+            IssueOperation(issue=n % 3, action="add_milestone", milestone=n)
+            for n in range(9)
+        ]
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+            mock_context.bulk_concurrency = 2
+
+            # Act
+            results = await bulk_change_issues(mock_gitctx, operations)
+
+        # Assert
+        assert all(r["ok"] for r in results)
+        assert peak == 2
+        # One write per issue, in which the last change wins
+        assert sorted(applied) == [(0, 6), (1, 7), (2, 8)]
+
+    def test_operation_requires_argument(self):
+        """Test that an operation missing its argument is rejected."""
+        client = TestClient(app)
+        app.dependency_overrides[connection] = lambda: Mock(spec=Connector)
+        try:
+            response = client.post(
+                "/api/v1/issues/bulk", json=[{"issue": 1, "action": "add_label"}]
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 422
+        assert "add_label requires a label" in response.text
+
+
+class TestResponseCaching:
+    """Test caching of reads and invalidation by mutations."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self):
+        with (
+            patch.object(cache, "max_bytes", 1024 * 1024),
+            patch.object(
+                cache,
+                "ttls",
+                {"milestones": 60, "labels": 60, "assignees": 60, "issues": 60},
+            ),
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_get_labels_cached_until_label_created(self):
+        """Test that labels are cached, and creating a label invalidates them."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(return_value=[{"name": "bug"}])
+        mock_gitctx.post = AsyncMock(return_value={"name": "new"})
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act
+            await get_labels(mock_gitctx)
+            await get_labels(mock_gitctx)
+            assert mock_gitctx.get_paged.call_count == 1
+            await create_label(mock_gitctx, CreateLabel(name="new", color="ffffff"))
+            await get_labels(mock_gitctx)
+
+        # Assert
+        assert mock_gitctx.get_paged.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_milestones_doesnt_change_cache(self):
+        """Test that the "none" milestone isn't added to the cached list."""
+        # Arrange
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get_paged = AsyncMock(
+            return_value=[{"title": "v1.0.0", "number": 1}]
+        )
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act
+            first = await get_milestones(mock_gitctx)
+            second = await get_milestones(mock_gitctx)
+
+        # Assert
+        assert first == second
+        assert len(second) == 2
+        mock_gitctx.get_paged.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_label_change_updates_cached_issue(self):
+        """Test that adding a label updates the cached issue in place."""
+        # Arrange
+        issue = {
+            "number": 5,
+            "state": "open",
+            "body_html": "<p>Hi</p>",
+            "closed_by": [{"number": 9}],
+            "milestone": {"number": 1},
+            "labels": [{"name": "bug"}],
+        }
+        cache.put(("issues", 1), [issue])
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.get = AsyncMock(return_value=issue)
+        mock_gitctx.patch = AsyncMock(
+            return_value={
+                "number": 5,
+                "state": "open",
+                "body": "Hi",
+                "milestone": {"number": 1},
+                "labels": [{"name": "bug"}, {"name": "urgent"}],
+            }
+        )
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act
+            await add_label_to_issue(mock_gitctx, issue_number=5, label_name="urgent")
+
+        # Assert
+        (cached,) = dict(cache.items("issues"))[("issues", 1)]
+        assert [x["name"] for x in cached["labels"]] == ["bug", "urgent"]
+        assert cached["body_html"] == "<p>Hi</p>"
+        assert cached["closed_by"] == [{"number": 9}]
+        assert [x["name"] for x in issue["labels"]] == ["bug"]
+
+    @pytest.mark.asyncio
+    async def test_milestone_change_moves_cached_issue(self):
+        """Test that moving an issue moves it between cached lists."""
+        # Arrange
+        issue = {"number": 5, "state": "open", "milestone": {"number": 1}}
+        cache.put(("issues", 1), [issue, {"number": 6}])
+        cache.put(("issues", 2), [{"number": 7}])
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.patch = AsyncMock(
+            return_value={"number": 5, "state": "open", "milestone": {"number": 2}}
+        )
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act
+            await add_milestone_to_issue(
+                mock_gitctx, issue_number=5, milestone_number=2
+            )
+
+        # Assert
+        cached = dict(cache.items("issues"))
+        assert [i["number"] for i in cached[("issues", 1)]] == [6]
+        assert [i["number"] for i in cached[("issues", 2)]] == [7, 5]
+
+    @pytest.mark.asyncio
+    async def test_delete_label_removes_it_from_cached_issues(self):
+        """Test that deleting a label removes it from cached issues."""
+        # Arrange
+        cache.put(("labels",), [{"name": "bug"}])
+        cache.put(
+            ("issues", 1), [{"number": 5, "labels": [{"name": "bug"}, {"name": "x"}]}]
+        )
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.delete = AsyncMock(return_value={})
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act
+            await delete_label(mock_gitctx, "bug")
+
+        # Assert
+        assert list(cache.items("labels")) == []
+        (cached,) = dict(cache.items("issues"))[("issues", 1)]
+        assert cached["labels"] == [{"name": "x"}]
+
+    @pytest.mark.asyncio
+    async def test_delete_milestone_invalidates_issue_lists(self):
+        """Test that deleting a milestone drops its issue list and "none"."""
+        # Arrange
+        cache.put(("milestones",), [{"number": 1}])
+        cache.put(("issues", 0), [])
+        cache.put(("issues", 1), [])
+        cache.put(("issues", 2), [])
+        mock_gitctx = Mock(spec=Connector)
+        mock_gitctx.delete = AsyncMock(return_value={})
+
+        with patch("github_pm.api.context") as mock_context:
+            mock_context.github_repo = "test/repo"
+
+            # Act
+            await delete_milestone(mock_gitctx, milestone_number=1)
+
+        # Assert
+        assert list(cache.items("milestones")) == []
+        assert [k for k, _ in cache.items("issues")] == [("issues", 2)]
+
+
 class TestAPIRouterIntegration:
     """Test API router integration with FastAPI app."""
 
@@ -3,6 +3,8 @@
 ai-generated: Cursor
 """
 
+from unittest.mock import AsyncMock, patch
+
 from fastapi.testclient import TestClient
 
 from github_pm.app import app, router
@@ -148,3 +150,30 @@ class TestApp:
         # Verify that the same route without prefix doesn't exist
         response_no_prefix = client.get("/project")
         assert response_no_prefix.status_code == 404
+
+    def test_lifespan_opens_and_closes_connector(self):
+        """Test that the lifespan handler manages the shared Connector."""
+        # Arrange
+        connector = AsyncMock()
+        with patch("github_pm.app.open_connector", return_value=connector):
+
+            # Act
+            with TestClient(app):
+                # Assert
+                assert app.state.connector is connector
+                connector.close.assert_not_awaited()
+
+        connector.close.assert_awaited_once()
+        assert app.state.connector is None
+
+    def test_lifespan_survives_connector_error(self):
+        """Test that the app still starts when GitHub can't be reached."""
+        # Arrange
+        with patch("github_pm.app.open_connector", side_effect=Exception("bad")):
+
+            # Act
+            with TestClient(app) as client:
+                response = client.get("/health")
+
+        # Assert
+        assert response.status_code == 200
@@ -0,0 +1,234 @@
+"""Tests for the cache module."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from github_pm.cache import ResponseCache
+from github_pm.store import Store
+
+TTLS = {"labels": 60.0, "issues": 10.0, "comments": 0.0}
+
+
+class TestResponseCache:
+    """Test the in-process response cache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        """Test that a loaded value is served from the cache."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        loader = AsyncMock(return_value=[{"name": "bug"}])
+
+        # Act
+        first = await cache.get(("labels",), loader)
+        second = await cache.get(("labels",), loader)
+
+        # Assert
+        assert first == second == [{"name": "bug"}]
+        loader.assert_awaited_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        """Test that entries expire after the resource's TTL."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        loader = AsyncMock(side_effect=[["old"], ["new"]])
+
+        with patch("github_pm.cache.time.monotonic", return_value=100.0):
+            await cache.get(("issues", 1), loader)
+        with patch("github_pm.cache.time.monotonic", return_value=109.0):
+            assert await cache.get(("issues", 1), loader) == ["old"]
+
+        # Act
+        with patch("github_pm.cache.time.monotonic", return_value=111.0):
+            result = await cache.get(("issues", 1), loader)
+
+        # Assert
+        assert result == ["new"]
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_uncached_resource(self):
+        """Test that resources without a TTL are always loaded."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        loader = AsyncMock(return_value=[])
+
+        # Act
+        await cache.get(("comments", 1), loader)
+        await cache.get(("comments", 1), loader)
+
+        # Assert
+        assert loader.await_count == 2
+        assert cache.size == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that simultaneous misses don't stampede the loader."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["label"]
+
+        # Act
+        results = await asyncio.gather(
+            *(cache.get(("labels",), loader) for _ in range(10))
+        )
+
+        # Assert
+        assert results == [["label"]] * 10
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        """Test that a failed load is reported and retried next time."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        loader = AsyncMock(side_effect=[Exception("GitHub is down"), ["label"]])
+
+        # Act & Assert
+        with pytest.raises(Exception):
+            await cache.get(("labels",), loader)
+        assert await cache.get(("labels",), loader) == ["label"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_load_discards_result(self):
+        """Test that a load started before an invalidation isn't saved."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return ["stale"]
+
+        pending = asyncio.ensure_future(cache.get(("labels",), slow_loader))
+        await started.wait()
+
+        # Act
+        cache.invalidate(("labels",))
+        release.set()
+        assert await pending == ["stale"]
+
+        # Assert
+        assert await cache.get(("labels",), AsyncMock(return_value=["fresh"])) == [
+            "fresh"
+        ]
+
+    def test_lru_eviction_by_size(self):
+        """Test that the least recently used entries are evicted."""
+        # Arrange
+        cache = ResponseCache(max_bytes=20, ttls=TTLS)
+        cache.put(("issues", 1), "aaaaaa")  # 8 bytes of JSON
+        cache.put(("issues", 2), "bbbbbb")
+
+        # Act
+        cache.put(("issues", 3), "cccccc")
+
+        # Assert
+        assert [k for k, _ in cache.items("issues")] == [("issues", 2), ("issues", 3)]
+        assert cache.size == 16
+
+    def test_update_replaces_value(self):
+        """Test that update() replaces the cached value."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        cache.put(("issues", 1), [1, 2])
+        cache.put(("issues", 2), [3])
+
+        # Act
+        cache.update(("issues", 1), lambda v: v + [4])
+        cache.update(("issues", 9), lambda v: v + [4])
+
+        # Assert
+        assert dict(cache.items("issues")) == {
+            ("issues", 1): [1, 2, 4],
+            ("issues", 2): [3],
+        }
+
+    def test_invalidate_resource(self):
+        """Test that all keys of a resource can be invalidated."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        cache.put(("issues", 1), [1])
+        cache.put(("issues", 2), [2])
+        cache.put(("labels",), ["bug"])
+
+        # Act
+        cache.invalidate_resource("issues")
+
+        # Assert
+        assert list(cache.items("issues")) == []
+        assert list(cache.items("labels")) == [(("labels",), ["bug"])]
+
+
+class TestResponseCacheStore:
+    """Test the response cache backed by a persistent store."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = Store(str(tmp_path / "repo.db"))
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_loaded_values_are_saved(self, store):
+        """Test that loaded values are written through to the store."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        cache.store = store
+
+        # Act
+        await cache.get(("labels",), AsyncMock(return_value=[{"name": "bug"}]))
+
+        # Assert
+        assert await store.load(("labels",)) == [{"name": "bug"}]
+
+    @pytest.mark.asyncio
+    async def test_warm_start_serves_stored_value_while_refreshing(self, store):
+        """Test that a restart answers from the store and refreshes it."""
+        # Arrange
+        store.save(("labels",), [{"name": "old"}])
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        cache.store = store
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            return [{"name": "new"}]
+
+        # Act
+        first = await cache.get(("labels",), loader)
+        second = await cache.get(("labels",), loader)
+        release.set()
+        await asyncio.gather(*cache.loading.values())
+        third = await cache.get(("labels",), loader)
+
+        # Assert
+        assert first == second == [{"name": "old"}]
+        assert third == [{"name": "new"}]
+        assert await store.load(("labels",)) == [{"name": "new"}]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_discards_stored_value(self, store):
+        """Test that invalidation also removes the value from the store."""
+        # Arrange
+        cache = ResponseCache(max_bytes=1024, ttls=TTLS)
+        cache.store = store
+        cache.put(("labels",), [{"name": "bug"}])
+
+        # Act
+        cache.invalidate(("labels",))
+
+        # Assert
+        assert await store.load(("labels",)) is None
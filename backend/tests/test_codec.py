@@ -0,0 +1,126 @@
+"""Tests for the codec module."""
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+import pytest
+
+from github_pm import codec
+from github_pm.codec import accepts_msgpack, dumps, loads, NegotiatedRoute
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def json_module(request, monkeypatch):
+    """Run a test with orjson (if installed) and with the json fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(codec, "orjson", None)
+    elif codec.orjson is None:
+        pytest.skip("needs orjson")
+
+
+class TestLoadsDumps:
+    """Test JSON encoding and decoding."""
+
+    def test_round_trip(self, json_module):
+        """Test that values survive encoding and decoding."""
+        value = {"number": 1, "title": "Café", "labels": [{"name": "bug"}], "x": None}
+
+        data = dumps(value)
+
+        assert (
+            data
+            == '{"number":1,"title":"Café","labels":[{"name":"bug"}],"x":null}'.encode()
+        )
+        assert loads(data) == value
+        assert loads(data.decode()) == value
+
+    def test_converts_values(self, json_module):
+        """Test that values JSON can't represent are converted."""
+        value = {"when": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+
+        assert loads(dumps(value)) == {"when": "2025-01-02T03:04:05+00:00"}
+
+
+class TestAcceptsMsgpack:
+    """Test MessagePack negotiation."""
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            ("", False),
+            ("application/json", False),
+            ("application/msgpack", True),
+            ("application/json, application/x-msgpack", True),
+            ("application/msgpack;q=0.5, application/json", True),
+            ("application/msgpack;q=0", False),
+        ],
+    )
+    def test_accepts(self, monkeypatch, accept, expected):
+        """Test parsing Accept."""
+        monkeypatch.setattr(codec, "msgpack", object())
+
+        assert accepts_msgpack(accept) is expected
+
+    def test_not_installed(self, monkeypatch):
+        """Test that we never choose MessagePack without the package."""
+        monkeypatch.setattr(codec, "msgpack", None)
+
+        assert not accepts_msgpack("application/msgpack")
+
+
+@pytest.fixture
+def client() -> TestClient:
+    router = APIRouter(route_class=NegotiatedRoute)
+
+    @router.get("/data")
+    async def data():
+        return {"issues": [{"number": 1}]}
+
+    @router.post("/created", status_code=201)
+    def created():
+        return {"ok": True}
+
+    @router.get("/text")
+    async def text():
+        return PlainTextResponse("hello")
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestNegotiatedRoute:
+    """Test encoding route results."""
+
+    def test_json(self, client):
+        """Test that results are encoded as JSON by default."""
+        response = client.get("/data")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == b'{"issues":[{"number":1}]}'
+
+    def test_status_code(self, client):
+        """Test that a route's status code is kept."""
+        response = client.post("/created")
+
+        assert response.status_code == 201
+        assert response.json() == {"ok": True}
+
+    def test_response_passed_through(self, client):
+        """Test that a Response returned by a route is sent as it is."""
+        response = client.get("/text", headers={"Accept": codec.MSGPACK})
+
+        assert response.text == "hello"
+
+    def test_msgpack(self, client):
+        """Test that a client asking for MessagePack gets it."""
+        msgpack = pytest.importorskip("msgpack")
+
+        response = client.get("/data", headers={"Accept": codec.MSGPACK})
+
+        assert response.headers["content-type"] == codec.MSGPACK
+        assert "Accept" in response.headers["vary"]
+        assert msgpack.unpackb(response.content) == {"issues": [{"number": 1}]}
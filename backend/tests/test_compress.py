@@ -0,0 +1,165 @@
+"""Tests for the compress module."""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+import pytest
+
+from github_pm import compress
+from github_pm.compress import CompressedBodies, CompressionMiddleware, negotiate
+
+BIG = [{"number": n, "title": f"Issue {n}"} for n in range(100)]
+
+
+def make_client() -> tuple[TestClient, CompressionMiddleware]:
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return BIG
+
+    @app.get("/small")
+    async def small():
+        return {"message": "OK"}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for n in range(3):
+                yield f'{{"number": {n}}}\n'.encode()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/events")
+    async def events():
+        async def lines():
+            yield b"event: labels\ndata: {}\n\n"
+
+        return StreamingResponse(lines(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache_bytes=1 << 20)
+    client = TestClient(app)
+    # Build the middleware stack, so that we can look at the middleware
+    client.get("/small")
+    middleware = app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+    return client, middleware
+
+
+class TestNegotiate:
+    """Test choosing an encoding."""
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("deflate, gzip;q=0.5", "gzip"),
+            ("gzip;q=0", None),
+            ("*", compress.available()[0]),
+        ],
+    )
+    def test_negotiate(self, accept, expected):
+        """Test parsing Accept-Encoding."""
+        assert negotiate(accept) == expected
+
+    def test_preference(self, monkeypatch):
+        """Test that quality values outrank our preference."""
+        monkeypatch.setattr(compress, "available", lambda: ["zstd", "br", "gzip"])
+
+        assert negotiate("gzip, br, zstd") == "zstd"
+        assert negotiate("gzip, br;q=0.9, zstd;q=0.5") == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Test compressing responses."""
+
+    def test_large_body_compressed_once(self):
+        """Test that a repeated body is compressed once."""
+        # Arrange
+        client, middleware = make_client()
+
+        # Act
+        first = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert first.json() == second.json() == BIG
+        assert int(first.headers["content-length"]) < len(first.content)
+        assert (middleware.bodies.misses, middleware.bodies.hits) == (1, 1)
+
+    def test_small_body_not_compressed(self):
+        """Test that small bodies are sent as they are."""
+        client, _ = make_client()
+
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"message": "OK"}
+
+    def test_no_accept_encoding(self):
+        """Test that clients not asking for compression don't get it."""
+        client, _ = make_client()
+
+        response = client.get("/big", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == BIG
+
+    def test_stream_compressed(self):
+        """Test that streamed responses are compressed chunk by chunk."""
+        client, _ = make_client()
+
+        with client.stream(
+            "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw) == b"".join(
+            f'{{"number": {n}}}\n'.encode() for n in range(3)
+        )
+
+    def test_events_not_compressed(self):
+        """Test that Server-Sent Events are left alone."""
+        client, _ = make_client()
+
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "event: labels\ndata: {}\n\n"
+
+
+class TestCompressedBodies:
+    """Test the store of compressed bodies."""
+
+    def test_eviction(self):
+        """Test that the least recently used bodies are evicted."""
+        # Arrange
+        bodies = CompressedBodies(max_bytes=50)
+        one, two = b"1" * 1000, b"2" * 1000
+        size = len(bodies.compress(one, "gzip"))
+        assert size < 50 < size * 2
+
+        # Act
+        bodies.compress(two, "gzip")
+        bodies.compress(one, "gzip")
+
+        # Assert
+        assert bodies.misses == 3
+        assert bodies.size == size
+
+    @pytest.mark.skipif(compress.zstd is None, reason="needs compression.zstd")
+    def test_zstd(self):
+        """Test zstd compression."""
+        body = b"x" * 1000
+
+        compressed = CompressedBodies(max_bytes=0).compress(body, "zstd")
+
+        assert compress.zstd.decompress(compressed) == body
@@ -0,0 +1,104 @@
+"""Tests for the events module."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from github_pm.api import get_events, issue_changed
+from github_pm.events import EventBroker
+
+
+class TestEventBroker:
+    """Test broadcasting change events."""
+
+    @pytest.mark.asyncio
+    async def test_published_events_are_streamed(self):
+        """Test that subscribers receive events in SSE format."""
+        # Arrange
+        broker = EventBroker()
+        stream = broker.stream()
+        assert await anext(stream) == b"retry: 5000\n\n"
+
+        # Act
+        broker.publish("labels", {"action": "created", "name": "bug"})
+        broker.publish("comments", {"issue": 3})
+
+        # Assert
+        assert await anext(stream) == (
+            b'id: 1\nevent: labels\ndata: {"action":"created","name":"bug"}\n\n'
+        )
+        assert await anext(stream) == b'id: 2\nevent: comments\ndata: {"issue":3}\n\n'
+        await stream.aclose()
+        assert broker.subscribers == set()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_told_to_resync(self):
+        """Test that a client that falls behind gets a resync event."""
+        # Arrange
+        broker = EventBroker(queue_size=2)
+        stream = broker.stream()
+        await anext(stream)
+
+        # Act
+        for n in range(3):
+            broker.publish("comments", {"issue": n})
+
+        # Assert
+        assert await anext(stream) == b"id: 3\nevent: resync\ndata: {}\n\n"
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_keepalive(self):
+        """Test that an idle stream sends keep-alive comments."""
+        broker = EventBroker()
+        stream = broker.stream(keepalive=0.01)
+        await anext(stream)
+
+        assert await anext(stream) == b": keepalive\n\n"
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_no_subscribers(self):
+        """Test that publishing without subscribers is harmless."""
+        broker = EventBroker()
+
+        broker.publish("issues", {"milestone": 1})
+
+        assert broker.last_id == 1
+
+
+class TestEventsRoute:
+    """Test the events endpoint and the events published by changes."""
+
+    @pytest.mark.asyncio
+    async def test_issue_change_is_broadcast(self):
+        """Test that a changed issue is sent to connected clients."""
+        # Arrange
+        broker = EventBroker()
+        with patch("github_pm.api.broker", broker):
+            response = await get_events()
+            body = response.body_iterator
+            await anext(body)
+
+            # Act
+            issue_changed(
+                {
+                    "number": 7,
+                    "state": "closed",
+                    "milestone": None,
+                    "body": "Fixed",
+                    "body_html": "<p>Fixed</p>",
+                    "url": "https://api.github.com/repos/o/r/issues/7",
+                    "user": {"login": "alice", "id": 1, "events_url": "x"},
+                }
+            )
+            event = await asyncio.wait_for(anext(body), 1)
+
+        # Assert
+        assert response.media_type == "text/event-stream"
+        assert event == (
+            b'id: 1\nevent: issue\ndata: {"issue":{"number":7,"state":"closed",'
+            b'"user":{"id":1,"login":"alice"},"milestone":null}}\n\n'
+        )
+        await body.aclose()
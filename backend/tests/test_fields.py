@@ -0,0 +1,64 @@
+"""Tests for the fields module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from github_pm.fields import parse_fields, project, projection_for
+
+SAMPLES = Path(__file__).parent.parent / "sample_json"
+
+
+class TestFields:
+    """Test projecting GitHub objects."""
+
+    def test_parse_fields(self):
+        """Test parsing attribute paths."""
+        assert parse_fields("number, user.login,labels.name,labels.color") == {
+            "number": True,
+            "user": {"login": True},
+            "labels": {"name": True, "color": True},
+        }
+
+    def test_parse_fields_whole_value_wins(self):
+        """Test that selecting a whole value overrides its attributes."""
+        assert parse_fields("user,user.login") == {"user": True}
+
+    def test_project(self):
+        """Test that projections apply to nested objects and lists."""
+        issue = {
+            "number": 1,
+            "url": "https://api.github.com/...",
+            "milestone": None,
+            "labels": [{"name": "bug", "url": "..."}],
+        }
+
+        result = project([issue], parse_fields("number,milestone.title,labels.name"))
+
+        assert result == [{"number": 1, "milestone": None, "labels": [{"name": "bug"}]}]
+
+    @pytest.mark.parametrize(
+        "fields,expected",
+        [(None, "default"), ("slim", "slim"), ("full", None)],
+    )
+    def test_profiles(self, fields, expected):
+        """Test the issue profiles."""
+        projection = projection_for("issues", fields)
+
+        if expected is None:
+            assert projection is None
+        else:
+            assert "number" in projection
+            assert ("body_html" in projection) == (expected == "default")
+
+    def test_default_profile_keeps_what_the_ui_uses(self):
+        """Test the default issue profile against a sample listing."""
+        issues = json.loads((SAMPLES / "issues.json").read_text())
+
+        result = project(issues, projection_for("issues", None))
+
+        assert len(json.dumps(result)) < len(json.dumps(issues)) / 2
+        assert set(result[0]["user"]) == {"id", "login", "html_url", "avatar_url"}
+        assert result[0]["number"] == issues[0]["number"]
+        assert "url" not in result[0]
@@ -0,0 +1,158 @@
+"""Tests for the metrics module."""
+
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+
+from github_pm.codec import NegotiatedRoute
+from github_pm.metrics import (
+    CACHE_LOOKUPS,
+    Counter,
+    endpoint_template,
+    GITHUB_PAGES,
+    GITHUB_SECONDS,
+    Histogram,
+    render,
+    ROUTE_SECONDS,
+)
+
+
+class TestMetrics:
+    """Test the metric types and their text format."""
+
+    def test_counter(self):
+        """Test a counter with labels."""
+        counter = Counter("lookups_total", "Lookups", ["cache", "result"])
+
+        counter.inc("response", "hit")
+        counter.inc("response", "hit", amount=2)
+        counter.inc("response", 'mi"ss')
+
+        assert list(counter.render()) == [
+            "# HELP lookups_total Lookups",
+            "# TYPE lookups_total counter",
+            'lookups_total{cache="response",result="hit"} 3',
+            'lookups_total{cache="response",result="mi\\"ss"} 1',
+        ]
+
+    def test_histogram(self):
+        """Test that histogram buckets are cumulative."""
+        histogram = Histogram("seconds", "Time", ["route"], buckets=(0.1, 1.0))
+
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.1, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+
+        assert list(histogram.render())[2:] == [
+            'seconds_bucket{route="/a",le="0.1"} 2',
+            'seconds_bucket{route="/a",le="1"} 3',
+            'seconds_bucket{route="/a",le="+Inf"} 4',
+            'seconds_sum{route="/a"} 5.65',
+            'seconds_count{route="/a"} 4',
+        ]
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://api.github.com/graphql", "/graphql"),
+        (
+            "https://api.github.com/repos/o/r/issues/5/labels/bug?x=1",
+            "/repos/{owner}/{repo}/issues/{number}/labels/{name}",
+        ),
+        (
+            "https://api.github.com/repos/o/r/issues/comments/42/reactions",
+            "/repos/{owner}/{repo}/issues/comments/{number}/reactions",
+        ),
+    ],
+)
+def test_endpoint_template(url, expected):
+    """Test that identifiers are removed from GitHub paths."""
+    assert endpoint_template(url) == expected
+
+
+class TestRecording:
+    """Test that routes and GitHub calls are recorded."""
+
+    @pytest.mark.asyncio
+    async def test_github_calls(self, make_connector):
+        """Test recording GitHub calls and the pages of a list."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/graphql":
+                return httpx.Response(502)
+            page = int(request.url.params.get("page", 1))
+            links = (
+                '<https://api.github.com/repos/test/repo/labels?page=2>; rel="next"'
+                if page == 1
+                else ""
+            )
+            return httpx.Response(200, json=[{"id": page}], headers={"Link": links})
+
+        connector = make_connector(handler)
+        endpoint = "/repos/{owner}/{repo}/labels"
+        rest = GITHUB_SECONDS.count("rest", "GET", endpoint, 200)
+        graphql = GITHUB_SECONDS.count("graphql", "POST", "/graphql", 502)
+        pages = GITHUB_PAGES.count(endpoint)
+        misses = CACHE_LOOKUPS.get("in_flight", "miss")
+
+        await connector.get_paged("/repos/test/repo/labels")
+        with pytest.raises(httpx.HTTPStatusError):
+            await connector.post("/graphql", data={"query": "query { x }"})
+
+        assert GITHUB_SECONDS.count("rest", "GET", endpoint, 200) == rest + 2
+        assert GITHUB_SECONDS.count("graphql", "POST", "/graphql", 502) == graphql + 1
+        assert GITHUB_PAGES.count(endpoint) == pages + 1
+        assert CACHE_LOOKUPS.get("in_flight", "miss") == misses + 3
+        await connector.close()
+
+    def test_routes(self):
+        """Test recording route latency by template and status."""
+        router = APIRouter(route_class=NegotiatedRoute)
+
+        @router.get("/things/{n}")
+        async def thing(n: int):
+            if n == 0:
+                raise HTTPException(status_code=404, detail="No thing")
+            return {"n": n}
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+        ok = ROUTE_SECONDS.count("GET", "/things/{n}", 200)
+        missing = ROUTE_SECONDS.count("GET", "/things/{n}", 404)
+
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/things/0")
+
+        assert ROUTE_SECONDS.count("GET", "/things/{n}", 200) == ok + 2
+        assert ROUTE_SECONDS.count("GET", "/things/{n}", 404) == missing + 1
+
+    @pytest.mark.asyncio
+    async def test_connection_state(self, make_connector):
+        """Test reporting the rate limits and circuit breakers."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                json={},
+                headers={
+                    "X-RateLimit-Limit": "5000",
+                    "X-RateLimit-Remaining": "4321",
+                    "X-RateLimit-Reset": "1700",
+                },
+            )
+
+        connector = make_connector(handler)
+        await connector.get("/repos/test/repo/milestones")
+
+        text = render(connector)
+
+        assert 'github_pm_github_rate_limit_remaining{resource="core"} 4321' in text
+        assert 'github_pm_github_circuit_state{endpoint="milestones"} 0' in text
+        assert "# TYPE github_pm_github_retries_total counter" in text
+        assert "github_pm_github_concurrency_limit 10" in text
+        await connector.close()
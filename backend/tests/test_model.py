@@ -0,0 +1,99 @@
+"""Tests for the model module."""
+
+import copy
+import functools
+import json
+
+import pytest
+
+from github_pm.model import Interner, Issue
+
+
+@pytest.fixture
+def issue(make_issue):
+    """Build issues by alice, in milestone 3 and labelled "Bug"."""
+    return functools.partial(make_issue, milestone=3, login="alice", labels=("Bug",))
+
+
+class TestIssue:
+    """Test the Issue dict."""
+
+    def test_computed(self, issue):
+        """Test that the label names are computed."""
+        i = Issue(issue(7, labels=("Bug", "Priority:High")))
+
+        assert i.label_names == {"bug", "priority:high"}
+        assert i == issue(7, labels=("Bug", "Priority:High"))
+
+    def test_encoded_as_dict(self, issue):
+        """Test that an Issue is encoded and copied as a dict."""
+        i = Issue(issue(7))
+
+        assert json.loads(json.dumps(i)) == issue(7)
+        copied = copy.deepcopy(i)
+        assert copied == i
+        assert copied.label_names == i.label_names
+
+
+class TestInterner:
+    """Test sharing the objects issues carry."""
+
+    def test_shared(self, issue):
+        """Test that equal objects are replaced by one copy."""
+        interner = Interner()
+
+        first, second = interner.issues([issue(1), issue(2)])
+
+        assert isinstance(first, Issue)
+        assert first["user"] is second["user"]
+        assert first["labels"][0] is second["labels"][0]
+        assert first["assignees"][0] is second["user"]
+        assert first["milestone"] is second["milestone"]
+
+    def test_changed_object(self, issue):
+        """Test that a changed object isn't replaced by an old version."""
+        interner = Interner()
+        old = interner.issue(issue(1))
+        changed = issue(2)
+        changed["milestone"]["title"] = "v1.0.1"
+
+        new = interner.issue(changed)
+        newer = interner.issue(issue(3))
+
+        assert new["milestone"]["title"] == "v1.0.1"
+        assert old["milestone"]["title"] == "v3"
+        assert newer["milestone"] is old["milestone"]
+        assert new["milestone"] is not old["milestone"]
+
+    def test_versions(self):
+        """Test that only the latest versions of an object are shared."""
+        interner = Interner()
+        users = [{"login": "alice", "id": 1, "name": f"A{n}"} for n in range(5)]
+        first = interner.issue({"number": 1, "user": users[0]})
+        for n, user in enumerate(users[1:], start=2):
+            interner.issue({"number": n, "user": user})
+
+        again = interner.issue({"number": 9, "user": dict(users[0])})
+        latest = interner.issue({"number": 10, "user": dict(users[4])})
+
+        assert again["user"] is not first["user"]
+        assert latest["user"] is users[4]
+
+    def test_issue_unchanged(self, issue):
+        """Test that an Issue is returned as it is."""
+        interner = Interner()
+        i = interner.issue(issue(1))
+
+        assert interner.issue(i) is i
+
+    def test_missing_attributes(self):
+        """Test issues without a milestone, or users without identity."""
+        interner = Interner()
+
+        i = interner.issue(
+            {"number": 1, "labels": [], "milestone": None, "user": {"id": 5}}
+        )
+
+        assert i["milestone"] is None
+        assert i["user"] == {"id": 5}
+        assert i.label_names == frozenset()
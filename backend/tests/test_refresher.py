@@ -0,0 +1,170 @@
+"""Tests for the refresher module."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from github_pm.api import Connector
+from github_pm.cache import cache
+from github_pm.refresher import Refresher, start_refresher
+from github_pm.scheduler import Scheduler
+
+
+@pytest.fixture(autouse=True)
+def enable_cache():
+    ttls = {"milestones": 60, "labels": 60, "assignees": 60, "issues": 60}
+    with (
+        patch.object(cache, "max_bytes", 1024 * 1024),
+        patch.object(cache, "ttls", ttls),
+    ):
+        yield
+
+
+def make_gitctx() -> Mock:
+    gitctx = Mock(spec=Connector)
+    gitctx.interactive = 0
+    gitctx.scheduler = Scheduler()
+    return gitctx
+
+
+def set_budget(gitctx: Mock, resource: str, remaining: int, reset: float):
+    budget = gitctx.scheduler.budgets[resource]
+    budget.limit = 5000
+    budget.remaining = remaining
+    budget.reset = reset
+
+
+class TestRefresher:
+    """Test the background cache refresher."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_reloads_cached_state(self):
+        """Test that a refresh reloads everything, including open milestones."""
+        # Arrange
+        gitctx = make_gitctx()
+        refresher = Refresher(gitctx, interval=30.0, min_rate_limit=100)
+        cache.put(("labels",), [{"name": "old"}])
+        with (
+            patch(
+                "github_pm.refresher.load_milestones",
+                AsyncMock(return_value=[{"number": 3}]),
+            ),
+            patch(
+                "github_pm.refresher.load_labels",
+                AsyncMock(return_value=[{"name": "new"}]),
+            ),
+            patch("github_pm.refresher.load_assignees", AsyncMock(return_value=[])),
+            patch(
+                "github_pm.refresher.load_issues",
+                AsyncMock(side_effect=lambda g, n: [{"number": n + 10}]),
+            ) as load_issues,
+        ):
+
+            # Act
+            await refresher.refresh()
+
+        # Assert
+        assert dict(cache.items("labels")) == {("labels",): [{"name": "new"}]}
+        assert [c.args[1] for c in load_issues.await_args_list] == [3, 0]
+        assert dict(cache.items("issues")) == {
+            ("issues", 3): [{"number": 13}],
+            ("issues", 0): [{"number": 10}],
+        }
+
+    @pytest.mark.asyncio
+    async def test_refresh_waits_for_user_requests(self):
+        """Test that the refresher gives way to requests using the connection."""
+        # Arrange
+        gitctx = make_gitctx()
+        gitctx.interactive = 1
+        refresher = Refresher(gitctx, interval=30.0, min_rate_limit=100)
+        loader = AsyncMock(return_value=[])
+
+        # Act
+        with patch("github_pm.refresher.IDLE_POLL", 0.001):
+            task = asyncio.ensure_future(refresher.reload(("labels",), loader))
+            await asyncio.sleep(0.01)
+            loader.assert_not_awaited()
+            gitctx.interactive = 0
+            await task
+
+        # Assert
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_when_rate_limited(self):
+        """Test that the refresher backs off when the rate limits are low."""
+        # Arrange
+        gitctx = make_gitctx()
+        set_budget(gitctx, "core", 10, time.time() + 600)
+        set_budget(gitctx, "graphql", 10, time.time() + 900)
+        refresher = Refresher(gitctx, interval=30.0, min_rate_limit=100)
+        loader = AsyncMock(return_value=[])
+
+        # Act
+        await refresher.reload(("labels",), loader)
+
+        # Assert
+        loader.assert_not_awaited()
+        assert 590 < refresher.backoff() <= 600
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_checked_separately(self):
+        """Test that a low GraphQL budget only skips refreshes using GraphQL."""
+        # Arrange
+        gitctx = make_gitctx()
+        set_budget(gitctx, "core", 4000, time.time() + 600)
+        set_budget(gitctx, "graphql", 10, time.time() + 600)
+        refresher = Refresher(gitctx, interval=30.0, min_rate_limit=100)
+        labels = AsyncMock(return_value=[])
+        issues = AsyncMock(return_value=[])
+
+        # Act
+        await refresher.reload(("labels",), labels)
+        await refresher.reload(("issues", 1), issues, ("core", "graphql"))
+
+        # Assert
+        labels.assert_awaited_once()
+        issues.assert_not_awaited()
+        assert refresher.backoff() == 30.0
+
+    def test_backoff_after_reset(self):
+        """Test that a low rate limit past its reset time doesn't stop refresh."""
+        gitctx = make_gitctx()
+        set_budget(gitctx, "core", 10, time.time() - 1)
+        set_budget(gitctx, "graphql", 10, time.time() - 1)
+        refresher = Refresher(gitctx, interval=30.0, min_rate_limit=100)
+
+        assert refresher.backoff() == 30.0
+
+
+class TestStartRefresher:
+    """Test starting the refresher."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test that no refresher runs without a refresh interval."""
+        with patch("github_pm.refresher.context") as mock_context:
+            mock_context.refresh_interval = 0.0
+            assert start_refresher(make_gitctx()) is None
+
+    @pytest.mark.asyncio
+    async def test_started(self):
+        """Test that a configured refresher runs in the background."""
+        # Arrange
+        with (
+            patch("github_pm.refresher.context") as mock_context,
+            patch.object(Refresher, "refresh", AsyncMock()) as refresh,
+        ):
+            mock_context.refresh_interval = 30.0
+            mock_context.refresh_min_rate_limit = 100
+
+            # Act
+            task = start_refresher(make_gitctx())
+            await asyncio.sleep(0)
+            task.cancel()
+
+        # Assert
+        refresh.assert_awaited_once()
@@ -0,0 +1,166 @@
+"""Tests for the resilience module."""
+
+import asyncio
+import time
+
+import pytest
+
+from github_pm.resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    endpoint_class,
+    RetryPolicy,
+    shared,
+)
+
+
+class TestRetryPolicy:
+    """Test the retry delays."""
+
+    def test_jittered_backoff(self):
+        """Test that delays are random, up to an exponential backoff."""
+        policy = RetryPolicy(retries=5, base=0.5, cap=3.0)
+
+        for attempt, most in enumerate([0.5, 1.0, 2.0, 3.0, 3.0]):
+            delays = [policy.delay(attempt) for _ in range(50)]
+            assert all(0.0 <= d <= most for d in delays)
+            assert len(set(delays)) > 1
+
+    def test_retry_after(self):
+        """Test that GitHub's Retry-After is respected, beyond the cap."""
+        policy = RetryPolicy(retries=1, base=0.0, cap=3.0)
+
+        assert policy.delay(0, retry_after=2.0) == 2.0
+        assert policy.delay(0, retry_after=30.0) == 30.0
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://api.github.com/graphql", "graphql"),
+        ("https://api.github.com/repos/o/r/issues/5/labels/bug", "issues"),
+        ("https://api.github.com/repos/o/r/milestones?state=open", "milestones"),
+        ("https://api.github.com/repos/o/r", "repos"),
+        ("https://api.github.com/user", "user"),
+    ],
+)
+def test_endpoint_class(url, expected):
+    """Test classifying endpoints for their circuit breakers."""
+    assert endpoint_class(url) == expected
+
+
+class TestShared:
+    """Test sharing a call among identical concurrent callers."""
+
+    @pytest.mark.asyncio
+    async def test_joins_call_in_flight(self):
+        """Test that a second caller joins the first call until it's done."""
+        flights = {}
+        release = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await release.wait()
+            return "done"
+
+        first, joined_first = shared(flights, "k", call)
+        second, joined_second = shared(flights, "k", call)
+        release.set()
+        result = await first
+
+        assert result == "done" and second is first
+        assert (joined_first, joined_second) == (False, True)
+        assert calls == [1] and flights == {}
+
+    @pytest.mark.asyncio
+    async def test_replaced_call_not_removed(self):
+        """Test that a finished call doesn't remove the call replacing it."""
+
+        async def call():
+            return "old"
+
+        flights = {}
+        old, _ = shared(flights, "k", call)
+        flights["k"] = replacement = asyncio.get_running_loop().create_future()
+        await old
+
+        assert flights == {"k": replacement}
+
+
+class TestCircuitBreaker:
+    """Test the circuit breaker states."""
+
+    def test_opens_after_threshold(self):
+        """Test that failures in a row open the breaker."""
+        breaker = CircuitBreaker("issues", threshold=3, cooldown=60.0)
+
+        for _ in range(2):
+            breaker.allow()
+            breaker.failed()
+        breaker.allow()
+        breaker.succeeded()
+        for _ in range(3):
+            breaker.allow()
+            breaker.failed()
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpen) as exc_info:
+            breaker.allow()
+        assert 59.0 < exc_info.value.retry_after <= 60.0
+        assert breaker.status() == {
+            "state": "open",
+            "failures": 3,
+            "calls": 6,
+            "retries": 0,
+            "refused": 1,
+            "trips": 1,
+        }
+
+    def test_half_open(self):
+        """Test that one trial call is allowed after the cooldown."""
+        breaker = CircuitBreaker("issues", threshold=1, cooldown=60.0)
+        breaker.allow()
+        breaker.failed()
+        breaker.opened_at = time.monotonic() - 61.0
+
+        breaker.allow()
+        assert breaker.state == "half-open"
+        with pytest.raises(CircuitOpen):
+            breaker.allow()
+        breaker.succeeded()
+
+        assert breaker.state == "closed"
+        breaker.allow()
+
+    def test_trial_fails(self):
+        """Test that a failed trial call opens the breaker again."""
+        breaker = CircuitBreaker("issues", threshold=5, cooldown=60.0)
+        breaker.state = "half-open"
+
+        breaker.allow()
+        breaker.failed()
+
+        assert breaker.state == "open"
+        assert breaker.trips == 1
+
+    def test_abandoned_trial(self):
+        """Test that a cancelled trial call lets another try."""
+        breaker = CircuitBreaker("issues", threshold=5, cooldown=60.0)
+        breaker.state = "half-open"
+        breaker.allow()
+
+        breaker.abandoned()
+
+        breaker.allow()
+        assert breaker.state == "half-open"
+
+    def test_never_opens(self):
+        """Test that a threshold of 0 disables the breaker."""
+        breaker = CircuitBreaker("issues", threshold=0, cooldown=60.0)
+
+        for _ in range(100):
+            breaker.allow()
+            breaker.failed()
+
+        assert breaker.state == "closed"
@@ -0,0 +1,212 @@
+"""Tests for the scheduler module."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from github_pm.scheduler import Budget, Scheduler, TokenBucket
+
+
+def response(status: int = 200, **headers: str) -> httpx.Response:
+    return httpx.Response(
+        status, headers={k.replace("_", "-"): v for k, v in headers.items()}
+    )
+
+
+class TestBudget:
+    """Test tracking a primary rate limit."""
+
+    def test_not_paced(self):
+        """Test that calls aren't paced until the budget runs low."""
+        budget = Budget()
+        now = time.time()
+        assert budget.interval(0.1, now) == 0.0
+
+        budget.update(
+            httpx.Headers(
+                {
+                    "x-ratelimit-limit": "5000",
+                    "x-ratelimit-remaining": "1000",
+                    "x-ratelimit-reset": str(now + 100),
+                }
+            )
+        )
+
+        assert budget.interval(0.1, now) == 0.0
+
+    def test_paced(self):
+        """Test that the calls left are spread until the reset."""
+        budget = Budget(limit=5000, remaining=100)
+        now = time.time()
+        budget.reset = now + 50
+
+        assert budget.interval(0.1, now) == pytest.approx(0.5)
+        assert budget.interval(0.1, now + 60) == 0.0
+
+
+class TestTokenBucket:
+    """Test the mutation token bucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        """Test that a burst is allowed, and then the rate."""
+        bucket = TokenBucket(rate=50.0, burst=2)
+        start = time.monotonic()
+
+        for _ in range(4):
+            await bucket.take()
+
+        # Two tokens were in the bucket; two more took 1/50s each
+        assert time.monotonic() - start >= 0.035
+
+    @pytest.mark.asyncio
+    async def test_unlimited(self):
+        """Test that a rate of 0 doesn't limit."""
+        bucket = TokenBucket(rate=0.0, burst=1)
+
+        for _ in range(100):
+            await bucket.take()
+
+        assert bucket.tokens == 1.0
+
+
+class TestScheduler:
+    """Test scheduling GitHub calls."""
+
+    def test_resource(self):
+        """Test telling GraphQL from REST calls."""
+        assert Scheduler.resource("https://api.github.com/graphql") == "graphql"
+        assert Scheduler.resource("https://api.github.com/repos/a/b") == "core"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limited(self):
+        """Test that no more calls than the limit are in progress."""
+        scheduler = Scheduler(max_concurrency=2)
+        active = 0
+        most = 0
+
+        async def call() -> httpx.Response:
+            nonlocal active, most
+            active += 1
+            most = max(most, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return response()
+
+        await asyncio.gather(*(scheduler.send("core", False, call) for _ in range(6)))
+
+        assert most == 2
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response(self):
+        """Test that a rate limit halves concurrency and pauses all calls."""
+        scheduler = Scheduler(max_concurrency=8)
+
+        async def limited() -> httpx.Response:
+            return response(429, retry_after="0.05")
+
+        async def ok() -> httpx.Response:
+            return response()
+
+        result = await scheduler.send("core", False, limited)
+        start = time.monotonic()
+        await scheduler.send("graphql", False, ok)
+
+        assert result.status_code == 429
+        assert scheduler.limit == 4
+        assert scheduler.limited == 1
+        assert scheduler.delayed == 1
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_forbidden_is_not_rate_limit(self):
+        """Test that an ordinary 403 doesn't slow us down."""
+        scheduler = Scheduler(max_concurrency=8)
+
+        async def forbidden() -> httpx.Response:
+            return httpx.Response(403, json={"message": "Must have admin rights"})
+
+        await scheduler.send("core", False, forbidden)
+
+        assert scheduler.limit == 8
+        assert scheduler.limited == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_recovers(self):
+        """Test that concurrency grows by one per limit's worth of successes."""
+        scheduler = Scheduler(max_concurrency=4)
+        scheduler.limit = 2
+
+        async def ok() -> httpx.Response:
+            return response()
+
+        for _ in range(2):
+            await scheduler.send("core", False, ok)
+        assert scheduler.limit == 3
+        for _ in range(3):
+            await scheduler.send("core", False, ok)
+        assert scheduler.limit == 4
+        for _ in range(10):
+            await scheduler.send("core", False, ok)
+        assert scheduler.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget(self):
+        """Test that calls using an exhausted budget wait for its reset."""
+        scheduler = Scheduler()
+
+        async def last() -> httpx.Response:
+            return response(
+                x_ratelimit_remaining="0", x_ratelimit_reset=str(time.time() + 60)
+            )
+
+        await scheduler.send("graphql", False, last)
+
+        assert scheduler.paused_until["graphql"] > time.monotonic() + 50
+        assert scheduler.paused_until["core"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_low_budget_paced(self):
+        """Test that calls are spaced out once the budget runs low."""
+        scheduler = Scheduler(reserve=0.5)
+        times = []
+
+        async def call() -> httpx.Response:
+            times.append(time.monotonic())
+            return response(
+                x_ratelimit_limit="100",
+                x_ratelimit_remaining="10",
+                x_ratelimit_reset=str(time.time() + 0.2),
+            )
+
+        await scheduler.send("core", False, call)
+        await asyncio.gather(*(scheduler.send("core", False, call) for _ in range(3)))
+
+        # 10 calls left over 0.2s: one each 0.02s
+        gaps = [b - a for a, b in zip(times[1:], times[2:])]
+        assert all(gap >= 0.015 for gap in gaps)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter(self):
+        """Test that a call cancelled while waiting for a slot gives it up."""
+        scheduler = Scheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def slow() -> httpx.Response:
+            await release.wait()
+            return response()
+
+        first = asyncio.ensure_future(scheduler.send("core", False, slow))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(scheduler.send("core", False, slow))
+        await asyncio.sleep(0)
+        second.cancel()
+        release.set()
+        await first
+
+        assert second.cancelled()
+        assert scheduler.active == 0
+        assert not scheduler.waiters
@@ -0,0 +1,134 @@
+"""Tests for the store module."""
+
+import sqlite3
+import zlib
+
+import pytest
+
+from github_pm.store import Store
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = Store(str(tmp_path / "state" / "repo.db"))
+    yield store
+    store.close()
+
+
+class TestStore:
+    """Test the persistent repository store."""
+
+    @pytest.mark.asyncio
+    async def test_unsaved_key(self, store):
+        """Test that a key never saved loads as None."""
+        assert await store.load(("labels",)) is None
+        assert await store.load(("issues", 1)) is None
+
+    @pytest.mark.asyncio
+    async def test_ordered_lists_round_trip(self, store):
+        """Test that milestones, labels and assignees keep their order."""
+        # Arrange
+        labels = [{"name": "zebra"}, {"name": "apple"}]
+        milestones = [{"number": 2, "title": "v1.0.0"}, {"number": 1, "title": "b"}]
+
+        # Act
+        store.save(("labels",), labels)
+        store.save(("milestones",), milestones)
+        store.save(("assignees",), [])
+
+        # Assert
+        assert await store.load(("labels",)) == labels
+        assert await store.load(("milestones",)) == milestones
+        assert await store.load(("assignees",)) == []
+
+    @pytest.mark.asyncio
+    async def test_issues_with_linked_prs(self, store, make_issue):
+        """Test that issues and their linked PRs are saved by milestone."""
+        # Arrange
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        issues = [make_issue(2, 1, closed_by=[pr]), make_issue(1, 1)]
+
+        # Act
+        store.save(("issues", 1), issues)
+        store.save(("issues", 0), [make_issue(3, None)])
+
+        # Assert
+        assert await store.load(("issues", 1)) == [
+            make_issue(1, 1),
+            make_issue(2, 1, closed_by=[pr]),
+        ]
+        assert await store.load(("issues", 0)) == [make_issue(3, None)]
+
+    @pytest.mark.asyncio
+    async def test_issue_moved_between_milestones(self, store, make_issue):
+        """Test that saving an issue's new milestone removes it from the old."""
+        # Arrange
+        store.save(("issues", 1), [make_issue(1, 1), make_issue(2, 1)])
+
+        # Act
+        store.save(("issues", 2), [make_issue(2, 2)])
+
+        # Assert
+        assert await store.load(("issues", 1)) == [make_issue(1, 1)]
+        assert await store.load(("issues", 2)) == [make_issue(2, 2)]
+
+    @pytest.mark.asyncio
+    async def test_comments(self, store):
+        """Test that comments are saved per issue."""
+        # Arrange
+        store.save(("comments", 1), [{"id": 11}, {"id": 10}])
+        store.save(("comments", 2), [{"id": 12}])
+
+        # Act
+        store.save(("comments", 1), [{"id": 10}])
+
+        # Assert
+        assert await store.load(("comments", 1)) == [{"id": 10}]
+        assert await store.load(("comments", 2)) == [{"id": 12}]
+
+    @pytest.mark.asyncio
+    async def test_discard(self, store, make_issue):
+        """Test that a discarded key is forgotten."""
+        # Arrange
+        store.save(("issues", 1), [make_issue(1, 1)])
+        store.save(("labels",), [{"name": "bug"}])
+
+        # Act
+        store.discard(("issues", 1))
+
+        # Assert
+        assert await store.load(("issues", 1)) is None
+        assert await store.load(("labels",)) == [{"name": "bug"}]
+
+    def test_persistent_and_compressed(self, tmp_path):
+        """Test that data survives reopening and is stored compressed."""
+        # Arrange
+        path = str(tmp_path / "repo.db")
+        store = Store(path)
+        store.save(("labels",), [{"name": "bug", "description": "x" * 1000}])
+        store.close()
+
+        # Act
+        db = sqlite3.connect(path)
+        (data,) = db.execute("SELECT data FROM labels").fetchone()
+        db.close()
+
+        # Assert
+        assert len(data) < 100
+        assert b"bug" in zlib.decompress(data)
+
+    @pytest.mark.asyncio
+    async def test_issue_sync_round_trip(self, store, make_issue):
+        """Test saving and restoring the issue sync working set."""
+        # Arrange
+        pr = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+        assert await store.load_sync("test/repo") is None
+        store.save_sync("test/repo", "t1", [make_issue(1, 1), make_issue(2, None)], [])
+
+        # Act
+        store.save_sync("test/repo", "t2", [make_issue(3, 2, closed_by=[pr])], [1])
+
+        # Assert
+        since, issues = await store.load_sync("test/repo")
+        assert since == "t2"
+        assert issues == [make_issue(2, None), make_issue(3, 2, closed_by=[pr])]
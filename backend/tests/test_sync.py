@@ -0,0 +1,141 @@
+"""Tests for the sync module."""
+
+from github_pm.sync import IssueSync, milestone_of
+
+PR = {"number": 9, "title": "Fix", "url": "https://github.com/t/r/pull/9"}
+
+
+class TestIssueSync:
+    """Test the incrementally synchronized issue working set."""
+
+    def test_milestone_of(self, make_issue):
+        """Test finding an issue's milestone number."""
+        assert milestone_of(make_issue(1, 3, updated_at="t")) == 3
+        assert milestone_of(make_issue(1, None, updated_at="t")) == 0
+
+    def test_initial_merge(self, make_issue):
+        """Test merging the initial listing."""
+        # Arrange
+        sync = IssueSync()
+
+        # Act
+        removed = sync.merge(
+            [
+                make_issue(1, 1, updated_at="2025-01-02"),
+                make_issue(2, None, updated_at="2025-01-03"),
+            ],
+            {1: [PR]},
+            {1, 2},
+        )
+
+        # Assert
+        assert removed == []
+        assert sync.loaded
+        assert sync.since == "2025-01-03"
+        assert sync.milestone(1) == [
+            make_issue(1, 1, updated_at="2025-01-02", closed_by=[PR])
+        ]
+        assert sync.milestone(0) == [make_issue(2, None, updated_at="2025-01-03")]
+
+    def test_delta_moves_and_closes(self, make_issue):
+        """Test that changes move issues between milestones and drop closed ones."""
+        # Arrange
+        sync = IssueSync()
+        sync.merge(
+            [
+                make_issue(1, 1, updated_at="2025-01-01"),
+                make_issue(2, 1, updated_at="2025-01-01"),
+            ],
+            {1: [PR]},
+            {1, 2},
+        )
+
+        # Act
+        removed = sync.merge(
+            [
+                make_issue(1, 2, updated_at="2025-02-01"),
+                {**make_issue(2, 1, updated_at="2025-02-02"), "state": "closed"},
+            ],
+            {1: [PR]},
+            {1},
+        )
+
+        # Assert
+        assert removed == [2]
+        assert sync.milestone(1) == []
+        assert sync.milestone(2) == [
+            make_issue(1, 2, updated_at="2025-02-01", closed_by=[PR])
+        ]
+        assert sync.since == "2025-02-02"
+
+    def test_links_kept_unless_relinked(self, make_issue):
+        """Test that linked PRs are kept for issues not looked up again."""
+        # Arrange
+        sync = IssueSync()
+        sync.merge(
+            [make_issue(1, 1, updated_at="a"), make_issue(2, 1, updated_at="a")],
+            {1: [PR], 2: [PR]},
+            {1, 2},
+        )
+
+        # Act
+        sync.merge([make_issue(1, 1, updated_at="b")], {}, {2})
+
+        # Assert
+        assert sync.issues[1]["closed_by"] == [PR]
+        assert "closed_by" not in sync.issues[2]
+        assert sync.linked_to({9}) == {1}
+
+    def test_update_keeps_body_and_high_water_mark(self, make_issue):
+        """Test applying our own change to an issue."""
+        # Arrange
+        sync = IssueSync()
+        sync.merge(
+            [make_issue(1, 1, updated_at="a", body_html="<p>x</p>")], {1: [PR]}, {1}
+        )
+
+        # Act
+        sync.update(
+            {"number": 1, "state": "open", "milestone": None, "updated_at": "z"}
+        )
+
+        # Assert
+        assert sync.since == "a"
+        assert sync.milestone(0)[0]["body_html"] == "<p>x</p>"
+        assert sync.milestone(0)[0]["closed_by"] == [PR]
+
+    def test_update_closed_issue(self, make_issue):
+        """Test that closing an issue removes it."""
+        # Arrange
+        sync = IssueSync()
+        sync.merge([make_issue(1, 1, updated_at="a")], {}, {1})
+
+        # Act
+        sync.update({"number": 1, "state": "closed"})
+
+        # Assert
+        assert sync.issues == {}
+
+    def test_changes_skips_issues_already_merged(self, make_issue):
+        """Test that a delta's repeats of merged updates are dropped."""
+        # Arrange
+        sync = IssueSync()
+        sync.merge(
+            [make_issue(1, 1, updated_at="b"), make_issue(2, 1, updated_at="c")],
+            {},
+            {1, 2},
+        )
+        closed = {**make_issue(3, 1, updated_at="c"), "state": "closed"}
+
+        # Act
+        fresh = sync.changes(
+            [
+                make_issue(1, 1, updated_at="b"),
+                make_issue(2, 2, updated_at="d"),
+                closed,
+                make_issue(4, 1, updated_at="a"),
+            ]
+        )
+
+        # Assert
+        assert [i["number"] for i in fresh] == [2, 4]
@@ -0,0 +1,320 @@
+"""Tests for the webhooks module."""
+
+import hashlib
+import hmac
+import json
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import pytest
+
+from github_pm.app import app
+from github_pm.cache import cache
+from github_pm.webhooks import handle_event, verify_signature
+
+REPO = {"full_name": "test/repo"}
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    with (
+        patch("github_pm.webhooks.context") as mock_context,
+        patch("github_pm.api.context") as mock_api_context,
+        patch.object(cache, "max_bytes", 1024 * 1024),
+        patch.object(
+            cache,
+            "ttls",
+            {"milestones": 60, "labels": 60, "issues": 60, "comments": 60},
+        ),
+    ):
+        mock_context.github_repo = "test/repo"
+        mock_context.webhook_secret = "s3cret"
+        mock_api_context.github_repo = "test/repo"
+        yield mock_context
+
+
+def sign(body: bytes, secret: str = "s3cret") -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class TestVerifySignature:
+    """Test webhook signature verification."""
+
+    def test_valid_signature(self):
+        """Test that a correctly signed body is accepted."""
+        verify_signature(b"{}", sign(b"{}"))
+
+    @pytest.mark.parametrize("signature", [None, "sha256=bad", sign(b"{}", "other")])
+    def test_invalid_signature(self, signature):
+        """Test that a missing or wrong signature is rejected."""
+        with pytest.raises(HTTPException) as exc_info:
+            verify_signature(b"{}", signature)
+        assert exc_info.value.status_code == 403
+
+    def test_no_secret_configured(self, settings):
+        """Test that webhooks are refused when there's no secret."""
+        settings.webhook_secret = ""
+        with pytest.raises(HTTPException) as exc_info:
+            verify_signature(b"{}", sign(b"{}", ""))
+        assert exc_info.value.status_code == 403
+
+
+class TestHandleEvent:
+    """Test applying webhook events to the cache."""
+
+    def test_other_repository_ignored(self):
+        """Test that events for another repository are ignored."""
+        cache.put(("labels",), [{"name": "bug"}])
+        payload = {"action": "created", "label": {}, "repository": {"full_name": "x/y"}}
+
+        assert handle_event("label", payload) is False
+        assert list(cache.items("labels")) != []
+
+    def test_unknown_event_ignored(self):
+        """Test that unhandled events are ignored."""
+        assert handle_event("star", {"repository": REPO}) is False
+
+    def test_issue_labeled_patches_cached_issue(self, make_issue):
+        """Test that an issue change is patched into the cached list."""
+        # Arrange
+        cache.put(("issues", 1), [make_issue(1, 1, body_html="<p>x</p>")])
+        payload = {
+            "action": "labeled",
+            "issue": make_issue(1, 1, labels=["bug"], body="x"),
+            "repository": REPO,
+        }
+
+        # Act
+        assert handle_event("issues", payload)
+
+        # Assert
+        (cached,) = dict(cache.items("issues"))[("issues", 1)]
+        assert cached["labels"] == [{"id": 0, "name": "bug"}]
+        assert cached["body_html"] == "<p>x</p>"
+
+    def test_issue_closed_removed(self, make_issue):
+        """Test that a closed issue is removed from the cached list."""
+        # Arrange
+        cache.put(("issues", 1), [make_issue(1, 1), make_issue(2, 1)])
+        payload = {
+            "action": "closed",
+            "issue": make_issue(1, 1, state="closed"),
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("issues", payload)
+
+        # Assert
+        assert [i["number"] for i in dict(cache.items("issues"))[("issues", 1)]] == [2]
+
+    def test_issue_body_edited_invalidates(self, make_issue):
+        """Test that a body edit invalidates the list (we cache HTML bodies)."""
+        # Arrange
+        cache.put(("issues", 1), [make_issue(1, 1)])
+        cache.put(("issues", 2), [make_issue(2, 2)])
+        payload = {
+            "action": "edited",
+            "changes": {"body": {"from": "old"}},
+            "issue": make_issue(1, 1),
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("issues", payload)
+
+        # Assert
+        assert [k for k, _ in cache.items("issues")] == [("issues", 2)]
+
+    def test_issue_comment_invalidates_comments(self, make_issue):
+        """Test that a new comment invalidates the issue's comments."""
+        # Arrange
+        cache.put(("comments", 1), [])
+        cache.put(("issues", 1), [make_issue(1, 1, comments=0)])
+        payload = {
+            "action": "created",
+            "issue": make_issue(1, 1, comments=1),
+            "comment": {"id": 5},
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("issue_comment", payload)
+
+        # Assert
+        assert list(cache.items("comments")) == []
+        assert dict(cache.items("issues"))[("issues", 1)][0]["comments"] == 1
+
+    def test_events_published(self):
+        """Test that clients are told about upstream changes."""
+        # Arrange
+        payload = {"action": "closed", "milestone": {"number": 4}, "repository": REPO}
+
+        # Act
+        with patch("github_pm.webhooks.broker") as broker:
+            handle_event("milestone", payload)
+
+        # Assert
+        broker.publish.assert_called_once_with(
+            "milestones", {"action": "closed", "number": 4}
+        )
+
+    def test_label_renamed_in_cached_issues(self, make_issue):
+        """Test that a renamed label is updated in cached issues."""
+        # Arrange
+        cache.put(("labels",), [{"name": "bug"}])
+        cache.put(("issues", 1), [make_issue(1, 1, labels=["bug"])])
+        payload = {
+            "action": "edited",
+            "label": {"name": "defect", "color": "ff0000"},
+            "changes": {"name": {"from": "bug"}},
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("label", payload)
+
+        # Assert
+        assert list(cache.items("labels")) == []
+        (cached,) = dict(cache.items("issues"))[("issues", 1)]
+        assert cached["labels"] == [{"name": "defect", "color": "ff0000"}]
+
+    def test_label_deleted(self, make_issue):
+        """Test that a deleted label is removed from cached issues."""
+        # Arrange
+        cache.put(("issues", 1), [make_issue(1, 1, labels=["bug"])])
+        payload = {"action": "deleted", "label": {"name": "bug"}, "repository": REPO}
+
+        # Act
+        handle_event("label", payload)
+
+        # Assert
+        assert dict(cache.items("issues"))[("issues", 1)][0]["labels"] == []
+
+    def test_milestone_deleted(self):
+        """Test that a deleted milestone invalidates its issues and "none"."""
+        # Arrange
+        cache.put(("milestones",), [{"number": 1}])
+        for n in range(3):
+            cache.put(("issues", n), [])
+        payload = {"action": "deleted", "milestone": {"number": 1}, "repository": REPO}
+
+        # Act
+        handle_event("milestone", payload)
+
+        # Assert
+        assert list(cache.items("milestones")) == []
+        assert [k for k, _ in cache.items("issues")] == [("issues", 2)]
+
+    def test_pull_request_invalidates_linked_issues(self, make_issue):
+        """Test that a PR change invalidates the lists of issues it closes."""
+        # Arrange
+        cache.put(("issues", 1), [make_issue(1, 1)])
+        cache.put(("issues", 2), [make_issue(2, 2, closed_by=[{"number": 9}])])
+        cache.put(("issues", 3), [make_issue(3, 3)])
+        cache.put(("issues", 4), [make_issue(4, 4)])
+        payload = {
+            "action": "edited",
+            "pull_request": {"number": 9, "body": "Fixes #1", "milestone": None},
+            "changes": {"body": {"from": "Fixes #2"}},
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("pull_request", payload)
+
+        # Assert
+        assert [k for k, _ in cache.items("issues")] == [("issues", 3), ("issues", 4)]
+
+    def test_pull_request_push_ignored(self, make_issue):
+        """Test that a push to a PR doesn't touch the cached lists."""
+        # Arrange
+        cached = [make_issue(1, closed_by=[{"number": 9}]), make_issue(9)]
+        cache.put(("issues", 0), cached)
+        payload = {
+            "action": "synchronize",
+            "pull_request": make_issue(9, body="Fixes #1"),
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("pull_request", payload)
+
+        # Assert
+        assert dict(cache.items("issues")) == {("issues", 0): cached}
+
+    def test_pull_request_labeled_patches_cached_list(self, make_issue):
+        """Test that a labeled PR is patched into the cached list."""
+        # Arrange
+        cache.put(
+            ("issues", 0),
+            [
+                make_issue(1, closed_by=[{"number": 9}]),
+                make_issue(9, body_html="<p>x</p>", pull_request={}),
+            ],
+        )
+        payload = {
+            "action": "labeled",
+            "pull_request": make_issue(
+                9, labels=["bug"], body="Fixes #1", head={"ref": "fix"}
+            ),
+            "repository": REPO,
+        }
+
+        # Act
+        handle_event("pull_request", payload)
+
+        # Assert
+        issues = dict(cache.items("issues"))[("issues", 0)]
+        assert [i["number"] for i in issues] == [1, 9]
+        assert issues[1]["labels"] == [{"id": 0, "name": "bug"}]
+        assert issues[1]["body_html"] == "<p>x</p>"
+        assert "pull_request" in issues[1]
+        assert "head" not in issues[1] and "body" not in issues[1]
+
+
+class TestWebhookRoute:
+    """Test the webhook route."""
+
+    def test_ping(self):
+        """Test that GitHub's ping event is answered."""
+        client = TestClient(app)
+        body = json.dumps({"zen": "Keep it simple"}).encode()
+
+        response = client.post(
+            "/webhooks/github",
+            content=body,
+            headers={"X-GitHub-Event": "ping", "X-Hub-Signature-256": sign(body)},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"message": "pong"}
+
+    def test_event_applied(self):
+        """Test that a signed event is applied."""
+        cache.put(("labels",), [{"name": "bug"}])
+        client = TestClient(app)
+        body = json.dumps(
+            {"action": "created", "label": {"name": "new"}, "repository": REPO}
+        ).encode()
+
+        response = client.post(
+            "/webhooks/github",
+            content=body,
+            headers={"X-GitHub-Event": "label", "X-Hub-Signature-256": sign(body)},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"message": "label applied"}
+        assert list(cache.items("labels")) == []
+
+    def test_bad_signature(self):
+        """Test that an unsigned delivery is refused."""
+        client = TestClient(app)
+
+        response = client.post(
+            "/webhooks/github", content=b"{}", headers={"X-GitHub-Event": "label"}
+        )
+
+        assert response.status_code == 403
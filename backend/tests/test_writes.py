@@ -0,0 +1,179 @@
+"""Tests for the writes module."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from github_pm.api import Connector
+from github_pm.writes import IssueWriteQueue
+
+PATH = "/repos/test/repo/issues/1"
+
+
+def make_gitctx(labels: list[str]) -> Mock:
+    """A connection to an issue with labels, applying PATCHes to it."""
+    issue = {
+        "number": 1,
+        "labels": [{"name": n} for n in labels],
+        "assignees": [{"login": "alice"}],
+        "milestone": None,
+    }
+
+    async def patch(path: str, data: dict) -> dict:
+        if "labels" in data:
+            issue["labels"] = [{"name": n} for n in data["labels"]]
+        if "assignees" in data:
+            issue["assignees"] = [{"login": n} for n in data["assignees"]]
+        if "milestone" in data:
+            issue["milestone"] = data["milestone"] and {"number": data["milestone"]}
+        return dict(issue)
+
+    gitctx = Mock(spec=Connector)
+    gitctx.get = AsyncMock(side_effect=lambda path: dict(issue))
+    gitctx.patch = AsyncMock(side_effect=patch)
+    return gitctx
+
+
+class TestIssueWriteQueue:
+    """Test coalescing changes to an issue."""
+
+    @pytest.mark.asyncio
+    async def test_rapid_changes_are_written_once(self):
+        """Test that changes within the window make one GET and one PATCH."""
+        # Arrange
+        gitctx = make_gitctx(["bug"])
+        changed = Mock()
+        queue = IssueWriteQueue(window=0.01, changed=changed)
+
+        # Act
+        results = await asyncio.gather(
+            queue.submit(gitctx, PATH, "add_label", "docs"),
+            queue.submit(gitctx, PATH, "remove_label", "bug"),
+            queue.submit(gitctx, PATH, "remove_assignees", ["alice"]),
+            queue.submit(gitctx, PATH, "set_milestone", 2),
+        )
+
+        # Assert
+        gitctx.get.assert_awaited_once_with(PATH)
+        gitctx.patch.assert_awaited_once_with(
+            PATH, data={"labels": ["docs"], "assignees": [], "milestone": 2}
+        )
+        assert results[0] == results[3]
+        assert results[0]["labels"] == [{"name": "docs"}]
+        changed.assert_called_once_with(results[0])
+        assert queue.pending == {} and queue.locks == {}
+
+    @pytest.mark.asyncio
+    async def test_changes_that_cancel_out_are_not_written(self):
+        """Test that a label toggled on and off again isn't written."""
+        # Arrange
+        gitctx = make_gitctx(["bug"])
+        changed = Mock()
+        queue = IssueWriteQueue(window=0.01, changed=changed)
+
+        # Act
+        result, _ = await asyncio.gather(
+            queue.submit(gitctx, PATH, "add_label", "docs"),
+            queue.submit(gitctx, PATH, "remove_label", "docs"),
+        )
+
+        # Assert
+        assert result["labels"] == [{"name": "bug"}]
+        gitctx.patch.assert_not_awaited()
+        changed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_absolute_changes_skip_get(self):
+        """Test that changes not depending on the issue don't read it."""
+        gitctx = make_gitctx([])
+        queue = IssueWriteQueue(window=0.0, changed=Mock())
+
+        await queue.submit(gitctx, PATH, "set_assignees", ["bob"])
+
+        gitctx.get.assert_not_awaited()
+        gitctx.patch.assert_awaited_once_with(PATH, data={"assignees": ["bob"]})
+
+    @pytest.mark.asyncio
+    async def test_changes_during_write_go_in_next_write(self):
+        """Test that writes to an issue never overlap, and nothing is lost."""
+        # Arrange
+        gitctx = make_gitctx([])
+        patch = gitctx.patch.side_effect
+        writing = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_patch(path: str, data: dict) -> dict:
+            writing.set()
+            await release.wait()
+            return await patch(path, data)
+
+        gitctx.patch.side_effect = slow_patch
+        queue = IssueWriteQueue(window=0.0, changed=Mock())
+
+        # Act
+        first = asyncio.ensure_future(queue.submit(gitctx, PATH, "add_label", "a"))
+        await writing.wait()
+        second = asyncio.ensure_future(queue.submit(gitctx, PATH, "add_label", "b"))
+        third = asyncio.ensure_future(queue.submit(gitctx, PATH, "add_label", "c"))
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(first, second, third)
+
+        # Assert
+        assert gitctx.patch.await_count == 2
+        assert gitctx.patch.await_args.kwargs["data"] == {"labels": ["a", "b", "c"]}
+        assert [label["name"] for label in results[2]["labels"]] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_failure_reported_to_every_caller(self):
+        """Test that a failed write fails each change in it."""
+        # Arrange
+        gitctx = make_gitctx([])
+        gitctx.patch.side_effect = Exception("Validation Failed")
+        queue = IssueWriteQueue(window=0.01, changed=Mock())
+
+        # Act
+        results = await asyncio.gather(
+            queue.submit(gitctx, PATH, "add_label", "a"),
+            queue.submit(gitctx, PATH, "add_label", "b"),
+            return_exceptions=True,
+        )
+
+        # Assert
+        assert [str(r) for r in results] == ["Validation Failed"] * 2
+
+    @pytest.mark.asyncio
+    async def test_rejected_changes_written_one_at_a_time(self):
+        """Test that one bad change doesn't fail the changes written with it."""
+        # Arrange
+        gitctx = make_gitctx([])
+        patch = gitctx.patch.side_effect
+
+        async def validate(path: str, data: dict) -> dict:
+            if "nobody" in data.get("assignees", []):
+                request = httpx.Request("PATCH", f"https://api.github.com{path}")
+                response = httpx.Response(422, request=request)
+                raise httpx.HTTPStatusError(
+                    "Validation Failed", request=request, response=response
+                )
+            return await patch(path, data)
+
+        gitctx.patch.side_effect = validate
+        changed = Mock()
+        queue = IssueWriteQueue(window=0.01, changed=changed)
+
+        # Act
+        bad, good = await asyncio.gather(
+            queue.submit(gitctx, PATH, "set_assignees", ["nobody"]),
+            queue.submit(gitctx, PATH, "add_label", "docs"),
+            return_exceptions=True,
+        )
+
+        # Assert
+        assert isinstance(bad, httpx.HTTPStatusError)
+        assert good["labels"] == [{"name": "docs"}]
+        assert good["assignees"] == [{"login": "alice"}]
+        assert gitctx.patch.await_count == 3
+        changed.assert_called_once_with(good)